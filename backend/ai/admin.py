@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AgentInteractionLog
+from .models import AgentCall, AgentInteractionLog, IdempotencyRecord, InteractionArchiveSegment
 
 @admin.register(AgentInteractionLog)
 class AgentInteractionLogAdmin(admin.ModelAdmin):
@@ -7,4 +7,26 @@ class AgentInteractionLogAdmin(admin.ModelAdmin):
     list_filter = ('student', 'created_at')
     search_fields = ('student__email', 'user_message', 'agent_response')
     readonly_fields = ('created_at',)
-    date_hierarchy = 'created_at'
\ No newline at end of file
+    date_hierarchy = 'created_at'
+
+@admin.register(InteractionArchiveSegment)
+class InteractionArchiveSegmentAdmin(admin.ModelAdmin):
+    list_display = ('student', 'month', 'count', 'archived_at')
+    list_filter = ('month',)
+    search_fields = ('student__email', 'path')
+    readonly_fields = ('archived_at',)
+
+
+@admin.register(IdempotencyRecord)
+class IdempotencyRecordAdmin(admin.ModelAdmin):
+    list_display = ('student', 'endpoint', 'key', 'status', 'response_status', 'created_at', 'expires_at')
+    list_filter = ('status', 'endpoint')
+    search_fields = ('student__email', 'key')
+    readonly_fields = ('created_at',)
+
+
+@admin.register(AgentCall)
+class AgentCallAdmin(admin.ModelAdmin):
+    list_display = ('task', 'model', 'reason', 'latency_ms', 'prompt_tokens', 'cached_tokens', 'completion_tokens', 'outcome', 'created_at')
+    list_filter = ('task', 'model', 'outcome')
+    readonly_fields = ('created_at',)
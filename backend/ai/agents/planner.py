@@ -1,40 +1,32 @@
-import os
-from decouple import config
-from openai import OpenAI
 from ai.utils.schemas import LearningPlanSchema
+from ai.utils.llm import complete
+from ai.utils import router
+from ai.utils.prompts import build_messages
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY") or config("OPENAI_API_KEY"))
-
-def generate_learning_plan(student_profile: dict) -> LearningPlanSchema:
-    email = student_profile.get("email", "unknown@student.com")
-    goals = student_profile.get("goals", [])
-    subjects = student_profile.get("subjects", [])
-    info = student_profile.get("info", {})
-    quizzes = student_profile.get("quizzes", [])
-    resource_logs = student_profile.get("resource_logs", [])
-
-    user_prompt = f"""
-Generate a structured weekly learning plan using the following data:
-
-- Email: {email}
-- Info: {info}
-- Subjects: {subjects}
-- Goals: {goals}
-- Quizzes: {quizzes}
-- Resource Logs: {resource_logs}
-
+PLANNER_INSTRUCTIONS = """
+You are an educational planning assistant that returns structured JSON only.
+Generate a structured weekly learning plan for the student described by the user.
 Return only focus topics, practice tasks, and AI motivational messages per week.
 Do NOT include any resources in the output.
 Ensure the response matches the structured schema exactly.
 """
 
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are an educational planning assistant that returns structured JSON only."},
-            {"role": "user", "content": user_prompt}
-        ],
+def generate_learning_plan(student_profile: dict) -> LearningPlanSchema:
+    # Most stable sections first, so repeated plans for a student share a prefix
+    context = {
+        "Email": student_profile.get("email", "unknown@student.com"),
+        "Info": student_profile.get("info", {}),
+        "Subjects": student_profile.get("subjects", []),
+        "Goals": student_profile.get("goals", []),
+        "Resource Logs": student_profile.get("resource_logs", []),
+        "Quiz progress per subject": student_profile.get("progress", []),
+        "Topics with missed questions most students get right": student_profile.get("gaps", []),
+    }
+
+    completion = complete(
+        router.LEARNING_PLAN,
+        build_messages(PLANNER_INSTRUCTIONS, context=context, request="Generate the weekly learning plan."),
         response_format=LearningPlanSchema,
     )
 
-    return completion.choices[0].message.parsed
\ No newline at end of file
+    return completion.choices[0].message.parsed
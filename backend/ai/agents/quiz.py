@@ -1,45 +1,125 @@
-from openai import OpenAI
-from decouple import config
-from pydantic import BaseModel
+import math
 from typing import List
-from ai.utils.schemas import QuizGenerationResponse, EvaluationResult
+from django.conf import settings
+from django.core.cache import cache
+from ai.utils.schemas import QuizGenerationResponse, QuizOutline, BatchEvaluationResult
+from ai.utils.dedup import unique_indices
+from ai.utils.resilience import AgentUnavailable
+from ai.utils.llm import complete
+from ai.utils import router
+from ai.utils.prompts import build_messages, to_json
+from config.timing import ContextThreadPoolExecutor
 
-client = OpenAI(api_key=config("OPENAI_API_KEY"))
+QUIZ_GENERATOR_INSTRUCTIONS = """
+You are a quiz generator that returns structured questions only.
+Generate the requested number of multiple-choice questions on the topic from the subject at the level given by the user.
+When a focus is given, write every question about that focus and none about the subtopics listed as covered elsewhere.
+Provide options as a dictionary like: {"A": "...", "B": "...", "C": "...", "D": "..."}
+Mark the correct option key only.
+"""
 
+QUIZ_OUTLINE_INSTRUCTIONS = """
+You plan quizzes. Split the topic given by the user into exactly the requested number of distinct,
+non-overlapping subtopics suitable for the given level. Return short subtopic names only.
+"""
 
-def generate_quiz(subject: str, topic: str, level: str) -> QuizGenerationResponse:
-    prompt = f"""
-Generate 10 multiple-choice questions on the topic '{topic}' from subject '{subject}' at '{level}' level.
-Provide options as a dictionary like: {{"A": "...", "B": "...", "C": "...", "D": "..."}}
-Mark the correct option key only.
+QUIZ_FEEDBACK_INSTRUCTIONS = """
+You are an AI quiz evaluator.
+Write short, specific feedback for each of the graded quiz attempts given by the user.
+Each attempt lists its quiz_id, score out of 100 and the questions the student missed.
+Return exactly one feedback entry per quiz_id.
 """
 
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a quiz generator that returns structured questions only."},
-            {"role": "user", "content": prompt}
-        ],
-        response_format=QuizGenerationResponse
+
+def _quiz_cache_key(subject: str, topic: str, level: str, num_questions: int) -> str:
+    return "quiz:last:" + "|".join(part.strip().lower() for part in (subject, topic, level, str(num_questions)))
+
+
+def generate_quiz(subject: str, topic: str, level: str, num_questions: int = 10) -> QuizGenerationResponse:
+    """
+    Generate a quiz within the agent latency budget, hedging slow calls. While
+    the provider is failing, the last quiz generated for the same subject,
+    topic, level and length is served instead; with none cached,
+    AgentUnavailable is raised. The result may hold slightly fewer than
+    `num_questions` questions when near-duplicates had to be dropped.
+    """
+    key = _quiz_cache_key(subject, topic, level, num_questions)
+    try:
+        if num_questions <= settings.QUIZ_CHUNK_SIZE:
+            result = _request_quiz(subject, topic, level, num_questions)
+        else:
+            result = _generate_chunked(subject, topic, level, num_questions)
+    except AgentUnavailable:
+        cached = cache.get(key)
+        if not cached:
+            raise
+        return QuizGenerationResponse.model_validate(cached)
+
+    cache.set(key, result.model_dump(), settings.AGENT_FALLBACK_CACHE_TTL)
+    return result
+
+
+def _generate_chunked(subject: str, topic: str, level: str, num_questions: int) -> QuizGenerationResponse:
+    """
+    Split the topic into one subtopic per chunk with a small outline call,
+    generate the chunks concurrently (each told which subtopics the others
+    cover), then merge and drop near-duplicates. Chunks ask for a few extra
+    questions so the quiz is still full after deduplication.
+    """
+    chunks = math.ceil(num_questions / settings.QUIZ_CHUNK_SIZE)
+    subtopics = _request_outline(subject, topic, level, chunks)
+    per_chunk = math.ceil(num_questions * (1 + settings.QUIZ_CHUNK_OVERSAMPLE) / chunks)
+
+    def chunk(i):
+        others = [s for j, s in enumerate(subtopics) if j != i]
+        return _request_quiz(subject, topic, level, per_chunk, focus=subtopics[i], avoid=others)
+
+    with ContextThreadPoolExecutor(max_workers=min(chunks, settings.QUIZ_GENERATION_CONCURRENCY)) as pool:
+        questions = [q for result in pool.map(chunk, range(chunks)) for q in result.questions]
+
+    keep = unique_indices(
+        [q.question_text for q in questions], threshold=settings.QUIZ_DUPLICATE_THRESHOLD
     )
+    return QuizGenerationResponse(questions=[questions[i] for i in keep][:num_questions])
 
-    return completion.choices[0].message.parsed
 
-def evaluate_quiz(quiz_data: List[dict]) -> EvaluationResult:
-    prompt = f"""
-Evaluate the following quiz attempt. For each question, check if the student's answer is correct.
-Return total score out of 100, detailed feedback, and correctness per question.
+def _request_outline(subject: str, topic: str, level: str, parts: int) -> list:
+    completion = complete(
+        router.QUIZ_OUTLINE,
+        build_messages(
+            QUIZ_OUTLINE_INSTRUCTIONS,
+            request=f"Subject: {subject}\nTopic: {topic}\nLevel: {level}\nSubtopics: {parts}",
+        ),
+        response_format=QuizOutline
+    )
+    subtopics = [s for s in completion.choices[0].message.parsed.subtopics if s.strip()]
+    # Pad or trim so every chunk has a focus
+    return [subtopics[i] if i < len(subtopics) else f"{topic} (part {i + 1})" for i in range(parts)]
 
-{quiz_data}
-"""
 
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are an AI quiz evaluator."},
-            {"role": "user", "content": prompt}
-        ],
-        response_format=EvaluationResult
+def _request_quiz(subject: str, topic: str, level: str, num_questions: int, focus: str = None,
+                  avoid: List[str] = None) -> QuizGenerationResponse:
+    request = f"Subject: {subject}\nTopic: {topic}\nLevel: {level}\nNumber of questions: {num_questions}"
+    if focus:
+        request += f"\nFocus: {focus}"
+    if avoid:
+        request += f"\nCovered elsewhere: {', '.join(avoid)}"
+
+    completion = complete(
+        router.GENERATE_QUIZ,
+        build_messages(QUIZ_GENERATOR_INSTRUCTIONS, request=request),
+        response_format=QuizGenerationResponse
+    )
+
+    return completion.choices[0].message.parsed
+
+def evaluate_quiz_batch(quizzes: List[dict]) -> BatchEvaluationResult:
+    # Scores are computed in the database; the model only writes feedback,
+    # one entry per quiz_id, for every quiz packed into this call.
+    completion = complete(
+        router.QUIZ_FEEDBACK,
+        build_messages(QUIZ_FEEDBACK_INSTRUCTIONS, request=to_json(quizzes)),
+        response_format=BatchEvaluationResult
     )
 
-    return completion.choices[0].message.parsed
\ No newline at end of file
+    return completion.choices[0].message.parsed
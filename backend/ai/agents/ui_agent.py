@@ -1,42 +1,70 @@
-from openai import OpenAI
-from decouple import config
-from ai.utils.tools import apply_learning_plan_updates
-from ai.utils.schemas import UpdateLearningPlanRequest
+from django.conf import settings
+from ai.utils.tools import TOOL_DEFINITIONS, ToolContext, run_tool_calls
+from ai.utils.llm import complete, stream_complete
+from ai.utils import router
+from ai.utils.prompts import build_messages, to_json
 
-client = OpenAI(api_key=config("OPENAI_API_KEY"))
+ASSISTANT_INSTRUCTIONS = """
+You are an interactive learning assistant. Help the student improve their plan.
+The student's profile and current learning plan are given as JSON before the conversation.
+Use get_quiz_history and search_resources when you need details that are not in the profile.
+Call update_learning_plan only when the student asks to change their plan, then tell them what changed.
+You can call several tools at once. Always finish with a reply to the student.
+"""
 
-def interact_with_student(student_data: dict, learning_plan: dict, user_message: str, chat_context: list) -> str:
-    # Compose the full message list: system → context → prior chat → new user message
-    messages = [
-        {"role": "system", "content": "You are an interactive learning assistant. Help the student improve their plan."},
-        {"role": "user", "content": f"Student profile: {student_data}\nLearning Plan: {learning_plan}"}
-    ] + chat_context + [
-        {"role": "user", "content": user_message}
-    ]
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        tools=[
-            {
-                "type": "function",
-                "function": {
-                    "name": "update_learning_plan",
-                    "description": "Update the student's learning plan based on feedback",
-                    "parameters": UpdateLearningPlanRequest.model_json_schema()
+def degraded_reply(learning_plan: dict) -> str:
+    """Canned answer used while the assistant is unavailable, pointing at the current plan."""
+    weeks = learning_plan.get("weekly_plan") or []
+    if not weeks:
+        return "The learning assistant is temporarily unavailable. Please try again in a few minutes."
+    topics = ", ".join(weeks[0]["focus_topics"]) or "your current topics"
+    return (
+        "The learning assistant is temporarily unavailable. Please try again in a few minutes. "
+        f"Meanwhile, keep going with your plan: week {weeks[0]['week']} focuses on {topics}."
+    )
 
-                }
-            }
-        ],
-        tool_choice="auto"
+def interact_with_student(student_data: dict, context: ToolContext, user_message: str, chat_context: list,
+                          on_text=None) -> str:
+    """
+    Answer one chat turn. The model may call tools for up to
+    CHAT_MAX_TOOL_ROUNDS rounds; each round's tool calls run together and
+    their results are fed back until the model replies in text. With
+    `on_text`, completions are streamed and reply text is passed to it as it
+    arrives.
+    """
+    # Compose the full message list: system → context → prior chat → new user message
+    messages = build_messages(
+        ASSISTANT_INSTRUCTIONS,
+        context={"Student profile": student_data, "Learning plan": context.plan_data()},
+        history=chat_context,
+        request=user_message,
     )
 
-    msg = response.choices[0].message
+    for round_number in range(settings.CHAT_MAX_TOOL_ROUNDS + 1):
+        # The last round may not call tools, so the loop always ends in a reply.
+        tool_choice = "auto" if round_number < settings.CHAT_MAX_TOOL_ROUNDS else "none"
+        # Only the completion is hedged; tools run below, once per call.
+        if on_text is None:
+            msg = complete(router.CHAT, messages, tools=TOOL_DEFINITIONS, tool_choice=tool_choice).choices[0].message
+        else:
+            msg = stream_complete(router.CHAT, messages, on_text, tools=TOOL_DEFINITIONS, tool_choice=tool_choice)
+        if not msg.tool_calls:
+            return msg.content or ""
+
+        messages.append({
+            "role": "assistant",
+            "content": msg.content,
+            "tool_calls": [
+                {
+                    "id": call.id,
+                    "type": "function",
+                    "function": {"name": call.function.name, "arguments": call.function.arguments},
+                }
+                for call in msg.tool_calls
+            ],
+        })
+        for call, result in zip(msg.tool_calls, run_tool_calls(context, msg.tool_calls)):
+            messages.append({"role": "tool", "tool_call_id": call.id, "content": to_json(result)})
 
-    if msg.tool_calls:
-        for tool_call in msg.tool_calls:
-            if tool_call.function.name == "update_learning_plan":
-                args = UpdateLearningPlanRequest.model_validate_json(tool_call.function.arguments)
-                return apply_learning_plan_updates(args)
-    else:
-        return msg.content
\ No newline at end of file
+    return msg.content or ""
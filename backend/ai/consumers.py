@@ -0,0 +1,132 @@
+from collections import deque
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from ai.agents.ui_agent import degraded_reply, interact_with_student
+from ai.models import AgentInteractionLog
+from ai.utils.resilience import AgentUnavailable
+from ai.utils.tools import ToolContext
+from student.models import Quiz, StudentInfo
+from student.projections import QUIZ_FIELDS, build_student_profile, load_profile_section
+
+
+def chat_group(student_id) -> str:
+    return f"chat.student.{student_id}"
+
+
+class ChatSession:
+    """
+    Everything a chat turn needs, loaded once per connection: the student's
+    profile, their plan (as a ToolContext) and the recent conversation.
+    Changes made elsewhere arrive as deltas (see ai.signals) and only reload
+    the affected section.
+    """
+
+    def __init__(self, student, profile, tool_context, history):
+        self.student = student
+        self.profile = profile
+        self.tool_context = tool_context
+        self.history = history
+
+    @classmethod
+    def load(cls, student):
+        profile = build_student_profile(student, require_info=True)
+        history = deque(maxlen=2 * settings.CHAT_HISTORY_TURNS)
+        past_chats = AgentInteractionLog.objects.filter(student=student).order_by("-created_at")[
+            :settings.CHAT_HISTORY_TURNS
+        ]
+        for chat in reversed(past_chats):
+            history.append({"role": "user", "content": chat.user_message})
+            history.append({"role": "assistant", "content": chat.agent_response})
+        return cls(student, profile, ToolContext.for_student(student), history)
+
+    def reply(self, message, on_text) -> str:
+        response = interact_with_student(self.profile, self.tool_context, message, list(self.history), on_text)
+        AgentInteractionLog.objects.create(student=self.student, user_message=message, agent_response=response)
+        self.history.append({"role": "user", "content": message})
+        self.history.append({"role": "assistant", "content": response})
+        return response
+
+    def apply_delta(self, section, object_id=None):
+        if section == "plan":
+            self.tool_context = ToolContext.for_student(self.student)
+        elif section == "quizzes" and object_id is not None:
+            row = Quiz.objects.filter(id=object_id, student=self.student).values(*QUIZ_FIELDS).first()
+            quizzes = [q for q in self.profile["quizzes"] if q["id"] != object_id]
+            if row is not None:
+                quizzes.append(row)
+                quizzes.sort(key=lambda q: q["id"])
+            self.profile["quizzes"] = quizzes
+        else:
+            self.profile[section] = load_profile_section(self.student, section)
+
+
+class ChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Streaming chat over WebSocket at /ws/chat/?token=<access token>.
+
+    Client sends {"type": "message", "message": "..."}; the server answers
+    with {"type": "delta", "text": ...} chunks and a final
+    {"type": "reply", "response": ...}. Messages on one socket are handled
+    in order.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        try:
+            self.session = await database_sync_to_async(ChatSession.load)(user)
+        except StudentInfo.DoesNotExist:
+            await self.accept()
+            await self.send_json({"type": "error", "error": "Complete your profile before chatting."})
+            await self.close(code=4400)
+            return
+
+        self.group = chat_group(user.id)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+        await self.send_json({"type": "ready"})
+
+    async def disconnect(self, code):
+        if hasattr(self, "group"):
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # Frames are client input: anything but {"type": "message", "message": str} gets the error frame
+        if not isinstance(content, dict) or not isinstance(content.get("message"), str):
+            content = {}
+        message = content.get("message", "").strip()
+        if content.get("type") != "message" or not message:
+            await self.send_json({"type": "error", "error": "Send {\"type\": \"message\", \"message\": \"...\"}."})
+            return
+
+        send_delta = async_to_sync(self.send_json)
+
+        def on_text(text):
+            send_delta({"type": "delta", "text": text})
+
+        try:
+            # Not thread-sensitive: each session's LLM call gets its own worker thread.
+            response = await database_sync_to_async(self.session.reply, thread_sensitive=False)(message, on_text)
+        except AgentUnavailable as e:
+            await self.send_json({
+                "type": "error",
+                "error": str(e),
+                "response": degraded_reply(self.session.tool_context.plan_data()),
+                "degraded": True,
+            })
+            return
+        except Exception as e:
+            await self.send_json({"type": "error", "error": str(e)})
+            return
+
+        await self.send_json({"type": "reply", "response": response})
+
+    async def context_delta(self, event):
+        await database_sync_to_async(self.session.apply_delta)(event["section"], event.get("id"))
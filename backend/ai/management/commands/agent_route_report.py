@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ai.models import AgentCall
+
+
+class Command(BaseCommand):
+    help = "Per-route latency, token, error and prompt-cache metrics for routed agent calls."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+        parser.add_argument("--task", help="Only report this task.")
+
+    def handle(self, *args, **options):
+        calls = AgentCall.objects.filter(created_at__gte=timezone.now() - timedelta(days=options["days"]))
+        if options["task"]:
+            calls = calls.filter(task=options["task"])
+
+        groups = {}
+        for task, model, reason, latency, prompt, cached, completion, outcome in calls.values_list(
+            "task", "model", "reason", "latency_ms", "prompt_tokens", "cached_tokens", "completion_tokens", "outcome"
+        ).iterator(chunk_size=5000):
+            group = groups.setdefault((task, model, reason), {
+                "latency": [], "prompt": [], "cached": [], "completion": [], "hit": [], "miss": [], "errors": 0,
+            })
+            group["latency"].append(latency)
+            if outcome == "ok":
+                group["prompt"].append(prompt or 0)
+                group["cached"].append(cached or 0)
+                group["completion"].append(completion or 0)
+                group["hit" if cached else "miss"].append(latency)
+            else:
+                group["errors"] += 1
+
+        # cache% is the share of prompt tokens served from the provider's
+        # prefix cache; hit/miss p50 compare latency with and without a hit.
+        self.stdout.write(
+            f"{'task':<22}{'model':<16}{'reason':<14}{'calls':>7}{'err%':>7}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'in tok':>9}{'out tok':>9}{'cache%':>8}{'hit p50':>9}{'miss p50':>9}"
+        )
+        for (task, model, reason), group in sorted(groups.items()):
+            latency = np.array(group["latency"])
+            prompt_total = sum(group["prompt"])
+            self.stdout.write(
+                f"{task:<22}{model:<16}{reason:<14}{len(latency):>7}"
+                f"{100 * group['errors'] / len(latency):>7.1f}"
+                f"{np.percentile(latency, 50):>9.0f}{np.percentile(latency, 95):>9.0f}"
+                f"{_mean(group['prompt']):>9.0f}{_mean(group['completion']):>9.0f}"
+                f"{100 * sum(group['cached']) / prompt_total if prompt_total else 0:>8.1f}"
+                f"{_median(group['hit']):>9}{_median(group['miss']):>9}"
+            )
+
+
+def _mean(values):
+    return float(np.mean(values)) if values else 0.0
+
+
+def _median(values):
+    return f"{np.percentile(values, 50):.0f}" if values else "-"
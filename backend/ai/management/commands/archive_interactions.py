@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from ai.utils.archive import archivable_months, archive_horizon, archive_month
+
+
+class Command(BaseCommand):
+    help = "Move AgentInteractionLog rows older than INTERACTION_LOG_HOT_DAYS to monthly gzipped NDJSON archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hot-days", type=int, help="Override INTERACTION_LOG_HOT_DAYS.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--dry-run", action="store_true", help="Only list the months that would be archived.")
+
+    def handle(self, *args, **options):
+        horizon = archive_horizon(options["hot_days"])
+        months = archivable_months(horizon)
+        if not months:
+            self.stdout.write(f"Nothing older than {horizon} to archive.")
+            return
+
+        for month in months:
+            if options["dry_run"]:
+                self.stdout.write(f"Would archive {month:%Y-%m}")
+                continue
+            count = archive_month(month, chunk_size=options["chunk_size"])
+            self.stdout.write(f"{month:%Y-%m}: archived {count} interactions")
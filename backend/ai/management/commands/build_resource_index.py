@@ -0,0 +1,24 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai.utils.retrieval import build_resource_index
+
+
+class Command(BaseCommand):
+    help = "Embed the Resource catalog into the on-disk similarity index used for plan recommendations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.RESOURCE_INDEX_PATH,
+                            help="Where to write the .npz index (default: RESOURCE_INDEX_PATH).")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        index = build_resource_index(batch_size=options["batch_size"])
+        index.save(options["output"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index)} resources ({index.dim} dims) into {options['output']} "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
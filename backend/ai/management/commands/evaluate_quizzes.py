@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from ai.utils.grading import grade_quizzes
+from student.models import Question, Quiz
+
+
+class Command(BaseCommand):
+    help = "Grade pending quizzes that have submitted answers, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quiz-ids", type=int, nargs="*", help="Only grade these quizzes.")
+        parser.add_argument("--student", help="Only grade quizzes of the student with this email.")
+        parser.add_argument("--batch-size", type=int, default=500,
+                            help="Quizzes graded per pass (default: 500).")
+        parser.add_argument("--limit", type=int, help="Stop after this many quizzes.")
+
+    def handle(self, *args, **options):
+        answered = Question.objects.filter(quiz=OuterRef("pk")).exclude(student_answer="")
+        quizzes = Quiz.objects.filter(status="pending").filter(Exists(answered)).order_by("id")
+        if options["quiz_ids"]:
+            quizzes = quizzes.filter(id__in=options["quiz_ids"])
+        if options["student"]:
+            quizzes = quizzes.filter(student__email=options["student"])
+
+        started = time.perf_counter()
+        graded = 0
+        last_id = 0
+        while options["limit"] is None or graded < options["limit"]:
+            size = options["batch_size"]
+            if options["limit"] is not None:
+                size = min(size, options["limit"] - graded)
+            batch_ids = list(quizzes.filter(id__gt=last_id).values_list("id", flat=True)[:size])
+            if not batch_ids:
+                break
+
+            results = grade_quizzes(Quiz.objects.filter(id__in=batch_ids))
+            graded += len(results)
+            last_id = batch_ids[-1]
+            self.stdout.write(f"Graded {graded} quizzes...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Graded {graded} quizzes in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ai.models import IdempotencyRecord
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        expired = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now())
+        total = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:options["chunk_size"]])
+            if not ids:
+                break
+            total += IdempotencyRecord.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f"Deleted {total} expired idempotency records.")
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-19 10:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InteractionArchiveSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('path', models.CharField(max_length=500)),
+                ('count', models.PositiveIntegerField()),
+                ('offset', models.PositiveBigIntegerField()),
+                ('length', models.PositiveBigIntegerField()),
+                ('last_id', models.BigIntegerField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='agentinteractionlog',
+            index=models.Index(fields=['student', '-created_at'], name='ai_interaction_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='agentinteractionlog',
+            index=models.Index(fields=['created_at'], name='ai_interaction_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='interactionarchivesegment',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interaction_archives', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='interactionarchivesegment',
+            index=models.Index(fields=['student', 'month'], name='ai_interact_student_02e432_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0003_idempotency_record'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentCall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=50)),
+                ('model', models.CharField(max_length=100)),
+                ('reason', models.CharField(max_length=50)),
+                ('latency_ms', models.PositiveIntegerField()),
+                ('prompt_tokens', models.PositiveIntegerField(blank=True, null=True)),
+                ('completion_tokens', models.PositiveIntegerField(blank=True, null=True)),
+                ('outcome', models.CharField(choices=[('ok', 'OK'), ('error', 'Error')], default='ok', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
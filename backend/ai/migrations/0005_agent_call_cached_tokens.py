@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0004_agent_call'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='agentcall',
+            name='cached_tokens',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -6,5 +6,84 @@ class AgentInteractionLog(models.Model):
     agent_response = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "-created_at"], name="ai_interaction_recent_idx"),
+            models.Index(fields=["created_at"], name="ai_interaction_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"Interaction with {self.student.email} at {self.created_at}"
+
+
+class InteractionArchiveSegment(models.Model):
+    """
+    Manifest entry for interactions moved out of AgentInteractionLog: `count`
+    turns of `student` from `month`, stored in the gzipped NDJSON file `path`
+    as one gzip member of `length` bytes at `offset`. `last_id` is the
+    highest archived interaction id.
+    """
+    student = models.ForeignKey("student.Student", on_delete=models.CASCADE, related_name="interaction_archives")
+    month = models.DateField()
+    path = models.CharField(max_length=500)
+    count = models.PositiveIntegerField()
+    offset = models.PositiveBigIntegerField()
+    length = models.PositiveBigIntegerField()
+    last_id = models.BigIntegerField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["student", "month"])]
+
+    def __str__(self):
+        return f"{self.student.email} {self.month:%Y-%m} ({self.count} turns)"
+
+
+class IdempotencyRecord(models.Model):
+    """
+    One `Idempotency-Key` sent by a student: the fingerprint of the request it
+    was first used with and, once finished, the response to replay.
+    """
+    STATUS_CHOICES = [
+        ("in_progress", "In progress"),
+        ("completed", "Completed"),
+    ]
+
+    student = models.ForeignKey("student.Student", on_delete=models.CASCADE, related_name="idempotency_records")
+    key = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="in_progress")
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "key"], name="unique_idempotency_key_per_student"),
+        ]
+
+    def __str__(self):
+        return f"{self.student.email} {self.endpoint} [{self.key}] {self.status}"
+
+
+class AgentCall(models.Model):
+    """Latency and token usage of one routed LLM call (see ai.utils.router)."""
+    OUTCOME_CHOICES = [
+        ("ok", "OK"),
+        ("error", "Error"),
+    ]
+
+    task = models.CharField(max_length=50)
+    model = models.CharField(max_length=100)
+    reason = models.CharField(max_length=50)
+    latency_ms = models.PositiveIntegerField()
+    prompt_tokens = models.PositiveIntegerField(null=True, blank=True)
+    completion_tokens = models.PositiveIntegerField(null=True, blank=True)
+    cached_tokens = models.PositiveIntegerField(null=True, blank=True)
+    outcome = models.CharField(max_length=10, choices=OUTCOME_CHOICES, default="ok")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
     def __str__(self):
-        return f"Interaction with {self.student.email} at {self.created_at}"
\ No newline at end of file
+        return f"{self.task} via {self.model} ({self.latency_ms} ms, {self.outcome})"
@@ -0,0 +1,57 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from learningplan.models import LearningPlan, LearningPlanWeek
+from student.models import LearningGoal, Quiz, StudentInfo, StudentResourceLog, StudentSubject
+
+
+def notify_context_change(student_id, section, object_id=None):
+    """
+    Tell the student's open chat sessions that one section of their context
+    changed, once the current transaction commits. With the in-memory
+    channel layer only sessions in this process are reached.
+    """
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    from ai.consumers import chat_group
+
+    event = {"type": "context.delta", "section": section, "id": object_id}
+    transaction.on_commit(lambda: async_to_sync(layer.group_send)(chat_group(student_id), event))
+
+
+PROFILE_MODELS = {
+    StudentInfo: "info",
+    StudentSubject: "subjects",
+    LearningGoal: "goals",
+    StudentResourceLog: "resource_logs",
+}
+
+# Receivers are connected per sender: a receiver without one would listen to
+# every model and disable fast deletes across the project.
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def push_quiz_delta(sender, instance, **kwargs):
+    notify_context_change(instance.student_id, "quizzes", instance.id)
+
+
+@receiver([post_save, post_delete], sender=StudentInfo)
+@receiver([post_save, post_delete], sender=StudentSubject)
+@receiver([post_save, post_delete], sender=LearningGoal)
+@receiver([post_save, post_delete], sender=StudentResourceLog)
+def push_profile_delta(sender, instance, **kwargs):
+    notify_context_change(instance.student_id, PROFILE_MODELS[sender])
+
+
+@receiver([post_save, post_delete], sender=LearningPlan)
+def push_plan_delta(sender, instance, **kwargs):
+    notify_context_change(instance.student_id, "plan")
+
+
+@receiver([post_save, post_delete], sender=LearningPlanWeek)
+def push_plan_week_delta(sender, instance, **kwargs):
+    notify_context_change(instance.plan.student_id, "plan")
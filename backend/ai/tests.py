@@ -1,3 +1,70 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from ai.utils.grading import grade_quizzes
+from ai.utils.resilience import AgentUnavailable
+from ai.utils.schemas import BatchEvaluationResult, QuizFeedback
+from student.models import Question, Quiz, Student, Subject
+
+
+def feedback_stand_in(failing_quiz_id):
+    """An agent that writes feedback for every batch except the one holding `failing_quiz_id`."""
+    def evaluate(batch):
+        if any(item["quiz_id"] == failing_quiz_id for item in batch):
+            raise AgentUnavailable("provider down")
+        return BatchEvaluationResult(results=[
+            QuizFeedback(quiz_id=item["quiz_id"], feedback=f"feedback {item['quiz_id']}") for item in batch
+        ])
+    return evaluate
+
+
+@override_settings(QUIZ_FEEDBACK_BATCH_SIZE=1, QUIZ_FEEDBACK_CONCURRENCY=1)
+class GradingTests(TestCase):
+    def setUp(self):
+        self.student = Student.objects.create_user(email="grader@example.com", password="pw")
+        subject = Subject.objects.create(name="Algorithms")
+        self.quizzes = []
+        for _ in range(3):
+            quiz = Quiz.objects.create(student=self.student, subject=subject, total_marks=2)
+            for text in ("first", "second"):
+                Question.objects.create(quiz=quiz, question_text=text, options={"A": "a", "B": "b"},
+                                        correct_option="A")
+            self.quizzes.append(quiz)
+
+    def answers(self, quiz):
+        return {str(q.id): "A" if q.question_text == "first" else "B" for q in quiz.questions.all()}
+
+    def test_failed_feedback_batch_keeps_the_others(self):
+        failing = self.quizzes[1]
+        with mock.patch("ai.utils.grading.evaluate_quiz_batch", feedback_stand_in(failing.id)), \
+                mock.patch("ai.utils.grading.notify_context_change") as notify, \
+                self.assertLogs("ai.utils.grading", "WARNING"):
+            results = grade_quizzes(
+                Quiz.objects.filter(student=self.student),
+                {quiz.id: self.answers(quiz) for quiz in self.quizzes},
+            )
+
+        self.assertEqual(len(results), 3)
+        notify.assert_called_once_with(self.student.id, "quizzes")
+        for quiz in Quiz.objects.filter(student=self.student):
+            self.assertEqual((quiz.status, quiz.score), ("completed", 50.0))
+            self.assertEqual(quiz.ai_feedback, "" if quiz.id == failing.id else f"feedback {quiz.id}")
+
+    def test_evaluating_a_graded_quiz_is_a_conflict(self):
+        quiz = self.quizzes[0]
+        client = APIClient()
+        client.force_authenticate(self.student)
+
+        with mock.patch("ai.utils.grading.evaluate_quiz_batch", feedback_stand_in(None)):
+            first = client.post("/ai/quiz/evaluate/", {"quiz_id": quiz.id, "answers": self.answers(quiz)},
+                                format="json")
+            again = client.post("/ai/quiz/evaluate/", {"quiz_id": quiz.id, "answers": {}}, format="json")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["score"], 50.0)
+        self.assertEqual(again.status_code, 409)
+        self.assertEqual(again.json()["score"], 50.0)
+        self.assertEqual(again.json()["feedback"], f"feedback {quiz.id}")
+        self.assertEqual(quiz.questions.filter(is_correct=True).count(), 1)
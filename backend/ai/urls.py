@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import ChatAPIView, EvaluateQuizView, GenerateAndSaveQuizView
+from .views import ChatAPIView, EvaluateQuizView, GenerateAndSaveQuizView, BatchEvaluateQuizView
 
 urlpatterns = [
     path("chat/", ChatAPIView.as_view(), name="chat-with-learning-assistant"),
     path("quiz/generate/", GenerateAndSaveQuizView.as_view(), name="generate-quiz"),
-    path("quiz/evaluate/", EvaluateQuizView.as_view(), name="evaluate-quiz")
+    path("quiz/evaluate/", EvaluateQuizView.as_view(), name="evaluate-quiz"),
+    path("quiz/evaluate/batch/", BatchEvaluateQuizView.as_view(), name="evaluate-quiz-batch"),
 ]
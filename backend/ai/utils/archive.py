@@ -0,0 +1,139 @@
+import gzip
+import os
+from datetime import date, datetime, time, timedelta
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from ai.models import AgentInteractionLog, InteractionArchiveSegment
+from config.renderers import dumps
+
+ARCHIVE_FIELDS = ("id", "student_id", "user_message", "agent_response", "created_at")
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _aware(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def archive_horizon(hot_days=None) -> date:
+    """First day of the oldest month that still has to stay hot; everything before it is archivable."""
+    hot_days = settings.INTERACTION_LOG_HOT_DAYS if hot_days is None else hot_days
+    return _month_start(timezone.localdate() - timedelta(days=hot_days))
+
+
+def archivable_months(horizon) -> list:
+    months = (
+        AgentInteractionLog.objects.filter(created_at__lt=_aware(horizon))
+        .annotate(month=TruncMonth("created_at"))
+        .values_list("month", flat=True)
+        .distinct()
+        .order_by("month")
+    )
+    return [timezone.localtime(month).date() for month in months]
+
+
+# -----------------------------
+# Hot -> cold
+# -----------------------------
+
+def archive_month(month, chunk_size=2000) -> int:
+    """
+    Move every interaction created in `month` to a gzipped NDJSON file under
+    INTERACTION_ARCHIVE_DIR, record one manifest row per student, then delete
+    the archived rows in chunks. Only whole, closed months are archived, so
+    nothing is added to a month after it has been written out.
+
+    Each student's turns are written as their own gzip member and the
+    manifest keeps its byte range, so one student's history is read without
+    decompressing anyone else's. The file name is fixed per month and the
+    manifest is the commit point: a rerun after a crash either rewrites the
+    file (no manifest yet) or only finishes the delete.
+    """
+    start, end = _aware(month), _aware(_next_month(month))
+    rows = AgentInteractionLog.objects.filter(created_at__gte=start, created_at__lt=end)
+
+    segments = InteractionArchiveSegment.objects.filter(month=month)
+    if segments.exists():
+        # Already written out by an earlier run that stopped before the delete finished
+        return _delete_archived(rows, segments, chunk_size)
+    if not rows.exists():
+        return 0
+
+    os.makedirs(settings.INTERACTION_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(settings.INTERACTION_ARCHIVE_DIR, f"interactions-{month:%Y-%m}.ndjson.gz")
+
+    manifest = []
+    with open(path + ".tmp", "wb") as raw:
+        segment = writer = None
+        for row in rows.order_by("student_id", "id").values(*ARCHIVE_FIELDS).iterator(chunk_size=chunk_size):
+            if segment is None or row["student_id"] != segment.student_id:
+                _close_member(raw, segment, writer)
+                segment = InteractionArchiveSegment(
+                    student_id=row["student_id"], month=month, path=path, count=0, offset=raw.tell()
+                )
+                writer = gzip.GzipFile(fileobj=raw, mode="wb")
+                manifest.append(segment)
+            writer.write(dumps(row) + b"\n")
+            segment.count += 1
+            segment.last_id = row["id"]
+        _close_member(raw, segment, writer)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(path + ".tmp", path)
+
+    InteractionArchiveSegment.objects.bulk_create(manifest)
+    _delete_archived(rows, segments, chunk_size)
+    return sum(segment.count for segment in manifest)
+
+
+def _close_member(raw, segment, writer):
+    if segment is not None:
+        writer.close()
+        segment.length = raw.tell() - segment.offset
+
+
+def _delete_archived(rows, segments, chunk_size) -> int:
+    """Delete the month's rows covered by the manifest; returns how many turns the manifest holds."""
+    totals = segments.aggregate(last_id=Max("last_id"), count=Sum("count"))
+    archived = rows.filter(id__lte=totals["last_id"])
+    while True:
+        with transaction.atomic():
+            ids = list(archived.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                break
+            AgentInteractionLog.objects.filter(id__in=ids).delete()
+    return totals["count"] or 0
+
+
+# -----------------------------
+# Cold read path
+# -----------------------------
+
+def iter_archived_interactions(student):
+    """Yield a student's archived turns, oldest month first, in the same shape as the hot rows."""
+    segments = (
+        InteractionArchiveSegment.objects.filter(student=student)
+        .order_by("month", "id")
+        .values_list("path", "offset", "length")
+    )
+    for path, offset, length in segments:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = gzip.decompress(f.read(length))
+        for line in data.splitlines():
+            row = orjson.loads(line)
+            del row["student_id"]
+            yield row
+
@@ -0,0 +1,71 @@
+import hashlib
+import re
+
+from ai.utils.embeddings import HashingVectorizer
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case, strip punctuation and collapse whitespace."""
+    return _SPACE.sub(" ", _PUNCTUATION.sub(" ", (text or "").lower())).strip()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def unique_indices(texts, threshold: float, dim: int = 1024) -> list:
+    """
+    Indices of `texts` to keep, in order: exact duplicates after
+    normalization are dropped first, then any text whose cosine similarity
+    to an already kept one is at least `threshold`.
+    """
+    seen = set()
+    candidates = []
+    for i, text in enumerate(texts):
+        digest = content_hash(text)
+        if digest not in seen:
+            seen.add(digest)
+            candidates.append(i)
+    if len(candidates) < 2:
+        return candidates
+
+    vectors = HashingVectorizer(dim).transform([normalize_text(texts[i]) for i in candidates])
+    similarity = vectors @ vectors.T
+    kept = []
+    for row, i in enumerate(candidates):
+        if not kept or similarity[row, kept].max() < threshold:
+            kept.append(row)
+    return [candidates[row] for row in kept]
+
+
+def novel_indices(texts, existing, threshold: float, dim: int = 1024, block: int = 1024) -> list:
+    """
+    Indices of `texts` to keep: unique among themselves (see unique_indices)
+    and below `threshold` cosine similarity to every text in the iterable
+    `existing`. Only new-vs-existing similarities are computed, `block`
+    existing texts at a time, so memory stays at len(texts) x block.
+    """
+    keep = unique_indices(texts, threshold, dim)
+    if not keep:
+        return keep
+
+    vectorizer = HashingVectorizer(dim)
+    new = vectorizer.transform([normalize_text(texts[i]) for i in keep])
+    duplicates = set()
+
+    def compare(batch):
+        too_close = (new @ vectorizer.transform(batch).T).max(axis=1) >= threshold
+        duplicates.update(int(row) for row in too_close.nonzero()[0])
+
+    batch = []
+    for text in existing:
+        batch.append(normalize_text(text))
+        if len(batch) == block:
+            compare(batch)
+            batch = []
+    if batch:
+        compare(batch)
+    return [i for row, i in enumerate(keep) if row not in duplicates]
@@ -0,0 +1,117 @@
+import os
+import re
+import zlib
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+# -----------------------------
+# Hashing vectorizer
+# -----------------------------
+
+class HashingVectorizer:
+    """
+    Stateless CPU-only text embedder: unigrams and bigrams are hashed into a
+    fixed number of signed buckets and the result is L2-normalised, so the dot
+    product of two vectors is their cosine similarity. No model download, no
+    fitting, and the same text always maps to the same vector.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _features(self, text: str):
+        tokens = TOKEN_RE.findall(text.lower())
+        yield from tokens
+        for a, b in zip(tokens, tokens[1:]):
+            yield f"{a} {b}"
+
+    def transform(self, texts) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text or ""):
+                h = zlib.crc32(feature.encode("utf-8"))
+                matrix[row, h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+def resource_text(topic_name: str, type_: str, description: str) -> str:
+    # The topic carries most of the signal, so it is weighted twice.
+    return f"{topic_name} {topic_name} {type_} {description or ''}"
+
+
+# -----------------------------
+# Resource index
+# -----------------------------
+
+class ResourceIndex:
+    """
+    Dense matrix of unit vectors (stored as float16) with the matching
+    Resource ids and subject ids, searched with blocked matrix products.
+    """
+
+    def __init__(self, ids: np.ndarray, subject_ids: np.ndarray, vectors: np.ndarray):
+        self.ids = ids.astype(np.int64, copy=False)
+        self.subject_ids = subject_ids.astype(np.int64, copy=False)
+        self.vectors = vectors.astype(np.float16, copy=False)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, ids=self.ids, subject_ids=self.subject_ids, vectors=self.vectors)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ResourceIndex":
+        with np.load(path) as data:
+            return cls(data["ids"], data["subject_ids"], data["vectors"])
+
+    def search(self, queries: np.ndarray, k: int = 5, subject_ids=None, block_size: int = 8192):
+        """
+        Cosine top-k for a batch of query vectors. Returns (ids, scores), both
+        shaped (len(queries), k); slots without a candidate hold id -1 and
+        score -inf. `subject_ids` restricts candidates to those subjects.
+        """
+        n_queries = queries.shape[0]
+        best_ids = np.full((n_queries, k), -1, dtype=np.int64)
+        best_scores = np.full((n_queries, k), -np.inf, dtype=np.float32)
+        if not len(self) or not n_queries:
+            return best_ids, best_scores
+
+        queries = queries.astype(np.float32, copy=False)
+        allowed = None
+        if subject_ids is not None:
+            allowed = np.isin(self.subject_ids, np.fromiter(subject_ids, dtype=np.int64))
+
+        for start in range(0, len(self), block_size):
+            stop = start + block_size
+            scores = queries @ self.vectors[start:stop].astype(np.float32).T
+            if allowed is not None:
+                scores[:, ~allowed[start:stop]] = -np.inf
+
+            # Merge this block's candidates with the running top-k.
+            merged_scores = np.concatenate([best_scores, scores], axis=1)
+            merged_ids = np.concatenate(
+                [best_ids, np.broadcast_to(self.ids[start:stop], scores.shape)], axis=1
+            )
+            top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(merged_scores, top, axis=1)
+            best_ids = np.take_along_axis(merged_ids, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        best_ids[np.isneginf(best_scores)] = -1
+        return best_ids, best_scores
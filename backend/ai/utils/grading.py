@@ -0,0 +1,138 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, Case, Count, F, Q, Value, When
+
+from ai.agents.quiz import evaluate_quiz_batch
+from ai.signals import notify_context_change
+from config.timing import ContextThreadPoolExecutor
+from student.progress import record_quiz_results
+
+logger = logging.getLogger(__name__)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _apply_answers(quiz_ids, answers):
+    """Write submitted answers ({quiz_id: {question_id: answer}}) in one bulk update."""
+    from student.models import Question
+
+    owned = dict(
+        Question.objects.filter(quiz_id__in=quiz_ids).values_list("id", "quiz_id")
+    )
+    updates = []
+    for quiz_id, quiz_answers in answers.items():
+        for question_id, answer in (quiz_answers or {}).items():
+            question_id = int(question_id)
+            if owned.get(question_id) == int(quiz_id) and answer:
+                updates.append(Question(id=question_id, student_answer=answer))
+
+    Question.objects.bulk_update(updates, ["student_answer"], batch_size=1000)
+
+
+def _feedback_for(batch):
+    try:
+        return evaluate_quiz_batch(batch).results
+    except Exception:
+        # One failed call only costs its own quizzes their feedback
+        logger.warning("Quiz feedback failed for quizzes %s", [item["quiz_id"] for item in batch], exc_info=True)
+        return []
+
+
+def _request_feedback(payloads):
+    feedback = {}
+    batches = list(_chunks(payloads, settings.QUIZ_FEEDBACK_BATCH_SIZE))
+    with ContextThreadPoolExecutor(max_workers=settings.QUIZ_FEEDBACK_CONCURRENCY) as pool:
+        for results in pool.map(_feedback_for, batches):
+            feedback.update({item.quiz_id: item.feedback for item in results})
+    return feedback
+
+
+def quiz_score(correct, total) -> float:
+    """The score of a quiz out of 100."""
+    return round(100 * correct / total, 2) if total else 0.0
+
+
+def grade_quizzes(quizzes, answers=None) -> list:
+    """
+    Grade every pending quiz in the `quizzes` queryset in one pass.
+
+    Pending quizzes are claimed under row locks (locked ones are skipped, so
+    concurrent callers never grade the same quiz), and answers, correctness,
+    scores and status are written with set-based queries in that same
+    transaction. Feedback is requested from the LLM afterwards,
+    QUIZ_FEEDBACK_BATCH_SIZE quizzes per call, outside any lock; quizzes in
+    a call that fails stay graded without feedback.
+    """
+    from student.models import Question, Quiz
+
+    with transaction.atomic():
+        pending = list(
+            quizzes.filter(status="pending").select_for_update(skip_locked=True)
+            .only("id", "student_id")
+        )
+        quiz_ids = [quiz.id for quiz in pending]
+        if not quiz_ids:
+            return []
+
+        questions = Question.objects.filter(quiz_id__in=quiz_ids)
+        if answers:
+            _apply_answers(quiz_ids, answers)
+
+        questions.update(is_correct=Case(
+            When(~Q(student_answer=""), student_answer=F("correct_option"), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ))
+
+        totals = {
+            row["quiz_id"]: row
+            for row in questions.values("quiz_id").annotate(
+                total=Count("id"), correct=Count("id", filter=Q(is_correct=True))
+            )
+        }
+        for quiz in pending:
+            counts = totals.get(quiz.id, {"total": 0, "correct": 0})
+            quiz.score = quiz_score(counts["correct"], counts["total"])
+            quiz.status = "completed"
+        Quiz.objects.bulk_update(pending, ["score", "status"], batch_size=1000)
+        record_quiz_results(quiz_ids)
+
+    missed = {}
+    for row in questions.filter(is_correct=False).values(
+        "quiz_id", "question_text", "correct_option", "student_answer"
+    ):
+        missed.setdefault(row.pop("quiz_id"), []).append(row)
+
+    payloads = [
+        {
+            "quiz_id": quiz.id,
+            "score": quiz.score,
+            "questions": totals.get(quiz.id, {}).get("total", 0),
+            "missed": missed.get(quiz.id, []),
+        }
+        for quiz in pending
+    ]
+    feedback = _request_feedback(payloads)
+
+    for quiz in pending:
+        quiz.ai_feedback = feedback.get(quiz.id, "")
+    Quiz.objects.bulk_update(pending, ["ai_feedback"], batch_size=1000)
+    # bulk_update sends no signals; tell open chat sessions directly
+    for student_id in {quiz.student_id for quiz in pending}:
+        notify_context_change(student_id, "quizzes")
+
+    return [
+        {
+            "quiz_id": quiz.id,
+            "score": quiz.score,
+            "correct": totals.get(quiz.id, {}).get("correct", 0),
+            "total": totals.get(quiz.id, {}).get("total", 0),
+            "feedback": quiz.ai_feedback,
+        }
+        for quiz in pending
+    ]
@@ -0,0 +1,126 @@
+import hashlib
+import time
+from datetime import timedelta
+from functools import wraps
+
+import orjson
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_yasg import openapi
+from rest_framework.response import Response
+
+from ai.models import IdempotencyRecord
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    IDEMPOTENCY_HEADER,
+    openapi.IN_HEADER,
+    type=openapi.TYPE_STRING,
+    required=False,
+    description="Client-generated key (e.g. a UUID). Retries with the same key and body replay the first "
+                "successful response instead of running the request again.",
+)
+
+
+def request_fingerprint(request) -> str:
+    data = request.data
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    payload = orjson.dumps(
+        [request.method, request.path, data], option=orjson.OPT_SORT_KEYS, default=str
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _claim(student, key, endpoint, fingerprint):
+    """Return (record, owned). `owned` is True when this request must execute the view."""
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.IDEMPOTENCY_TTL)
+    stale_before = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+
+    with transaction.atomic():
+        IdempotencyRecord.objects.filter(student=student, key=key, expires_at__lte=now).delete()
+        # Take over a claim whose worker died without finishing or cleaning up
+        IdempotencyRecord.objects.filter(
+            student=student, key=key, fingerprint=fingerprint, status="in_progress", created_at__lte=stale_before
+        ).delete()
+    try:
+        with transaction.atomic():
+            record = IdempotencyRecord.objects.create(
+                student=student, key=key, endpoint=endpoint, fingerprint=fingerprint, expires_at=expires_at
+            )
+        return record, True
+    except IntegrityError:
+        return IdempotencyRecord.objects.filter(student=student, key=key).first(), False
+
+
+def _wait_for(record):
+    """Poll an in-progress record until it completes, disappears or IDEMPOTENCY_WAIT_TIMEOUT passes."""
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    while record is not None and record.status == "in_progress" and time.monotonic() < deadline:
+        time.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+        record = IdempotencyRecord.objects.filter(pk=record.pk).first()
+    return record
+
+
+def _replay(record):
+    return Response(record.response_body, status=record.response_status, headers={"Idempotent-Replayed": "true"})
+
+
+def idempotent(view_method):
+    """
+    Honour the `Idempotency-Key` header on a DRF view method.
+
+    The first request with a key runs the view; a successful (2xx) response is
+    stored for IDEMPOTENCY_TTL seconds and replayed for retries with the same
+    key and body. A retry that arrives while the first request is still
+    running waits for it. Failed responses are not stored, so the client can
+    retry them with the same key. Requests without the header are unaffected.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"error": f"{IDEMPOTENCY_HEADER} must be at most 255 characters."}, status=400)
+
+        fingerprint = request_fingerprint(request)
+        record, owned = _claim(request.user, key, request.path, fingerprint)
+
+        if not owned:
+            if record is None:
+                # The original finished with an error and released the key in between.
+                return wrapper(self, request, *args, **kwargs)
+            if record.fingerprint != fingerprint or record.endpoint != request.path:
+                return Response(
+                    {"error": f"{IDEMPOTENCY_HEADER} was already used for a different request."}, status=422
+                )
+            record = _wait_for(record)
+            if record is not None and record.status == "completed":
+                return _replay(record)
+            if record is None:
+                # The original request failed and released the key: run it now.
+                return wrapper(self, request, *args, **kwargs)
+            return Response(
+                {"error": f"A request with this {IDEMPOTENCY_HEADER} is still in progress."}, status=409
+            )
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if 200 <= response.status_code < 300 and isinstance(response, Response):
+            record.status = "completed"
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=["status", "response_status", "response_body"])
+        else:
+            record.delete()
+        return response
+
+    return wrapper
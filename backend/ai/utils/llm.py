@@ -0,0 +1,114 @@
+import logging
+import time
+from types import SimpleNamespace
+
+from decouple import config
+from django.db import DatabaseError
+from openai import OpenAI
+
+from ai.utils.resilience import AgentUnavailable, get_breaker, guarded_call
+from ai.utils.router import choose_route
+from config.timing import add_time
+
+logger = logging.getLogger(__name__)
+
+client = OpenAI(api_key=config("OPENAI_API_KEY"), timeout=config("OPENAI_TIMEOUT", default=60, cast=float))
+
+
+def record_call(route, latency, usage=None, outcome="ok"):
+    """Store one AgentCall metrics row; metrics never fail the request."""
+    from ai.models import AgentCall
+
+    add_time("llm", latency)
+    try:
+        AgentCall.objects.create(
+            task=route.task,
+            model=route.model,
+            reason=route.reason,
+            latency_ms=int(latency * 1000),
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            cached_tokens=getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None),
+            outcome=outcome,
+        )
+    except DatabaseError:
+        logger.warning("Could not record agent call metrics for %s", route.task, exc_info=True)
+
+
+def complete(task, messages, *, response_format=None, tools=None, tool_choice="auto", budget=None):
+    """
+    Run one chat completion for `task` on the model chosen by the router,
+    inside the resilience guard, and record latency and token usage. With a
+    `response_format` the structured-output endpoint is used. Raises
+    AgentUnavailable when the call fails or the circuit is open.
+    """
+    route = choose_route(task, messages, budget)
+    kwargs = {"model": route.model, "messages": messages}
+    if tools:
+        kwargs.update(tools=tools, tool_choice=tool_choice)
+    if response_format is not None:
+        kwargs["response_format"] = response_format
+        create = client.beta.chat.completions.parse
+    else:
+        create = client.chat.completions.create
+
+    started = time.monotonic()
+    try:
+        completion = guarded_call(f"{task}:{route.model}", create, budget=route.budget, hedge=route.hedge, **kwargs)
+    except Exception:
+        record_call(route, time.monotonic() - started, outcome="error")
+        raise
+    record_call(route, time.monotonic() - started, completion.usage)
+    return completion
+
+
+def stream_complete(task, messages, on_text, *, tools=None, tool_choice="auto"):
+    """
+    Streaming variant of complete() for chat transports. Text deltas are
+    passed to `on_text` as they arrive; tool-call fragments are assembled.
+    Returns a message with `content` and `tool_calls` like a non-streamed
+    completion. Streams are not hedged (tokens may already be delivered),
+    but the circuit breaker still applies.
+    """
+    route = choose_route(task, messages)
+    breaker = get_breaker(f"{task}:{route.model}")
+    if not breaker.allow():
+        raise AgentUnavailable(f"{task} is unavailable (circuit open). Please try again shortly.")
+
+    kwargs = {"model": route.model, "messages": messages, "stream": True, "stream_options": {"include_usage": True}}
+    if tools:
+        kwargs.update(tools=tools, tool_choice=tool_choice)
+
+    started = time.monotonic()
+    text = []
+    calls = {}
+    usage = None
+    try:
+        for chunk in client.chat.completions.create(**kwargs):
+            usage = chunk.usage or usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                text.append(delta.content)
+                on_text(delta.content)
+            for fragment in delta.tool_calls or []:
+                call = calls.setdefault(fragment.index, {"id": None, "name": "", "arguments": ""})
+                call["id"] = fragment.id or call["id"]
+                if fragment.function:
+                    call["name"] += fragment.function.name or ""
+                    call["arguments"] += fragment.function.arguments or ""
+    except Exception as e:
+        breaker.record_failure()
+        record_call(route, time.monotonic() - started, outcome="error")
+        raise AgentUnavailable(f"{task} is unavailable ({type(e).__name__}: {e}). Please try again shortly.") from e
+
+    breaker.record_success()
+    record_call(route, time.monotonic() - started, usage)
+    return SimpleNamespace(
+        content="".join(text) or None,
+        tool_calls=[
+            SimpleNamespace(id=call["id"], function=SimpleNamespace(name=call["name"], arguments=call["arguments"]))
+            for _, call in sorted(calls.items())
+        ] or None,
+    )
@@ -0,0 +1,39 @@
+import orjson
+
+from config.renderers import orjson_default
+
+# Prompt layout
+# -------------
+# Providers cache the longest previously seen prompt *prefix* (tools, then
+# messages in order). Messages are therefore ordered from least to most
+# volatile:
+#   1. system: fixed instructions for the agent, never interpolated
+#   2. context: per-student data that is stable across calls (profile, plan),
+#      serialized deterministically so equal data gives equal bytes
+#   3. history: earlier chat turns
+#   4. request: the data that changes on every call
+
+
+def to_json(data) -> str:
+    """Deterministic JSON (sorted keys) for prompt sections."""
+    return orjson.dumps(
+        data, default=orjson_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+def build_messages(instructions: str, *, context: dict = None, history: list = None, request: str = None) -> list:
+    """
+    Build the message list for one call. `context` maps section labels to
+    data and should be given most-stable first; `request` is the volatile
+    per-call input.
+    """
+    messages = [{"role": "system", "content": instructions.strip()}]
+    if context:
+        messages.append({
+            "role": "user",
+            "content": "\n\n".join(f"{label}:\n{to_json(value)}" for label, value in context.items()),
+        })
+    messages.extend(history or [])
+    if request is not None:
+        messages.append({"role": "user", "content": request.strip()})
+    return messages
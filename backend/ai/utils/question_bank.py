@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from ai.agents.quiz import generate_quiz
+from ai.utils.dedup import content_hash, normalize_text, novel_indices
+from ai.utils.resilience import AgentUnavailable
+
+
+def normalize_topic(topic: str) -> str:
+    return normalize_text(topic)[:100]
+
+
+def _bank(subject, topic, level):
+    from student.models import BankQuestion
+
+    return BankQuestion.objects.filter(subject=subject, topic=normalize_topic(topic), level=level)
+
+
+def _seen_ids(student):
+    from student.models import Question
+
+    return Question.objects.filter(quiz__student=student, bank_question__isnull=False).values("bank_question_id")
+
+
+def add_to_bank(subject, topic, level, questions) -> list:
+    """
+    Store generated questions (QuizQuestion schemas) in the bank, skipping
+    ones that duplicate each other or questions already banked under the same
+    key. Returns the newly stored BankQuestions.
+    """
+    from student.models import BankQuestion
+
+    bank = _bank(subject, topic, level)
+    texts = [q.question_text for q in questions]
+    # Exact duplicates of anything banked are dropped by hash; near duplicates
+    # only against the QUESTION_BANK_DEDUP_WINDOW most recent questions.
+    banked = set(bank.filter(content_hash__in=[content_hash(t) for t in texts]).values_list("content_hash", flat=True))
+    recent = bank.order_by("-id").values_list("question_text", flat=True)[:settings.QUESTION_BANK_DEDUP_WINDOW]
+    keep = [
+        i for i in novel_indices(texts, recent.iterator(), settings.QUIZ_DUPLICATE_THRESHOLD)
+        if content_hash(texts[i]) not in banked
+    ]
+
+    new = [
+        BankQuestion(
+            subject=subject,
+            topic=normalize_topic(topic),
+            level=level,
+            question_text=questions[i].question_text,
+            options={opt.key: opt.value for opt in questions[i].options},
+            correct_option=questions[i].correct_option,
+            content_hash=content_hash(questions[i].question_text),
+        )
+        for i in keep
+    ]
+    BankQuestion.objects.bulk_create(new, ignore_conflicts=True)
+    return list(_bank(subject, topic, level).filter(content_hash__in=[q.content_hash for q in new]))
+
+
+def sample_unseen(student, subject, topic, level, count) -> list:
+    """
+    Least-used bank questions for this key that `student` has never been
+    given, leaving out questions item analysis flagged as poor.
+    """
+    from student.item_analysis import poor_items
+
+    return list(
+        _bank(subject, topic, level)
+        .exclude(id__in=_seen_ids(student))
+        .exclude(id__in=poor_items())
+        .order_by("usage_count", "?")[:count]
+    )
+
+
+def assemble_quiz(student, subject, topic, level, count) -> tuple:
+    """
+    Pick `count` questions for a new quiz: unseen bank questions first, and
+    only when the bank is thin for this student, generate the shortfall
+    with the LLM and bank it. Returns (bank_questions, generated_count).
+
+    If the provider is unavailable, the shortfall is filled from questions
+    the student has already seen; AgentUnavailable is raised only when the
+    bank has nothing for this key at all.
+    """
+    from student.models import BankQuestion
+
+    picked = sample_unseen(student, subject, topic, level, count)
+    generated = 0
+    unavailable = None
+    missing = count - len(picked)
+    if missing > 0:
+        try:
+            request = max(missing, settings.QUESTION_BANK_MIN_TOP_UP)
+            result = generate_quiz(subject.name, topic, level, request)
+            fresh = add_to_bank(subject, topic, level, result.questions)[:missing]
+            picked += fresh
+            generated = len(fresh)
+        except AgentUnavailable as e:
+            unavailable = e
+
+    missing = count - len(picked)
+    if missing > 0:
+        # Degraded: repeat questions the student has seen rather than fail
+        picked += list(
+            _bank(subject, topic, level).exclude(id__in=[q.id for q in picked]).order_by("usage_count")[:missing]
+        )
+    if not picked and unavailable is not None:
+        raise unavailable
+
+    with transaction.atomic():
+        BankQuestion.objects.filter(id__in=[q.id for q in picked]).update(usage_count=F("usage_count") + 1)
+    return picked, generated
@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from django.conf import settings
+
+from config.timing import ContextThreadPoolExecutor
+
+
+class AgentUnavailable(Exception):
+    """The provider is failing or too slow and no fallback result is available."""
+
+
+# -----------------------------
+# Latency tracking
+# -----------------------------
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds) for one agent call."""
+
+    def __init__(self, size=200):
+        self.samples = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p, min_samples=20):
+        with self.lock:
+            if len(self.samples) < min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+# -----------------------------
+# Circuit breaker
+# -----------------------------
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures (errors or budget
+    overruns) and rejects calls for `cooldown` seconds. After that a single
+    probe call is let through: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+# -----------------------------
+# Guarded calls
+# -----------------------------
+
+_pool = None
+_pool_lock = threading.Lock()
+_trackers = {}
+_breakers = {}
+
+
+def _executor():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ContextThreadPoolExecutor(max_workers=settings.AGENT_POOL_WORKERS, thread_name_prefix="agent-call")
+        return _pool
+
+
+def get_tracker(name) -> LatencyTracker:
+    with _pool_lock:
+        return _trackers.setdefault(name, LatencyTracker())
+
+
+def get_breaker(name) -> CircuitBreaker:
+    with _pool_lock:
+        return _breakers.setdefault(name, CircuitBreaker(settings.AGENT_BREAKER_FAILURES, settings.AGENT_BREAKER_COOLDOWN))
+
+
+def _hedge_delay(tracker, budget):
+    observed = tracker.percentile(settings.AGENT_HEDGE_PERCENTILE)
+    delay = budget / 2 if observed is None else observed
+    return min(max(delay, settings.AGENT_HEDGE_MIN_DELAY), budget)
+
+
+def guarded_call(name, fn, *args, budget=None, hedge=True, fallback=None, **kwargs):
+    """
+    Run `fn(*args, **kwargs)` within a latency budget.
+
+    Once the call has been running longer than the AGENT_HEDGE_PERCENTILE
+    latency seen so far for `name`, one duplicate request is sent and the
+    first successful result wins. Calls that fail or exceed the budget count
+    against the circuit breaker for `name`. When the breaker is open or the
+    call fails, `fallback()` is returned if given; otherwise AgentUnavailable
+    is raised. Only use `hedge` for calls without side effects.
+    """
+    budget = budget or settings.AGENT_LATENCY_BUDGET
+    tracker = get_tracker(name)
+    breaker = get_breaker(name)
+
+    def degrade(reason):
+        if fallback is not None:
+            result = fallback()
+            if result is not None:
+                return result
+        raise AgentUnavailable(f"{name} is unavailable ({reason}). Please try again shortly.")
+
+    if not breaker.allow():
+        return degrade("circuit open")
+
+    def timed():
+        started = time.monotonic()
+        result = fn(*args, **kwargs)
+        tracker.record(time.monotonic() - started)
+        return result
+
+    pool = _executor()
+    deadline = time.monotonic() + budget
+    pending = {pool.submit(timed)}
+    hedge_at = time.monotonic() + _hedge_delay(tracker, budget) if hedge else None
+    error = None
+
+    while pending:
+        now = time.monotonic()
+        if now >= deadline:
+            break
+        wake = min(deadline, hedge_at) if hedge_at else deadline
+        done, pending = wait(pending, timeout=max(wake - now, 0), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                breaker.record_success()
+                return future.result()
+            error = future.exception()
+        # Fire the hedge early when the first attempt has already failed
+        if hedge_at and (time.monotonic() >= hedge_at or not pending):
+            pending.add(pool.submit(timed))
+            hedge_at = None
+
+    # Abandoned requests finish in the background; the client timeout bounds them.
+    breaker.record_failure()
+    return degrade(f"{type(error).__name__}: {error}" if error and not pending else "latency budget exceeded")
@@ -0,0 +1,150 @@
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max
+
+from ai.utils.embeddings import HashingVectorizer, ResourceIndex, resource_text
+
+_index_cache = {"key": None, "index": None, "checked_at": 0.0}
+
+
+def get_vectorizer() -> HashingVectorizer:
+    return HashingVectorizer(dim=settings.RESOURCE_INDEX_DIM)
+
+
+def build_resource_index(batch_size: int = 2000) -> ResourceIndex:
+    """
+    Embed the Resource catalog, leaving out dead links. Rows are streamed in batches into a
+    preallocated float16 matrix, so memory stays at the size of the index.
+    """
+    from student.models import Resource
+
+    vectorizer = get_vectorizer()
+    queryset = Resource.objects.exclude(link_status="dead").order_by("id")
+    total = queryset.count()
+
+    ids = np.empty(total, dtype=np.int64)
+    subject_ids = np.empty(total, dtype=np.int64)
+    vectors = np.empty((total, vectorizer.dim), dtype=np.float16)
+
+    rows = queryset.values_list("id", "subject_id", "topic_name", "type", "description")
+    filled = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) == batch_size:
+            filled = _fill_batch(vectorizer, batch, ids, subject_ids, vectors, filled)
+            batch = []
+    if batch:
+        filled = _fill_batch(vectorizer, batch, ids, subject_ids, vectors, filled)
+
+    # Rows inserted between count() and iteration are left for the next build.
+    return ResourceIndex(ids[:filled], subject_ids[:filled], vectors[:filled])
+
+
+def _fill_batch(vectorizer, batch, ids, subject_ids, vectors, offset):
+    stop = min(offset + len(batch), len(ids))
+    batch = batch[:stop - offset]
+    ids[offset:stop] = [row[0] for row in batch]
+    subject_ids[offset:stop] = [row[1] for row in batch]
+    vectors[offset:stop] = vectorizer.transform([resource_text(*row[2:]) for row in batch])
+    return stop
+
+
+def _catalog_stamp():
+    """Changes whenever a live resource is added, edited or removed (including links found dead)."""
+    from student.models import Resource
+
+    stats = Resource.objects.exclude(link_status="dead").aggregate(
+        count=Count("id"), last_id=Max("id"), updated_at=Max("updated_at")
+    )
+    return stats["count"], stats["last_id"], stats["updated_at"]
+
+
+def get_resource_index() -> ResourceIndex:
+    """
+    Load the offline index built by `manage.py build_resource_index`, reloading
+    when the file changes. Without a prebuilt file the catalog is embedded
+    in-process and re-embedded when its live resources change, checked at
+    most every RESOURCE_INDEX_REFRESH seconds.
+    """
+    path = settings.RESOURCE_INDEX_PATH
+    if os.path.exists(path):
+        key = (path, os.path.getmtime(path))
+    else:
+        cached = _index_cache["key"]
+        fresh = time.monotonic() - _index_cache["checked_at"] < settings.RESOURCE_INDEX_REFRESH
+        if cached is not None and cached[:2] == (path, None) and fresh:
+            return _index_cache["index"]
+        key = (path, None, _catalog_stamp())
+        _index_cache["checked_at"] = time.monotonic()
+
+    if _index_cache["key"] != key:
+        index = ResourceIndex.load(path) if key[1] is not None else build_resource_index()
+        _index_cache.update(key=key, index=index)
+    return _index_cache["index"]
+
+
+def week_query_text(week) -> str:
+    return " ".join([*week.focus_topics, *week.practice_tasks])
+
+
+def recommend_plan_resources(plan, subject_ids) -> list:
+    """
+    Fill LearningPlanResource for every week of `plan` from catalog matches.
+    Returns the weeks whose best match fell below RESOURCE_MATCH_THRESHOLD;
+    only those need LLM-generated suggestions.
+    """
+    from learningplan.models import LearningPlanResource
+    from student.models import Resource
+
+    weeks = list(plan.weeks.order_by("week"))
+    if not weeks:
+        return []
+
+    index = get_resource_index()
+    queries = get_vectorizer().transform([week_query_text(w) for w in weeks])
+    match_ids, match_scores = index.search(
+        queries,
+        k=settings.RESOURCE_MATCHES_PER_WEEK,
+        subject_ids=subject_ids or None,
+    )
+
+    threshold = settings.RESOURCE_MATCH_THRESHOLD
+    accepted = match_scores >= threshold
+    # The index may predate the latest link check; drop links found dead since
+    resources = Resource.objects.exclude(link_status="dead").only("id", "topic_name", "url", "final_url").in_bulk(
+        {int(i) for i in match_ids[accepted]}
+    )
+
+    links = []
+    unmatched = []
+    for week, ids, keep in zip(weeks, match_ids, accepted):
+        week_links = [
+            LearningPlanResource(
+                week=week,
+                resource=resources[int(resource_id)],
+                fallback_name=resources[int(resource_id)].topic_name,
+                fallback_url=resources[int(resource_id)].live_url,
+            )
+            for resource_id in ids[keep]
+            if int(resource_id) in resources
+        ]
+        if week_links:
+            links.extend(week_links)
+        else:
+            unmatched.append(week)
+
+    LearningPlanResource.objects.filter(week__plan=plan).delete()
+    LearningPlanResource.objects.bulk_create(links)
+    return unmatched
+
+
+def search_catalog(query: str, k: int = 5, subject_ids=None) -> list:
+    """Free-text catalog search: [(resource_id, score), ...], best first."""
+    ids, scores = get_resource_index().search(
+        get_vectorizer().transform([query]), k=k, subject_ids=subject_ids or None
+    )
+    return [(int(i), float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0 and s > 0]
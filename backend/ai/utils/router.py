@@ -0,0 +1,93 @@
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+
+# Task names used by the agents; each has a routing rule below.
+CHAT = "chat"
+GENERATE_QUIZ = "generate_quiz"
+QUIZ_OUTLINE = "quiz_outline"
+QUIZ_FEEDBACK = "quiz_feedback"
+LEARNING_PLAN = "learning_plan"
+RESOURCE_SUGGESTIONS = "resource_suggestions"
+
+# Defaults, overridable per task with the AGENT_MODEL_ROUTES setting. A rule
+# with a `light_model` sends small, simple prompts (or calls with a tight
+# latency budget) to it; everything else goes to `model`. `budget` (seconds)
+# and `hedge` feed ai.utils.resilience; long structured generations are not
+# hedged because a duplicate doubles their cost. QUIZ_FEEDBACK only
+# writes feedback text (scores are computed in ai.utils.grading), so it
+# can run on the light model.
+DEFAULT_ROUTES = {
+    CHAT: {"model": "gpt-4o", "light_model": "gpt-4o-mini", "max_light_tokens": 3000, "max_light_complexity": 0.35},
+    GENERATE_QUIZ: {"model": "gpt-4o"},
+    QUIZ_OUTLINE: {"model": "gpt-4o-mini", "budget": 10},
+    QUIZ_FEEDBACK: {"model": "gpt-4o-mini", "budget": 60, "hedge": False},
+    LEARNING_PLAN: {"model": "gpt-4o", "budget": 90, "hedge": False},
+    RESOURCE_SUGGESTIONS: {"model": "gpt-4o", "light_model": "gpt-4o-mini", "max_light_tokens": 2000,
+                           "budget": 60, "hedge": False},
+}
+
+_REASONING_WORDS = re.compile(
+    r"\b(why|how|explain|prove|derive|compare|analy[sz]e|plan|schedule|change|update|replace|move|"
+    r"week|harder|easier|instead|struggl\w*|confus\w*)\b",
+    re.IGNORECASE,
+)
+_MATH = re.compile(r"[=^√∑∫]|\d+\s*[-+*/]\s*\d+")
+
+
+@dataclass(frozen=True)
+class Route:
+    task: str
+    model: str
+    reason: str
+    budget: float
+    hedge: bool
+
+
+def estimate_tokens(messages) -> int:
+    """Rough prompt size: ~4 characters per token."""
+    return sum(len(str(m.get("content") or "")) for m in messages) // 4
+
+
+def complexity(text: str) -> float:
+    """
+    Cheap 0-1 score of how much reasoning a message asks for: length,
+    reasoning/plan-change vocabulary, maths and multiple questions.
+    """
+    words = len(text.split())
+    score = min(words / 120, 0.4)
+    score += min(len(_REASONING_WORDS.findall(text)) * 0.2, 0.5)
+    score += 0.2 if _MATH.search(text) else 0.0
+    score += 0.1 if text.count("?") > 1 else 0.0
+    return min(score, 1.0)
+
+
+def get_rule(task) -> dict:
+    return {
+        "model": settings.AGENT_DEFAULT_MODEL,
+        **DEFAULT_ROUTES.get(task, {}),
+        **settings.AGENT_MODEL_ROUTES.get(task, {}),
+    }
+
+
+def choose_route(task, messages, budget=None) -> Route:
+    """Pick the model for one call from the task rule, prompt size, budget and message complexity."""
+    rule = get_rule(task)
+    budget = budget or rule.get("budget", settings.AGENT_LATENCY_BUDGET)
+    light = rule.get("light_model")
+
+    def route(model, reason):
+        return Route(task, model, reason, budget, rule.get("hedge", True))
+
+    if not light:
+        return route(rule["model"], "fixed")
+    if budget <= rule.get("fast_budget", settings.AGENT_FAST_BUDGET):
+        return route(light, "tight budget")
+    if estimate_tokens(messages) > rule.get("max_light_tokens", 2000):
+        return route(rule["model"], "large prompt")
+
+    last_user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    if complexity(str(last_user)) > rule.get("max_light_complexity", 0.5):
+        return route(rule["model"], "complex")
+    return route(light, "simple")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class WeekPlan(BaseModel):
     week: int
@@ -14,6 +14,7 @@ class LearningPlanSchema(BaseModel):
     weekly_plan: List[WeekPlan]
     
 class ResourceItem(BaseModel):
+    week: int
     topic_name: str
     type: str  # e.g., "video", "article", "leetcode", etc.
     url: str
@@ -29,8 +30,15 @@ class UpdateWeek(BaseModel):
     ai_message: str
 
 class UpdateLearningPlanRequest(BaseModel):
-    student_email: str
     updates: List[UpdateWeek]
+
+class QuizHistoryRequest(BaseModel):
+    subject: Optional[str] = Field(None, description="Only quizzes of this subject")
+    limit: int = Field(10, description="Most recent quizzes to return (max 50)")
+
+class SearchResourcesRequest(BaseModel):
+    query: str = Field(..., description="Topic or skill to find learning resources for")
+    limit: int = Field(5, description="Resources to return (max 10)")
     
 class Option(BaseModel):
     key: str
@@ -43,14 +51,13 @@ class QuizQuestion(BaseModel):
     
 class QuizGenerationResponse(BaseModel):
     questions: List[QuizQuestion]
-    
-class EvaluatedQuestion(BaseModel):
-    question_text: str
-    correct_option: str
-    student_answer: str
-    is_correct: bool
 
-class EvaluationResult(BaseModel):
-    score: float
+class QuizOutline(BaseModel):
+    subtopics: List[str]
+    
+class QuizFeedback(BaseModel):
+    quiz_id: int
     feedback: str
-    evaluated_questions: List[EvaluatedQuestion]
\ No newline at end of file
+
+class BatchEvaluationResult(BaseModel):
+    results: List[QuizFeedback]
@@ -1,17 +1,190 @@
-from ai.utils.schemas import UpdateLearningPlanRequest
+from dataclasses import dataclass, field
 
-def apply_learning_plan_updates(data: UpdateLearningPlanRequest):
-    from learningplan.models import LearningPlan, LearningPlanWeek
-    from student.models import Student
+from django.conf import settings
+from django.db import connections, transaction
+from pydantic import ValidationError
 
-    student = Student.objects.get(email=data.student_email)
-    plan = LearningPlan.objects.filter(student=student).order_by("-created_at").first()
+from ai.utils.schemas import QuizHistoryRequest, SearchResourcesRequest, UpdateLearningPlanRequest
+from config.timing import ContextThreadPoolExecutor
 
+
+@dataclass
+class ToolContext:
+    """What the chat tools act on: the authenticated student and their preloaded latest plan."""
+    student: object
+    plan: object = None
+    weeks: dict = field(default_factory=dict)  # week number -> LearningPlanWeek
+
+    @classmethod
+    def for_student(cls, student):
+        from learningplan.models import LearningPlan
+
+        plan = (
+            LearningPlan.objects.filter(student=student)
+            .order_by("-created_at")
+            .prefetch_related("weeks")
+            .first()
+        )
+        weeks = {w.week: w for w in plan.weeks.all()} if plan else {}
+        return cls(student=student, plan=plan, weeks=weeks)
+
+    def plan_data(self) -> dict:
+        return {
+            "student": self.student.email,
+            "plan_duration_weeks": self.plan.plan_duration_weeks if self.plan else 0,
+            "weekly_plan": [
+                {
+                    "week": w.week,
+                    "focus_topics": w.focus_topics,
+                    "practice_tasks": w.practice_tasks,
+                    "ai_message": w.ai_message
+                }
+                for w in sorted(self.weeks.values(), key=lambda w: w.week)
+            ]
+        }
+
+
+# -----------------------------
+# Tools
+# -----------------------------
+
+def apply_learning_plan_updates(context: ToolContext, data: UpdateLearningPlanRequest):
+    from learningplan.models import LearningPlanWeek
+
+    if context.plan is None:
+        return {"error": "The student has no learning plan yet."}
+
+    unknown = [u.week for u in data.updates if u.week not in context.weeks]
+    if unknown:
+        return {"error": f"Weeks {unknown} are not in the plan (weeks 1-{len(context.weeks)})."}
+
+    changed = []
     for update in data.updates:
-        week_obj = LearningPlanWeek.objects.get(plan=plan, week=update.week)
+        week_obj = context.weeks[update.week]
         week_obj.focus_topics = update.focus_topics
         week_obj.practice_tasks = update.practice_tasks
         week_obj.ai_message = update.ai_message
-        week_obj.save()
+        changed.append(week_obj)
+
+    from ai.signals import notify_context_change
+    from learningplan.history import record_version
+    from learningplan.models import PlanVersion
+
+    with transaction.atomic():
+        # Plans from before version history get their pre-edit state recorded first
+        if not PlanVersion.objects.filter(student=context.student).exists():
+            record_version(context.student, context.plan, "baseline")
+        LearningPlanWeek.objects.bulk_update(changed, ["focus_topics", "practice_tasks", "ai_message"])
+        record_version(context.student, context.plan, "chat")
+        # bulk_update sends no signals; tell open chat sessions directly
+        notify_context_change(context.student.id, "plan")
+
+    return {"message": "Learning plan updated successfully.", "updated_weeks": [w.week for w in changed]}
+
+
+def get_quiz_history(context: ToolContext, data: QuizHistoryRequest):
+    from student.models import Quiz
+
+    quizzes = Quiz.objects.filter(student=context.student)
+    if data.subject:
+        quizzes = quizzes.filter(subject__name__iexact=data.subject)
+    return {"quizzes": list(
+        quizzes.order_by("-created_at").values(
+            "id", "subject__name", "topic", "status", "score", "total_marks", "ai_feedback", "created_at"
+        )[:max(1, min(data.limit, 50))]
+    )}
+
+
+def search_resources(context: ToolContext, data: SearchResourcesRequest):
+    from ai.utils.retrieval import search_catalog
+    from student.models import Resource, StudentSubject
+
+    subject_ids = list(StudentSubject.objects.filter(student=context.student).values_list("subject_id", flat=True))
+    matches = search_catalog(data.query, k=max(1, min(data.limit, 10)), subject_ids=subject_ids)
+    resources = Resource.objects.exclude(link_status="dead").in_bulk([resource_id for resource_id, _ in matches])
+    return {"resources": [
+        {
+            "id": resource_id,
+            "topic_name": resources[resource_id].topic_name,
+            "type": resources[resource_id].type,
+            "url": resources[resource_id].live_url,
+            "description": resources[resource_id].description,
+            "score": round(score, 3),
+        }
+        for resource_id, score in matches
+        if resource_id in resources
+    ]}
+
+
+# name -> (argument schema, function, description, read_only)
+TOOLS = {
+    "update_learning_plan": (
+        UpdateLearningPlanRequest, apply_learning_plan_updates,
+        "Update weeks of the student's current learning plan based on their feedback", False,
+    ),
+    "get_quiz_history": (
+        QuizHistoryRequest, get_quiz_history,
+        "Fetch the student's recent quizzes with scores and feedback", True,
+    ),
+    "search_resources": (
+        SearchResourcesRequest, search_resources,
+        "Search the resource catalog for learning material on a topic", True,
+    ),
+}
+
+TOOL_DEFINITIONS = [
+    {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": schema.model_json_schema()
+        }
+    }
+    for name, (schema, _, description, _) in TOOLS.items()
+]
+
+
+# -----------------------------
+# Execution
+# -----------------------------
+
+def _call_tool(context, name, arguments):
+    if name not in TOOLS:
+        return {"error": f"Unknown tool {name!r}."}
+    schema, fn, _, _ = TOOLS[name]
+    try:
+        return fn(context, schema.model_validate_json(arguments or "{}"))
+    except ValidationError as e:
+        return {"error": f"Invalid arguments: {e.errors(include_url=False)}"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _call_read_only(context, name, arguments):
+    try:
+        return _call_tool(context, name, arguments)
+    finally:
+        # Worker threads open their own connections; don't leave them behind.
+        connections.close_all()
+
 
-    return {"message": "Learning plan updated successfully."}
\ No newline at end of file
+def run_tool_calls(context: ToolContext, tool_calls) -> list:
+    """
+    Run every tool call from one assistant message and return their results
+    in the same order. Read-only tools run concurrently on worker threads;
+    tools that write run one after another on the calling thread.
+    """
+    reads = [call for call in tool_calls if TOOLS.get(call.function.name, (None, None, None, True))[3]]
+    results = {}
+    with ContextThreadPoolExecutor(max_workers=max(1, min(len(reads), settings.CHAT_TOOL_WORKERS))) as pool:
+        futures = {
+            call.id: pool.submit(_call_read_only, context, call.function.name, call.function.arguments)
+            for call in reads
+        }
+        for call in tool_calls:
+            if call.id not in futures:
+                results[call.id] = _call_tool(context, call.function.name, call.function.arguments)
+        for call_id, future in futures.items():
+            results[call_id] = future.result()
+    return [results[call.id] for call in tool_calls]
@@ -1,16 +1,20 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from student.models import StudentInfo, StudentSubject, LearningGoal, StudentResourceLog
-from learningplan.models import LearningPlan
 from .models import AgentInteractionLog
-from student.serializers import FullStudentDataSerializer
-from ai.agents.ui_agent import interact_with_student
-from ai.agents.quiz import generate_quiz, evaluate_quiz
-from student.models import Quiz, Question, Subject
+from student.projections import build_student_profile
+from ai.agents.ui_agent import interact_with_student, degraded_reply
+from ai.utils.resilience import AgentUnavailable
+from ai.utils.tools import ToolContext
+from ai.utils.question_bank import assemble_quiz
+from student.models import BankQuestion, Quiz, Question, Subject
+from ai.utils.grading import grade_quizzes
+from ai.utils.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
 
 class ChatAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -22,8 +26,10 @@ class ChatAPIView(APIView):
             type=openapi.TYPE_OBJECT,
             properties={"message": openapi.Schema(type=openapi.TYPE_STRING)}
         ),
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         tags=["Learning Assistant"]
     )
+    @idempotent
     def post(self, request):
         user = request.user
         try:
@@ -31,42 +37,22 @@ class ChatAPIView(APIView):
             if not message:
                 return Response({"error": "Message is required."}, status=400)
 
-            info = StudentInfo.objects.get(student=user)
-            subjects = StudentSubject.objects.filter(student=user)
-            goals = LearningGoal.objects.filter(student=user)
-            resource_logs = StudentResourceLog.objects.filter(student=user)
-
-            student_data = FullStudentDataSerializer(user, context={
-                "request": request,
-                "student": user,
-                "info": info,
-                "subjects": subjects,
-                "goals": goals,
-                "resource_logs": resource_logs,
-            }).data
-
-            plan = LearningPlan.objects.filter(student=user).order_by("-created_at").first()
-            plan_data = {
-                "student": user.email,
-                "plan_duration_weeks": plan.plan_duration_weeks,
-                "weekly_plan": [
-                    {
-                        "week": w.week,
-                        "focus_topics": w.focus_topics,
-                        "practice_tasks": w.practice_tasks,
-                        "ai_message": w.ai_message
-                    }
-                    for w in plan.weeks.all()
-                ] if plan else []
-            }
+            student_data = build_student_profile(user, require_info=True)
+
+            tool_context = ToolContext.for_student(user)
+            plan_data = tool_context.plan_data()
 
-            past_chats = AgentInteractionLog.objects.filter(student=user).order_by("-created_at")[:5]
+            past_chats = AgentInteractionLog.objects.filter(student=user).order_by("-created_at")[:settings.CHAT_HISTORY_TURNS]
             chat_context = [
-                {"role": "user", "content": c.user_message} if i % 2 == 0 else {"role": "assistant", "content": c.agent_response}
-                for i, c in enumerate(reversed(past_chats))
+                turn
+                for c in reversed(past_chats)
+                for turn in (
+                    {"role": "user", "content": c.user_message},
+                    {"role": "assistant", "content": c.agent_response},
+                )
             ]
 
-            response = interact_with_student(student_data, plan_data, message, chat_context)
+            response = interact_with_student(student_data, tool_context, message, chat_context)
 
             AgentInteractionLog.objects.create(
                 student=user,
@@ -76,6 +62,8 @@ class ChatAPIView(APIView):
 
             return Response({"response": response})
 
+        except AgentUnavailable as e:
+            return Response({"error": str(e), "response": degraded_reply(plan_data), "degraded": True}, status=503)
         except Exception as e:
             return Response({"error": str(e)}, status=400)
         
@@ -90,38 +78,63 @@ class GenerateAndSaveQuizView(APIView):
             properties={
                 "subject": openapi.Schema(type=openapi.TYPE_STRING),
                 "topic": openapi.Schema(type=openapi.TYPE_STRING),
-                "level": openapi.Schema(type=openapi.TYPE_STRING, enum=["beginner", "intermediate", "advanced"])
+                "level": openapi.Schema(type=openapi.TYPE_STRING, enum=["beginner", "intermediate", "advanced"]),
+                "num_questions": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="Questions to generate (default 10, max QUIZ_MAX_QUESTIONS)"
+                )
             }
         ),
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         tags=["Quiz"]
     )
+    @idempotent
     def post(self, request):
         try:
             subject_name = request.data["subject"]
             topic = request.data["topic"]
             level = request.data["level"]
+            num_questions = int(request.data.get("num_questions") or settings.QUIZ_DEFAULT_QUESTIONS)
             user = request.user
+            if not 1 <= num_questions <= settings.QUIZ_MAX_QUESTIONS:
+                return Response(
+                    {"error": f"num_questions must be between 1 and {settings.QUIZ_MAX_QUESTIONS}."}, status=400
+                )
 
-            subject, _ = Subject.objects.get_or_create(name=subject_name)
-            result = generate_quiz(subject_name, topic, level)
-
-            quiz = Quiz.objects.create(
-                student=user,
-                subject=subject,
-                total_marks=10 * 1,  # Assuming 1 mark per question
-                status="pending"
-            )
+            if level not in dict(BankQuestion.LEVEL_CHOICES):
+                return Response({"error": "level must be beginner, intermediate or advanced."}, status=400)
 
-            for q in result.questions:
-                Question.objects.create(
-                    quiz=quiz,
-                    question_text=q.question_text,
-                    options={opt.key: opt.value for opt in q.options},
-                    correct_option=q.correct_option
+            subject, _ = Subject.objects.get_or_create(name=subject_name)
+            bank_questions, generated = assemble_quiz(user, subject, topic, level, num_questions)
+
+            with transaction.atomic():
+                quiz = Quiz.objects.create(
+                    student=user,
+                    subject=subject,
+                    topic=topic,
+                    total_marks=len(bank_questions),  # 1 mark per question
+                    status="pending"
                 )
+                Question.objects.bulk_create([
+                    Question(
+                        quiz=quiz,
+                        bank_question=q,
+                        question_text=q.question_text,
+                        options=q.options,
+                        correct_option=q.correct_option
+                    )
+                    for q in bank_questions
+                ])
 
-            return Response({"message": "Quiz created successfully.", "quiz_id": quiz.id})
+            return Response({
+                "message": "Quiz created successfully.",
+                "quiz_id": quiz.id,
+                "num_questions": len(bank_questions),
+                "from_bank": len(bank_questions) - generated
+            })
 
+        except AgentUnavailable as e:
+            return Response({"error": str(e)}, status=503)
         except Exception as e:
             return Response({"error": str(e)}, status=400)
 
@@ -142,46 +155,76 @@ class EvaluateQuizView(APIView):
                 )
             }
         ),
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         tags=["Quiz"]
     )
+    @idempotent
     def post(self, request):
         try:
             quiz_id = request.data["quiz_id"]
             answers = request.data["answers"]  # {question_id: student_answer}
 
             quiz = Quiz.objects.get(id=quiz_id, student=request.user)
-            questions = quiz.questions.all()
-
-            quiz_data = []
-            correct_count = 0
-            for q in questions:
-                ans = answers.get(str(q.id))
-                is_correct = ans == q.correct_option
-                q.student_answer = ans
-                q.is_correct = is_correct
-                q.save()
-
-                if is_correct:
-                    correct_count += 1
-
-                quiz_data.append({
-                    "question_text": q.question_text,
-                    "correct_option": q.correct_option,
-                    "student_answer": ans or "",
-                    "is_correct": is_correct
-                })
-
-            evaluation = evaluate_quiz(quiz_data)
-
-            quiz.score = evaluation.score
-            quiz.ai_feedback = evaluation.feedback
-            quiz.status = "completed"
-            quiz.save()
+            # Same path as the batch endpoint: claim, score, then feedback
+            graded = grade_quizzes(Quiz.objects.filter(id=quiz.id), {quiz.id: answers})
+            if not graded:
+                quiz.refresh_from_db(fields=["score", "ai_feedback"])
+                return Response({
+                    "error": "Quiz has already been evaluated.",
+                    "score": quiz.score,
+                    "feedback": quiz.ai_feedback
+                }, status=409)
 
             return Response({
                 "message": "Quiz evaluated successfully.",
-                "score": quiz.score,
-                "feedback": quiz.ai_feedback
+                "score": graded[0]["score"],
+                "feedback": graded[0]["feedback"]
+            })
+
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
+
+
+class BatchEvaluateQuizView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Evaluate many quizzes at once",
+        operation_description="Grades every listed pending quiz in one pass and returns per-quiz results. "
+                              "Staff may grade any student's quizzes; students only their own.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["quiz_ids"],
+            properties={
+                "quiz_ids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER)
+                ),
+                "answers": openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    description="Optional {quiz_id: {question_id: student_answer}}",
+                    additional_properties=openapi.Schema(type=openapi.TYPE_OBJECT)
+                )
+            }
+        ),
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        tags=["Quiz"]
+    )
+    @idempotent
+    def post(self, request):
+        try:
+            quiz_ids = request.data["quiz_ids"]
+            answers = request.data.get("answers") or {}
+
+            quizzes = Quiz.objects.filter(id__in=quiz_ids)
+            if not request.user.is_staff:
+                quizzes = quizzes.filter(student=request.user)
+
+            results = grade_quizzes(quizzes, answers)
+
+            return Response({
+                "message": f"{len(results)} quizzes evaluated successfully.",
+                "results": results
             })
 
         except Exception as e:
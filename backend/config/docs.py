@@ -0,0 +1,150 @@
+"""
+API docs served without per-request work: the OpenAPI schema is generated
+once (or, when enabled, loaded from the `generate_openapi` artifact) and
+kept in memory with an ETag, and the Swagger UI / ReDoc assets bundled with
+drf_yasg are served locally under a versioned URL with long-lived caching,
+so the docs work offline.
+"""
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+
+import drf_yasg
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.views.decorators.http import condition, require_safe
+from django.views.static import serve
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="E-Learning API",
+    default_version='v1',
+    description="Personalized e-learning system APIs",
+    contact=openapi.Contact(email="gychitresh1290@gmail.com"),
+)
+
+ASSETS_DIR = Path(drf_yasg.__file__).resolve().parent / "static" / "drf-yasg"
+ASSETS_VERSION = drf_yasg.__version__
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+
+# -----------------------------
+# Schema
+# -----------------------------
+
+def build_schema() -> bytes:
+    """Introspect every view once and encode the public schema as JSON."""
+    generator = OpenAPISchemaGenerator(API_INFO)
+    return OpenAPICodecJson(validators=[]).encode(generator.get_schema(request=None, public=True))
+
+
+_schema = None
+_schema_lock = threading.Lock()
+
+
+def _load_artifact():
+    path = settings.OPENAPI_SCHEMA_PATH
+    if not settings.OPENAPI_USE_ARTIFACT:
+        return None
+    if not path or not os.path.exists(path):
+        logger.warning("OPENAPI_USE_ARTIFACT is set but %s does not exist; introspecting views instead", path)
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def get_schema():
+    """
+    (body, etag) of the schema: the generate_openapi artifact when
+    OPENAPI_USE_ARTIFACT is set, else built from the views on first use.
+    """
+    global _schema
+    if _schema is None:
+        with _schema_lock:
+            if _schema is None:
+                body = _load_artifact()
+                if body is None:
+                    body = build_schema()
+                _schema = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    return _schema
+
+
+@require_safe
+@condition(etag_func=lambda request: get_schema()[1])
+def openapi_json(request):
+    body, _ = get_schema()
+    response = HttpResponse(body, content_type="application/json")
+    # Clients keep the schema but revalidate; an unchanged schema costs a 304
+    response["Cache-Control"] = "public, no-cache"
+    return response
+
+
+# -----------------------------
+# Docs UI and assets
+# -----------------------------
+
+def asset_url(path):
+    return reverse("docs-asset", kwargs={"version": ASSETS_VERSION, "path": path})
+
+
+@require_safe
+def docs_asset(request, version, path):
+    if version != ASSETS_VERSION:
+        raise Http404("Unknown docs assets version")
+    response = serve(request, path, document_root=ASSETS_DIR)
+    # The URL changes with the drf_yasg version, so the content at a URL never does
+    response["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+    return response
+
+
+def swagger_ui_view(request):
+    return HttpResponse(f"""
+    <!DOCTYPE html>
+    <html>
+      <head>
+        <title>Swagger UI</title>
+        <link href="{asset_url('swagger-ui-dist/swagger-ui.css')}" rel="stylesheet">
+      </head>
+      <body>
+        <div id="swagger-ui"></div>
+        <script src="{asset_url('swagger-ui-dist/swagger-ui-bundle.js')}"></script>
+        <script>
+          SwaggerUIBundle({{
+            url: '{reverse("schema-json")}',
+            dom_id: '#swagger-ui',
+          }});
+        </script>
+      </body>
+    </html>
+    """, content_type="text/html")
+
+
+def redoc_ui_view(request):
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+      <head>
+        <title>ReDoc</title>
+        <meta charset="utf-8"/>
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <style>body {{ margin: 0; padding: 0; }}</style>
+        <script src="{asset_url('redoc/redoc.min.js')}"></script>
+      </head>
+      <body>
+        <div id="redoc-container"></div>
+        <script>
+          document.addEventListener("DOMContentLoaded", function () {{
+            Redoc.init("{reverse("schema-json")}", {{}}, document.getElementById("redoc-container"));
+          }});
+        </script>
+      </body>
+    </html>
+    """
+    return HttpResponse(html, content_type="text/html")
@@ -0,0 +1,137 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from config import timing
+from config.renderers import dumps
+
+logger = logging.getLogger("config.timing")
+
+CATEGORIES = ("db", "llm", "serialization")
+
+
+def _install_db_wrapper(connection, **kwargs):
+    if timing.db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timing.db_execute_wrapper)
+
+
+connection_created.connect(_install_db_wrapper, dispatch_uid="config.timing.db")
+
+
+def _profiling_enabled():
+    return settings.REQUEST_PROFILE_SAMPLE_RATE > 0
+
+
+class ServerTimingMiddleware:
+    """
+    Splits each request's wall time into db, llm, serialization and other,
+    and reports it in a Server-Timing header and one JSON log line on the
+    `config.timing` logger. A StreamingHttpResponse is timed up to its
+    headers only. Work on ContextThreadPoolExecutor workers counts towards
+    the request that submitted it.
+
+    With REQUEST_PROFILE_SAMPLE_RATE > 0, that fraction of requests also runs
+    under cProfile and dumps slower than REQUEST_PROFILE_THRESHOLD_MS are
+    kept in REQUEST_PROFILE_DIR (newest REQUEST_PROFILE_KEEP files). cProfile
+    only sees the current thread, so the middleware then runs synchronously
+    on the view's thread; otherwise it stays async-capable under ASGI.
+    """
+    sync_capable = True
+    async_capable = not _profiling_enabled()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            _install_db_wrapper(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings, token = timing.start()
+        profiler = self._maybe_profiler()
+        started = time.perf_counter()
+        try:
+            if profiler:
+                response = profiler.runcall(self.get_response, request)
+            else:
+                response = self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self._finish(request, response, timings, time.perf_counter() - started, profiler)
+
+    async def __acall__(self, request):
+        timings, token = timing.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self._finish(request, response, timings, time.perf_counter() - started)
+
+    def _maybe_profiler(self):
+        if _profiling_enabled() and random.random() < settings.REQUEST_PROFILE_SAMPLE_RATE:
+            return cProfile.Profile()
+        return None
+
+    def _finish(self, request, response, timings, total, profiler=None):
+        spent = {category: timings.durations.get(category, 0.0) for category in CATEGORIES}
+        spent["other"] = max(total - sum(spent.values()), 0.0)
+
+        labels = {"db": "queries", "llm": "calls"}
+        metrics = [
+            f"{category};dur={seconds * 1000:.1f}"
+            + (f';desc="{timings.counts.get(category, 0)} {labels[category]}"' if category in labels else "")
+            for category, seconds in spent.items()
+        ]
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        response["Server-Timing"] = ", ".join(metrics)
+
+        profile_path = None
+        if profiler and total * 1000 >= settings.REQUEST_PROFILE_THRESHOLD_MS:
+            profile_path = self._dump(profiler, request, total)
+
+        logger.info(dumps({
+            "event": "request_timing",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            **{f"{category}_ms": round(seconds * 1000, 1) for category, seconds in spent.items()},
+            "db_queries": timings.counts.get("db", 0),
+            "llm_calls": timings.counts.get("llm", 0),
+            "profile": profile_path,
+        }).decode())
+        return response
+
+    def _dump(self, profiler, request, total):
+        directory = settings.REQUEST_PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path).strip("_") or "root"
+        path = os.path.join(
+            directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{request.method}-{slug[:60]}-{total * 1000:.0f}ms-{uuid.uuid4().hex[:6]}.prof"
+        )
+        profiler.dump_stats(path)
+
+        # Rotate: keep only the newest REQUEST_PROFILE_KEEP dumps
+        dumps_on_disk = sorted(
+            (os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".prof")),
+            key=os.path.getmtime,
+        )
+        for stale in dumps_on_disk[:-settings.REQUEST_PROFILE_KEEP]:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+        return path
@@ -0,0 +1,64 @@
+import math
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from config.timing import track
+
+# OPT_UTC_Z matches DRF's "+00:00" -> "Z" rewrite; OPT_NON_STR_KEYS matches
+# json.dumps coercing int/bool/None dict keys to strings.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_drf_encoder = JSONEncoder()
+
+
+def orjson_default(obj):
+    # Decimal, timedelta, lazy strings, querysets, etc. are encoded exactly as
+    # DRF's JSONEncoder would.
+    return _drf_encoder.default(obj)
+
+
+def dumps(data) -> bytes:
+    """Compact UTF-8 JSON with DRF's encoding rules, via orjson."""
+    ret = orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+    # Same strict-javascript-subset escaping as DRF's JSONRenderer.
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return ret
+
+
+def _has_non_finite(data) -> bool:
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(value) for value in data)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by orjson. Output is the same as DRF's compact
+    renderer; indented output (browsable API, `; indent=N`) and values orjson
+    cannot encode (e.g. integers wider than 64 bits) fall back to DRF. orjson
+    writes NaN and Infinity as null, so under STRICT_JSON a body containing
+    null is checked for them and handed to DRF, which raises ValueError.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        with track("serialization"):
+            if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+                return super().render(data, accepted_media_type, renderer_context)
+
+            try:
+                ret = dumps(data)
+            except orjson.JSONEncodeError:
+                return super().render(data, accepted_media_type, renderer_context)
+            if self.strict and b"null" in ret and _has_non_finite(data):
+                return super().render(data, accepted_media_type, renderer_context)
+            return ret
@@ -1,3 +1,5 @@
+import os
+import json
 from pathlib import Path
 from decouple import config, Csv
 from datetime import timedelta
@@ -12,6 +14,7 @@ ALLOWED_HOSTS = config("DJANGO_ALLOWED_HOSTS", default="*", cast=Csv())
 
 # Installed apps
 INSTALLED_APPS = [
+    "daphne",  # ASGI runserver (HTTP + WebSocket)
     "corsheaders",
     "django.contrib.admin",
     "django.contrib.auth",
@@ -32,6 +35,9 @@ INSTALLED_APPS = [
     "allauth.socialaccount",
     "allauth.socialaccount.providers.google",
 
+    # WebSocket chat
+    "channels",
+
     # Custom apps
     "student",
     "ai",
@@ -46,10 +52,12 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
-CORS_ALLOW_HEADERS = list(default_headers)
+CORS_ALLOW_HEADERS = [*default_headers, "idempotency-key"]
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
 
 # Middleware
 MIDDLEWARE = [
+    "config.middleware.ServerTimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -99,10 +107,32 @@ AUTH_USER_MODEL = "student.Student"
 # REST framework + JWT auth
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "student.authentication.CachedJWTAuthentication",
+    ],
+    # orjson-backed JSON; same output as DRF's renderer/parser
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
+# Cache: in-process by default. Point it at a shared backend (e.g. Redis) in
+# production so evictions reach every worker.
+CACHES = {
+    "default": {
+        "BACKEND": config("DJANGO_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("DJANGO_CACHE_LOCATION", default=""),
+    }
+}
+
+# Seconds an authenticated Student is served from cache (see student.authentication)
+AUTH_USER_CACHE_TTL = config("AUTH_USER_CACHE_TTL", default=60, cast=int)
+
 # JWT token config (60m access, 1d refresh)
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -160,6 +190,23 @@ SOCIALACCOUNT_PROVIDERS = {
     }
 }
 
+# Password hashing: the first entry is used for new hashes; older hashes are
+# upgraded on the next successful login when the algorithm or cost changes.
+PASSWORD_HASHER = config("PASSWORD_HASHER", default="pbkdf2")  # "pbkdf2" or "scrypt"
+PASSWORD_PBKDF2_ITERATIONS = config("PASSWORD_PBKDF2_ITERATIONS", default=1_000_000, cast=int)
+PASSWORD_SCRYPT_WORK_FACTOR = config("PASSWORD_SCRYPT_WORK_FACTOR", default=2 ** 14, cast=int)
+_PASSWORD_HASHERS = {
+    "pbkdf2": "student.hashers.ConfigurablePBKDF2PasswordHasher",
+    "scrypt": "student.hashers.ConfigurableScryptPasswordHasher",
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
+# Bounded pool used by the async login/register views (see student.passwords)
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=os.cpu_count() or 1, cast=int)
+PASSWORD_HASH_MAX_PENDING = config("PASSWORD_HASH_MAX_PENDING", default=(os.cpu_count() or 1) * 32, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -178,6 +225,143 @@ USE_TZ = True
 STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Retrieval-first resource recommendation (see `manage.py build_resource_index`)
+RESOURCE_INDEX_PATH = config("RESOURCE_INDEX_PATH", default=str(BASE_DIR / "var" / "resource_index.npz"))
+RESOURCE_INDEX_DIM = config("RESOURCE_INDEX_DIM", default=1024, cast=int)
+# Without a prebuilt index file, how often (seconds) to check the catalog for changes
+RESOURCE_INDEX_REFRESH = config("RESOURCE_INDEX_REFRESH", default=60, cast=int)
+RESOURCE_MATCH_THRESHOLD = config("RESOURCE_MATCH_THRESHOLD", default=0.35, cast=float)
+RESOURCE_MATCHES_PER_WEEK = config("RESOURCE_MATCHES_PER_WEEK", default=3, cast=int)
+
+# Batch quiz grading: quizzes packed into one feedback call, and parallel calls
+QUIZ_FEEDBACK_BATCH_SIZE = config("QUIZ_FEEDBACK_BATCH_SIZE", default=20, cast=int)
+QUIZ_FEEDBACK_CONCURRENCY = config("QUIZ_FEEDBACK_CONCURRENCY", default=4, cast=int)
+
+# AgentInteractionLog retention: turns older than the hot window (rounded down
+# to whole months) are moved to gzipped files by `manage.py archive_interactions`
+INTERACTION_LOG_HOT_DAYS = config("INTERACTION_LOG_HOT_DAYS", default=90, cast=int)
+INTERACTION_ARCHIVE_DIR = config("INTERACTION_ARCHIVE_DIR", default=str(BASE_DIR / "var" / "interaction_archive"))
+
+# Idempotency-Key handling for LLM-backed POSTs (see ai.utils.idempotency):
+# stored responses live IDEMPOTENCY_TTL seconds; retries wait up to
+# IDEMPOTENCY_WAIT_TIMEOUT for a request that is still running, and a claim
+# older than IDEMPOTENCY_LOCK_TIMEOUT is treated as abandoned.
+IDEMPOTENCY_TTL = config("IDEMPOTENCY_TTL", default=24 * 60 * 60, cast=int)
+IDEMPOTENCY_WAIT_TIMEOUT = config("IDEMPOTENCY_WAIT_TIMEOUT", default=90, cast=float)
+IDEMPOTENCY_POLL_INTERVAL = config("IDEMPOTENCY_POLL_INTERVAL", default=0.25, cast=float)
+IDEMPOTENCY_LOCK_TIMEOUT = config("IDEMPOTENCY_LOCK_TIMEOUT", default=300, cast=int)
+
+# Agent call resilience (see ai.utils.resilience): each call gets a latency
+# budget, one hedged duplicate once it runs past the given percentile of recent
+# latencies, and a per-call circuit breaker that serves fallbacks while open.
+AGENT_LATENCY_BUDGET = config("AGENT_LATENCY_BUDGET", default=25.0, cast=float)
+AGENT_HEDGE_PERCENTILE = config("AGENT_HEDGE_PERCENTILE", default=95, cast=float)
+AGENT_HEDGE_MIN_DELAY = config("AGENT_HEDGE_MIN_DELAY", default=3.0, cast=float)
+AGENT_BREAKER_FAILURES = config("AGENT_BREAKER_FAILURES", default=5, cast=int)
+AGENT_BREAKER_COOLDOWN = config("AGENT_BREAKER_COOLDOWN", default=30.0, cast=float)
+AGENT_POOL_WORKERS = config("AGENT_POOL_WORKERS", default=32, cast=int)
+AGENT_FALLBACK_CACHE_TTL = config("AGENT_FALLBACK_CACHE_TTL", default=7 * 24 * 60 * 60, cast=int)
+
+# Model routing (see ai.utils.router). AGENT_MODEL_ROUTES is a JSON object of
+# per-task overrides, e.g. {"chat": {"light_model": "gpt-4.1-mini"}}.
+AGENT_DEFAULT_MODEL = config("AGENT_DEFAULT_MODEL", default="gpt-4o")
+AGENT_MODEL_ROUTES = config("AGENT_MODEL_ROUTES", default="{}", cast=json.loads)
+AGENT_FAST_BUDGET = config("AGENT_FAST_BUDGET", default=8.0, cast=float)
+
+# ASGI + Channels. The in-memory layer needs no broker but only reaches
+# sockets in the same process; set CHANNEL_LAYER_BACKEND (e.g.
+# channels_redis.core.RedisChannelLayer) when running several workers.
+ASGI_APPLICATION = "config.asgi.application"
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": config("CHANNEL_LAYER_BACKEND", default="channels.layers.InMemoryChannelLayer"),
+    }
+}
+CHAT_HISTORY_TURNS = config("CHAT_HISTORY_TURNS", default=5, cast=int)
+
+# Chat agent tool loop: max model rounds that may call tools, and threads for
+# running read-only tool calls from one message concurrently
+CHAT_MAX_TOOL_ROUNDS = config("CHAT_MAX_TOOL_ROUNDS", default=4, cast=int)
+CHAT_TOOL_WORKERS = config("CHAT_TOOL_WORKERS", default=4, cast=int)
+
+# Quiz generation: quizzes longer than QUIZ_CHUNK_SIZE are generated as
+# concurrent chunks (oversampled for deduplication) and merged; questions at or
+# above QUIZ_DUPLICATE_THRESHOLD cosine similarity count as duplicates.
+QUIZ_DEFAULT_QUESTIONS = config("QUIZ_DEFAULT_QUESTIONS", default=10, cast=int)
+QUIZ_MAX_QUESTIONS = config("QUIZ_MAX_QUESTIONS", default=50, cast=int)
+QUIZ_CHUNK_SIZE = config("QUIZ_CHUNK_SIZE", default=10, cast=int)
+QUIZ_CHUNK_OVERSAMPLE = config("QUIZ_CHUNK_OVERSAMPLE", default=0.2, cast=float)
+QUIZ_GENERATION_CONCURRENCY = config("QUIZ_GENERATION_CONCURRENCY", default=5, cast=int)
+QUIZ_DUPLICATE_THRESHOLD = config("QUIZ_DUPLICATE_THRESHOLD", default=0.85, cast=float)
+# Smallest LLM top-up when the question bank is thin for a student/topic
+QUESTION_BANK_MIN_TOP_UP = config("QUESTION_BANK_MIN_TOP_UP", default=5, cast=int)
+# How many of the most recent bank questions per key new ones are checked against for near duplicates
+QUESTION_BANK_DEDUP_WINDOW = config("QUESTION_BANK_DEDUP_WINDOW", default=2000, cast=int)
+
+# Item analysis (see student.item_analysis): statistics count once a question
+# has QUESTION_STATS_MIN_ATTEMPTS answers. Questions discriminating below the
+# minimum (often a wrong answer key) are left out of new quizzes; questions at
+# or above QUESTION_EASY_DIFFICULTY correct rate count as "easy" for the planner.
+QUESTION_STATS_MIN_ATTEMPTS = config("QUESTION_STATS_MIN_ATTEMPTS", default=20, cast=int)
+QUESTION_MIN_DISCRIMINATION = config("QUESTION_MIN_DISCRIMINATION", default=0.0, cast=float)
+QUESTION_EASY_DIFFICULTY = config("QUESTION_EASY_DIFFICULTY", default=0.75, cast=float)
+
+# Subject leaderboards: mean scores (0..LEADERBOARD_MAX_SCORE) are counted into
+# LEADERBOARD_BINS equal-width bins per subject. Run `rebuild_leaderboards`
+# after changing either value.
+LEADERBOARD_BINS = config("LEADERBOARD_BINS", default=100, cast=int)
+LEADERBOARD_MAX_SCORE = config("LEADERBOARD_MAX_SCORE", default=100.0, cast=float)
+LEADERBOARD_MAX_LIMIT = config("LEADERBOARD_MAX_LIMIT", default=100, cast=int)
+
+# Learning plan history (see learningplan.history): every Nth version is a
+# full snapshot, so rebuilding any version replays fewer than N deltas.
+PLAN_SNAPSHOT_INTERVAL = config("PLAN_SNAPSHOT_INTERVAL", default=20, cast=int)
+
+# Request timing (see config.middleware). Every response gets a Server-Timing
+# header and a JSON line on the `config.timing` logger. Setting
+# REQUEST_PROFILE_SAMPLE_RATE above 0 profiles that fraction of requests and
+# keeps cProfile dumps of those slower than REQUEST_PROFILE_THRESHOLD_MS.
+REQUEST_TIMING_LOG_LEVEL = config("REQUEST_TIMING_LOG_LEVEL", default="INFO")
+REQUEST_PROFILE_SAMPLE_RATE = config("REQUEST_PROFILE_SAMPLE_RATE", default=0.0, cast=float)
+REQUEST_PROFILE_THRESHOLD_MS = config("REQUEST_PROFILE_THRESHOLD_MS", default=1000, cast=float)
+REQUEST_PROFILE_DIR = config("REQUEST_PROFILE_DIR", default=str(BASE_DIR / "var" / "profiles"))
+REQUEST_PROFILE_KEEP = config("REQUEST_PROFILE_KEEP", default=100, cast=int)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {"timing": {"class": "logging.StreamHandler", "formatter": "message"}},
+    "loggers": {
+        "config.timing": {"handlers": ["timing"], "level": REQUEST_TIMING_LOG_LEVEL, "propagate": False},
+    },
+}
+
+# API docs (see config.docs). The OpenAPI schema is built once per process and
+# served from memory with an ETag. With OPENAPI_USE_ARTIFACT, the file that
+# `generate_openapi` wrote to OPENAPI_SCHEMA_PATH is loaded instead of
+# introspecting views. Only enable it where that command runs in the same
+# build as the code, or a stale schema is served. With OPENAPI_PRECOMPUTE
+# the schema is ready before the first request.
+OPENAPI_SCHEMA_PATH = config("OPENAPI_SCHEMA_PATH", default=str(BASE_DIR / "var" / "openapi.json"))
+OPENAPI_USE_ARTIFACT = config("OPENAPI_USE_ARTIFACT", default=False, cast=bool)
+OPENAPI_PRECOMPUTE = config("OPENAPI_PRECOMPUTE", default=True, cast=bool)
+
+# Resource link health (see student.link_checker). `check_resource_links`
+# checks catalog URLs concurrently, at most LINK_CHECK_PER_HOST requests in
+# flight and LINK_CHECK_HOST_INTERVAL seconds between starts per host.
+# Working links are rechecked after LINK_CHECK_TTL seconds, failing ones after
+# LINK_CHECK_RETRY_AFTER; a link is dead (hidden from listings and
+# recommendations) on 404/410 or after LINK_CHECK_MAX_FAILURES failed checks.
+LINK_CHECK_CONCURRENCY = config("LINK_CHECK_CONCURRENCY", default=50, cast=int)
+LINK_CHECK_PER_HOST = config("LINK_CHECK_PER_HOST", default=2, cast=int)
+LINK_CHECK_HOST_INTERVAL = config("LINK_CHECK_HOST_INTERVAL", default=0.5, cast=float)
+LINK_CHECK_TIMEOUT = config("LINK_CHECK_TIMEOUT", default=10.0, cast=float)
+LINK_CHECK_USER_AGENT = config("LINK_CHECK_USER_AGENT", default="ELearningLinkChecker/1.0")
+LINK_CHECK_TTL = config("LINK_CHECK_TTL", default=7 * 24 * 60 * 60, cast=int)
+LINK_CHECK_RETRY_AFTER = config("LINK_CHECK_RETRY_AFTER", default=24 * 60 * 60, cast=int)
+LINK_CHECK_MAX_FAILURES = config("LINK_CHECK_MAX_FAILURES", default=3, cast=int)
+
 # Custom Social Login JWT override
 SOCIALACCOUNT_ADAPTER = "student.adapters.CustomSocialAccountAdapter"
 REST_AUTH_SOCIAL_LOGIN_VIEW = "student.adapters.JWTEnabledSocialLoginView"
\ No newline at end of file
@@ -0,0 +1,65 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from config.renderers import dumps
+
+
+def streaming_response(request, chunks, **kwargs):
+    """
+    Build a StreamingHttpResponse over the sync iterator `chunks`.
+
+    Under ASGI, Django drains a sync iterator with `sync_to_async(list)`
+    before sending anything, so there the chunks are pulled one at a time
+    through an async generator instead. Every pull runs on the same
+    thread-sensitive worker, which keeps server-side cursors on the
+    connection that opened them.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = _pull_async(iter(chunks))
+    return StreamingHttpResponse(chunks, **kwargs)
+
+
+async def _pull_async(chunks):
+    pull = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    try:
+        while (chunk := await pull(chunks, done)) is not done:
+            yield chunk
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            await sync_to_async(close, thread_sensitive=True)()
+
+
+class StreamingListMixin:
+    """
+    Adds `?stream=1` to a ListAPIView: rows are read from a server-side cursor
+    in `stream_chunk_size` batches, serialized and encoded one at a time, and
+    sent as a JSON array without materializing the whole list in memory.
+    The body is the same JSON the regular list endpoint returns.
+    """
+    stream_query_param = "stream"
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_query_param) not in ("1", "true"):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return streaming_response(request, self.stream_rows(queryset), content_type="application/json")
+
+    def stream_rows(self, queryset):
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        buffer = bytearray(b"[")
+        for count, instance in enumerate(queryset.iterator(chunk_size=self.stream_chunk_size), 1):
+            if count > 1:
+                buffer += b","
+            buffer += dumps(serializer_class(instance, context=context).data)
+            if count % self.stream_chunk_size == 0:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        yield bytes(buffer)
@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Wall time of one request split by category. Time is exclusive: a DB
+    query run while rendering counts as db, not serialization. Worker
+    threads started with ContextThreadPoolExecutor report into the same
+    instance; nesting is tracked per thread.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _nested(self):
+        if not hasattr(self._local, "nested"):
+            self._local.nested = []
+        return self._local.nested
+
+    def add(self, category, seconds):
+        with self._lock:
+            self.durations[category] = self.durations.get(category, 0.0) + seconds
+            self.counts[category] = self.counts.get(category, 0) + 1
+        nested = self._nested()
+        if nested:
+            nested[-1] += seconds
+
+    @contextmanager
+    def track(self, category):
+        nested = self._nested()
+        started = time.perf_counter()
+        nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            inner = nested.pop()
+            self.add(category, elapsed - inner)
+            if nested:
+                nested[-1] += inner
+
+
+def start():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def add_time(category, seconds):
+    """Attribute an externally measured duration to the current request, if any."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(category, seconds)
+
+
+@contextmanager
+def track(category):
+    """Attribute the time spent in the block to the current request, if any."""
+    timings = _current.get()
+    if timings is None:
+        yield
+    else:
+        with timings.track(category):
+            yield
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    with track("db"):
+        return execute(sql, params, many, context)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor whose tasks run in a copy of the submitting thread's
+    context, so DB and LLM time spent on workers is attributed to the request
+    that submitted them. Parallel work is summed: the categories of a request
+    that fans out can add up to more than its wall time.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(copy_context().run, fn, *args, **kwargs)
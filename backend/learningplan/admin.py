@@ -3,6 +3,7 @@ from .models import (
     LearningPlan,
     LearningPlanWeek,
     LearningPlanResource,
+    PlanVersion,
 )
 
 # Register your models here.
@@ -22,4 +23,11 @@ class LearningPlanWeekAdmin(admin.ModelAdmin):
 @admin.register(LearningPlanResource)
 class LearningPlanResourceAdmin(admin.ModelAdmin):
     list_display = ("week", "fallback_name", "resource")
-    search_fields = ("fallback_name", "resource__topic_name", "week__plan__student__email")
\ No newline at end of file
+    search_fields = ("fallback_name", "resource__topic_name", "week__plan__student__email")
+
+
+@admin.register(PlanVersion)
+class PlanVersionAdmin(admin.ModelAdmin):
+    list_display = ("student", "version", "kind", "source", "plan_duration_weeks", "created_at")
+    list_filter = ("kind", "source")
+    search_fields = ("student__email",)
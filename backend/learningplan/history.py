@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db import transaction
+
+from student.models import Student
+
+from .models import LearningPlanWeek, PlanVersion
+
+WEEK_FIELDS = ("focus_topics", "practice_tasks", "ai_message")
+
+
+# -----------------------------
+# States and deltas
+# -----------------------------
+# A state is {"plan_duration_weeks": n, "weeks": {"1": {field: value}, ...}};
+# week numbers are strings so states round-trip through JSON unchanged.
+
+def plan_state(plan) -> dict:
+    return {
+        "plan_duration_weeks": plan.plan_duration_weeks,
+        "weeks": {
+            str(row["week"]): {field: row[field] for field in WEEK_FIELDS}
+            for row in LearningPlanWeek.objects.filter(plan=plan).values("week", *WEEK_FIELDS)
+        },
+    }
+
+
+def compute_delta(old_weeks, new_weeks) -> dict:
+    """Changed fields per week and removed weeks, enough to turn `old_weeks` into `new_weeks`."""
+    changed = {}
+    for week, fields in new_weeks.items():
+        before = old_weeks.get(week, {})
+        diff = {field: value for field, value in fields.items() if before.get(field) != value}
+        if diff:
+            changed[week] = diff
+    removed = sorted((week for week in old_weeks if week not in new_weeks), key=int)
+    return {"set": changed, "remove": removed}
+
+
+def apply_delta(weeks, delta):
+    for week in delta["remove"]:
+        weeks.pop(week, None)
+    for week, fields in delta["set"].items():
+        weeks[week] = {**weeks.get(week, {}), **fields}
+    return weeks
+
+
+def _size(data):
+    return sum(len(fields) for fields in data.get("set", data.get("weeks", {})).values())
+
+
+# -----------------------------
+# Recording and reconstruction
+# -----------------------------
+
+def record_version(student, plan, source) -> PlanVersion:
+    """
+    Append the plan's current state to the student's history. Stores a delta
+    against the previous version, or a snapshot every PLAN_SNAPSHOT_INTERVAL
+    versions (and whenever the delta would be as large as a snapshot), so
+    reconstruction never replays more than that many deltas. A call that
+    changes nothing returns the latest version.
+    """
+    with transaction.atomic():
+        # One writer per student at a time keeps version numbers dense
+        Student.objects.select_for_update().filter(pk=student.pk).first()
+        latest = PlanVersion.objects.filter(student=student).order_by("-version").first()
+        state = plan_state(plan)
+
+        if latest is None:
+            return PlanVersion.objects.create(
+                student=student, plan=plan, version=1, base_version=1, kind="snapshot", source=source,
+                plan_duration_weeks=state["plan_duration_weeks"], data={"weeks": state["weeks"]},
+            )
+
+        previous = reconstruct(student, latest.version)
+        delta = compute_delta(previous["weeks"], state["weeks"])
+        unchanged = not delta["set"] and not delta["remove"] \
+            and previous["plan_duration_weeks"] == state["plan_duration_weeks"]
+        if unchanged and latest.plan_id == plan.id:
+            return latest
+
+        version = latest.version + 1
+        snapshot = (
+            version - latest.base_version >= settings.PLAN_SNAPSHOT_INTERVAL
+            or _size(delta) >= _size({"weeks": state["weeks"]})
+        )
+        return PlanVersion.objects.create(
+            student=student, plan=plan, version=version,
+            base_version=version if snapshot else latest.base_version,
+            kind="snapshot" if snapshot else "delta", source=source,
+            plan_duration_weeks=state["plan_duration_weeks"],
+            data={"weeks": state["weeks"]} if snapshot else delta,
+        )
+
+
+def reconstruct(student, version) -> dict:
+    """
+    State of plan `version`, from its base snapshot plus the deltas after it,
+    in two queries. Raises PlanVersion.DoesNotExist for unknown versions.
+    """
+    target = PlanVersion.objects.filter(student=student, version=version).values(
+        "base_version", "plan_id", "source", "created_at"
+    ).first()
+    if target is None:
+        raise PlanVersion.DoesNotExist(f"Plan version {version} does not exist.")
+
+    chain = PlanVersion.objects.filter(
+        student=student, version__gte=target["base_version"], version__lte=version
+    ).order_by("version").values_list("kind", "data", "plan_duration_weeks")
+
+    weeks = {}
+    duration = None
+    for kind, data, duration in chain:
+        weeks = dict(data["weeks"]) if kind == "snapshot" else apply_delta(weeks, data)
+    return {
+        "version": version,
+        "plan_id": target["plan_id"],
+        "source": target["source"],
+        "created_at": target["created_at"],
+        "plan_duration_weeks": duration,
+        "weeks": weeks,
+    }
+
+
+def as_weekly_plan(state) -> list:
+    """A reconstructed state in the same shape as GET /generate/learning-plan/."""
+    return [{"week": int(week), **fields} for week, fields in sorted(state["weeks"].items(), key=lambda w: int(w[0]))]
+
+
+def diff_versions(student, from_version, to_version) -> dict:
+    """Per-week differences between two versions, with before/after values for each changed field."""
+    old, new = reconstruct(student, from_version), reconstruct(student, to_version)
+    weeks = []
+    for week in sorted(set(old["weeks"]) | set(new["weeks"]), key=int):
+        before, after = old["weeks"].get(week), new["weeks"].get(week)
+        if before == after:
+            continue
+        if before is None or after is None:
+            weeks.append({
+                "week": int(week),
+                "status": "added" if before is None else "removed",
+                "fields": after if before is None else before,
+            })
+            continue
+        weeks.append({
+            "week": int(week),
+            "status": "changed",
+            "changes": {
+                field: {"before": before.get(field), "after": after.get(field)}
+                for field in WEEK_FIELDS if before.get(field) != after.get(field)
+            },
+        })
+    return {
+        "from_version": from_version,
+        "to_version": to_version,
+        "plan_duration_weeks": {"before": old["plan_duration_weeks"], "after": new["plan_duration_weeks"]},
+        "weeks": weeks,
+    }
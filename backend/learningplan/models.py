@@ -28,4 +28,37 @@ class LearningPlanResource(models.Model):
     fallback_url = models.URLField(blank=True, null=True)
 
     def __str__(self):
-        return f"{self.fallback_name} for {self.week}"
\ No newline at end of file
+        return f"{self.fallback_name} for {self.week}"
+
+class PlanVersion(models.Model):
+    """
+    One entry in a student's plan history (see learningplan.history). A
+    snapshot stores every week; a delta stores only the week fields that
+    changed since the previous version, plus removed weeks. `base_version`
+    is the snapshot a delta chain starts from.
+    """
+    KIND_CHOICES = [
+        ("snapshot", "Snapshot"),
+        ("delta", "Delta"),
+    ]
+    SOURCE_CHOICES = [
+        ("generated", "Generated"),
+        ("chat", "Chat update"),
+        ("baseline", "Baseline"),
+    ]
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="plan_versions")
+    plan = models.ForeignKey(LearningPlan, on_delete=models.SET_NULL, null=True, blank=True, related_name="versions")
+    version = models.PositiveIntegerField()
+    base_version = models.PositiveIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    plan_duration_weeks = models.PositiveIntegerField()
+    data = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("student", "version")
+
+    def __str__(self):
+        return f"Plan v{self.version} ({self.student.email}, {self.kind})"
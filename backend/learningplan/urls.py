@@ -1,7 +1,13 @@
-from .views import GenerateResourcesView, GenerateLearningPlanView
+from .views import (
+    GenerateResourcesView, GenerateLearningPlanView,
+    PlanVersionListView, PlanVersionDetailView, PlanVersionDiffView
+)
 from django.urls import path
 
 urlpatterns = [
     path("resources/", GenerateResourcesView.as_view(), name="generate-resources"),
     path("learning-plan/", GenerateLearningPlanView.as_view(), name="generate-learning-plan"),
+    path("learning-plan/versions/", PlanVersionListView.as_view(), name="plan-versions"),
+    path("learning-plan/versions/diff/", PlanVersionDiffView.as_view(), name="plan-version-diff"),
+    path("learning-plan/versions/<int:version>/", PlanVersionDetailView.as_view(), name="plan-version-detail"),
 ]
\ No newline at end of file
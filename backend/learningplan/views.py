@@ -1,11 +1,17 @@
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from student.models import StudentInfo, StudentSubject, LearningGoal, StudentResourceLog, Resource
-from .models import LearningPlan, LearningPlanWeek, LearningPlanResource
-from student.serializers import FullStudentDataSerializer
+from student.models import Resource
+from .models import LearningPlan, LearningPlanWeek, LearningPlanResource, PlanVersion
+from student.projections import build_student_profile
+from student.progress import progress_summary
+from student.item_analysis import student_gaps
+from .history import as_weekly_plan, diff_versions, reconstruct, record_version
 from ai.agents.planner import generate_learning_plan
 from ai.agents.resource_generator import generate_resource_suggestions
+from ai.utils.retrieval import recommend_plan_resources
+from ai.utils.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 import json
@@ -18,45 +24,39 @@ class GenerateLearningPlanView(APIView):
         operation_description="Generates and saves a structured weekly learning plan for the authenticated student using their full profile."
                               " (Resources will be generated separately)",
         responses={200: openapi.Response("Plan generated and saved")},
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         tags=["Learning Plan"]
     )
+    @idempotent
     def post(self, request):
         user = request.user
         try:
-            info = StudentInfo.objects.get(student=user)
-            subjects = StudentSubject.objects.filter(student=user)
-            goals = LearningGoal.objects.filter(student=user)
-            resource_logs = StudentResourceLog.objects.filter(student=user)
-
-            serializer = FullStudentDataSerializer(
-                user,
-                context={
-                    "request": request,
-                    "student": user,
-                    "info": info,
-                    "subjects": subjects,
-                    "goals": goals,
-                    "resource_logs": resource_logs,
-                }
-            )
-
-            parsed_plan = generate_learning_plan(serializer.data)
+            # Compact rollup stats instead of the raw quiz list
+            profile = build_student_profile(user, require_info=True)
+            profile.pop("quizzes", None)
+            profile["progress"] = progress_summary(user)
+            profile["gaps"] = student_gaps(user)
+
+            parsed_plan = generate_learning_plan(profile)
+
+            with transaction.atomic():
+                plan = LearningPlan.objects.create(
+                    student=user,
+                    plan_duration_weeks=parsed_plan.plan_duration_weeks
+                )
 
-            plan = LearningPlan.objects.create(
-                student=user,
-                plan_duration_weeks=parsed_plan.plan_duration_weeks
-            )
+                for week_data in parsed_plan.weekly_plan:
+                    LearningPlanWeek.objects.create(
+                        plan=plan,
+                        week=week_data.week,
+                        focus_topics=week_data.focus_topics,
+                        practice_tasks=week_data.practice_tasks,
+                        ai_message=week_data.ai_message
+                    )
 
-            for week_data in parsed_plan.weekly_plan:
-                LearningPlanWeek.objects.create(
-                    plan=plan,
-                    week=week_data.week,
-                    focus_topics=week_data.focus_topics,
-                    practice_tasks=week_data.practice_tasks,
-                    ai_message=week_data.ai_message
-                )
+                version = record_version(user, plan, "generated")
 
-            return Response({"message": "Plan generated and saved successfully."})
+            return Response({"message": "Plan generated and saved successfully.", "version": version.version})
 
         except Exception as e:
             return Response({"error": str(e)}, status=400)
@@ -100,31 +100,28 @@ class GenerateResourcesView(APIView):
 
     @swagger_auto_schema(
         operation_summary="Generate learning resources",
-        operation_description="Generates personalized learning resources based on the student's preferences and learning plan.",
+        operation_description="Attaches catalog resources to each week of the latest learning plan by similarity, "
+                              "and generates new resources with the LLM only for weeks without a good match.",
         responses={200: openapi.Response("Resources generated and saved.")},
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         tags=["Learning Resources"]
     )
+    @idempotent
     def post(self, request):
         try:
             user = request.user
-            info = StudentInfo.objects.get(student=user)
-            subjects = StudentSubject.objects.filter(student=user)
-            goals = LearningGoal.objects.filter(student=user)
-            resource_logs = StudentResourceLog.objects.filter(student=user)
-
-            profile_serializer = FullStudentDataSerializer(user, context={
-                "request": request,
-                "student": user,
-                "info": info,
-                "subjects": subjects,
-                "goals": goals,
-                "resource_logs": resource_logs,
-            })
+            profile = build_student_profile(user, require_info=True)
 
             latest_plan = LearningPlan.objects.filter(student=user).order_by("-created_at").first()
             if not latest_plan:
                 return Response({"error": "No learning plan found."}, status=400)
 
+            subject_ids = [s["subject"]["id"] for s in profile["subjects"]]
+            unmatched_weeks = recommend_plan_resources(latest_plan, subject_ids)
+            if not unmatched_weeks:
+                return Response({"message": "Resources matched from catalog successfully."})
+
+            # Only weeks without a good catalog match go to the LLM.
             plan_data = {
                 "student": user.email,
                 "plan_duration_weeks": latest_plan.plan_duration_weeks,
@@ -135,22 +132,114 @@ class GenerateResourcesView(APIView):
                         "practice_tasks": w.practice_tasks,
                         "ai_message": w.ai_message
                     }
-                    for w in latest_plan.weeks.all()
+                    for w in unmatched_weeks
                 ]
             }
 
-            suggestions = generate_resource_suggestions(profile_serializer.data, plan_data)
+            suggestions = generate_resource_suggestions(profile, plan_data)
 
+            weeks_by_number = {w.week: w for w in unmatched_weeks}
+            links = []
             for res in suggestions.suggestions:
-                Resource.objects.create(
+                resource = Resource.objects.create(
                     topic_name=res.topic_name,
-                    subject=subjects.first().subject,  # Best guess
+                    subject_id=subject_ids[0],  # Best guess
                     url=res.url,
                     type=res.type,
                     description=res.description
                 )
+                week = weeks_by_number.get(res.week)
+                if week:
+                    links.append(LearningPlanResource(
+                        week=week,
+                        resource=resource,
+                        fallback_name=res.topic_name,
+                        fallback_url=res.url
+                    ))
+            LearningPlanResource.objects.bulk_create(links)
 
             return Response({"message": "Resources generated and saved successfully."})
 
         except Exception as e:
-            return Response({"error": str(e)}, status=400)
\ No newline at end of file
+            return Response({"error": str(e)}, status=400)
+
+
+# ---------------------------
+# Plan version history
+# ---------------------------
+class PlanVersionListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="List learning plan versions",
+        operation_description="Returns every stored version of the student's learning plan, newest first.",
+        responses={200: openapi.Response("Plan versions")},
+        tags=["Learning Plan"]
+    )
+    def get(self, request):
+        try:
+            versions = PlanVersion.objects.filter(student=request.user).order_by("-version").values(
+                "version", "plan_id", "kind", "source", "plan_duration_weeks", "created_at"
+            )
+            return Response({"versions": list(versions)})
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
+
+
+class PlanVersionDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Get a learning plan version",
+        operation_description="Reconstructs one version of the student's learning plan from its base snapshot "
+                              "and the deltas after it.",
+        responses={200: openapi.Response("Plan as of that version"), 404: "Unknown version"},
+        tags=["Learning Plan"]
+    )
+    def get(self, request, version):
+        try:
+            state = reconstruct(request.user, version)
+            return Response({
+                "student": request.user.email,
+                "version": state["version"],
+                "source": state["source"],
+                "plan_duration_weeks": state["plan_duration_weeks"],
+                "weekly_plan": as_weekly_plan(state),
+                "created_at": state["created_at"],
+            })
+        except PlanVersion.DoesNotExist as e:
+            return Response({"error": str(e)}, status=404)
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
+
+
+class PlanVersionDiffView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Diff two learning plan versions",
+        operation_description="Returns the weeks added, removed or changed between two plan versions, "
+                              "with before/after values for each changed field.",
+        manual_parameters=[
+            openapi.Parameter("from", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=True,
+                              description="Older version"),
+            openapi.Parameter("to", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Newer version (default: latest)"),
+        ],
+        responses={200: openapi.Response("Per-week differences"), 404: "Unknown version"},
+        tags=["Learning Plan"]
+    )
+    def get(self, request):
+        try:
+            from_version = int(request.query_params["from"])
+            to_version = request.query_params.get("to")
+            if to_version is None:
+                to_version = PlanVersion.objects.filter(student=request.user).order_by("-version") \
+                    .values_list("version", flat=True).first() or 0
+            return Response(diff_versions(request.user, from_version, int(to_version)))
+        except PlanVersion.DoesNotExist as e:
+            return Response({"error": str(e)}, status=404)
+        except (KeyError, ValueError):
+            return Response({"error": "'from' (and optional 'to') must be version numbers."}, status=400)
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
@@ -1,8 +1,10 @@
 from django.contrib import admin
 from .models import (
     Student, StudentInfo, Subject, StudentSubject,
-    Quiz, Question, LearningGoal,
-    Resource, StudentResourceLog
+    Quiz, Question, BankQuestion, LearningGoal,
+    Resource, StudentResourceLog,
+    SubjectProgress, TopicProgress, WeeklyProgress, QuestionStats,
+    SubjectScoreBin
 )
 
 @admin.register(Student)
@@ -25,21 +27,53 @@ class StudentSubjectAdmin(admin.ModelAdmin):
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
-    list_display = ("id", "student", "subject", "status", "score", "created_at")
+    list_display = ("id", "student", "subject", "topic", "status", "score", "created_at")
     list_filter = ("status",)
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
     list_display = ("quiz", "question_text", "is_correct")
 
+@admin.register(BankQuestion)
+class BankQuestionAdmin(admin.ModelAdmin):
+    list_display = ("subject", "topic", "level", "question_text", "usage_count")
+    list_filter = ("level", "subject")
+    search_fields = ("topic", "question_text")
+
 @admin.register(LearningGoal)
 class LearningGoalAdmin(admin.ModelAdmin):
     list_display = ("student", "goal_text", "subject", "achieved")
 
 @admin.register(Resource)
 class ResourceAdmin(admin.ModelAdmin):
-    list_display = ("topic_name", "subject", "type")
+    list_display = ("topic_name", "subject", "type", "link_status", "link_checked_at")
+    list_filter = ("link_status",)
 
 @admin.register(StudentResourceLog)
 class StudentResourceLogAdmin(admin.ModelAdmin):
-    list_display = ("student", "resource", "accessed_at")
\ No newline at end of file
+    list_display = ("student", "resource", "accessed_at")
+
+@admin.register(SubjectProgress)
+class SubjectProgressAdmin(admin.ModelAdmin):
+    list_display = ("student", "subject", "attempts", "mean_score", "last_score", "last_attempt_at")
+    search_fields = ("student__email",)
+
+@admin.register(TopicProgress)
+class TopicProgressAdmin(admin.ModelAdmin):
+    list_display = ("student", "subject", "topic", "attempts", "questions_answered", "questions_correct")
+    search_fields = ("student__email", "topic")
+
+@admin.register(WeeklyProgress)
+class WeeklyProgressAdmin(admin.ModelAdmin):
+    list_display = ("student", "subject", "week_start", "attempts", "score_sum")
+    search_fields = ("student__email",)
+
+@admin.register(QuestionStats)
+class QuestionStatsAdmin(admin.ModelAdmin):
+    list_display = ("bank_question", "attempts", "difficulty", "discrimination", "updated_at")
+    search_fields = ("bank_question__topic", "bank_question__question_text")
+
+@admin.register(SubjectScoreBin)
+class SubjectScoreBinAdmin(admin.ModelAdmin):
+    list_display = ("subject", "bin", "count")
+    list_filter = ("subject",)
@@ -0,0 +1,83 @@
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:student:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+# Only what request handling needs; the password hash never goes to the cache
+CACHED_USER_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser")
+
+
+def _user_from_cache(fields):
+    """
+    Rebuild a Student as if loaded with .only(CACHED_USER_FIELDS): other
+    fields are deferred, so reading one queries it and save() writes only
+    the cached fields.
+    """
+    from student.models import Student
+
+    names = [f.attname for f in Student._meta.concrete_fields if f.attname in fields]
+    return Student.from_db(DEFAULT_DB_ALIAS, names, [fields[name] for name in names])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that trusts the signed claims and resolves the Student
+    from the cache for AUTH_USER_CACHE_TTL seconds instead of querying on
+    every request. Only users that pass simplejwt's checks (exists, active)
+    are cached, and only their CACHED_USER_FIELDS. Any save or delete of the
+    Student evicts the entry, so deactivation and password changes apply on
+    the next request.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        fields = cache.get(key)
+        if fields is None:
+            user = super().get_user(validated_token)
+            cache.set(key, {name: getattr(user, name) for name in CACHED_USER_FIELDS}, settings.AUTH_USER_CACHE_TTL)
+            return user
+        return _user_from_cache(fields)
+
+
+class JWTAuthMiddleware:
+    """
+    Channels middleware: authenticates a WebSocket handshake from an access
+    token in the `token` query parameter and sets scope["user"]. The socket
+    stays authenticated for its lifetime; clients reconnect with a fresh
+    token when it expires.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def __call__(self, scope, receive, send):
+        from asgiref.sync import sync_to_async
+        from django.contrib.auth.models import AnonymousUser
+        from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+        token = parse_qs(scope.get("query_string", b"").decode()).get("token", [None])[0]
+        scope["user"] = AnonymousUser()
+        if token:
+            auth = CachedJWTAuthentication()
+            try:
+                validated = auth.get_validated_token(token.encode())
+                scope["user"] = await sync_to_async(auth.get_user)(validated)
+            except (InvalidToken, AuthenticationFailed):
+                pass
+        return await self.inner(scope, receive, send)
@@ -0,0 +1,61 @@
+from config.renderers import dumps
+
+from .models import LearningGoal, Question, Quiz, StudentInfo, StudentResourceLog, StudentSubject
+
+EXPORT_CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+
+def _rows(record_type, queryset, *fields):
+    for row in queryset.order_by("id").values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {"type": record_type, **row}
+
+
+def iter_student_history(student):
+    """
+    Yield every record belonging to `student`, one dict per row, table by
+    table. Each table is read through a server-side cursor in chunks, so
+    memory use does not grow with the size of the history.
+    """
+    from ai.models import AgentInteractionLog
+    from ai.utils.archive import iter_archived_interactions
+    from learningplan.models import LearningPlan, LearningPlanResource, LearningPlanWeek
+
+    yield {"type": "student", "id": student.id, "email": student.email, "date_joined": student.date_joined}
+
+    yield from _rows("info", StudentInfo.objects.filter(student=student),
+                     "id", "full_name", "age", "gender", "preferred_learning_style", "joined_on")
+    yield from _rows("subject", StudentSubject.objects.filter(student=student),
+                     "id", "subject_id", "subject__name", "preferred_style", "favorite_topics", "weak_topics", "goal")
+    yield from _rows("goal", LearningGoal.objects.filter(student=student),
+                     "id", "goal_text", "subject_id", "achieved", "created_at")
+    yield from _rows("quiz", Quiz.objects.filter(student=student),
+                     "id", "subject_id", "subject__name", "topic", "created_at", "total_marks", "score",
+                     "ai_feedback", "status")
+    yield from _rows("question", Question.objects.filter(quiz__student=student),
+                     "id", "quiz_id", "question_text", "options", "correct_option", "student_answer", "is_correct")
+    yield from _rows("learning_plan", LearningPlan.objects.filter(student=student),
+                     "id", "plan_duration_weeks", "created_at")
+    yield from _rows("learning_plan_week", LearningPlanWeek.objects.filter(plan__student=student),
+                     "id", "plan_id", "week", "focus_topics", "practice_tasks", "ai_message")
+    yield from _rows("learning_plan_resource", LearningPlanResource.objects.filter(week__plan__student=student),
+                     "id", "week_id", "resource_id", "fallback_name", "fallback_url")
+    yield from _rows("resource_log", StudentResourceLog.objects.filter(student=student),
+                     "id", "resource_id", "resource__topic_name", "resource__url", "accessed_at", "feedback")
+    for row in iter_archived_interactions(student):
+        yield {"type": "agent_interaction", **row}
+    yield from _rows("agent_interaction", AgentInteractionLog.objects.filter(student=student),
+                     "id", "user_message", "agent_response", "created_at")
+
+
+def iter_ndjson(records):
+    """Encode records as NDJSON, yielding ~64 KB byte chunks."""
+    buffer = bytearray()
+    for record in records:
+        buffer += dumps(record)
+        buffer += b"\n"
+        if len(buffer) >= FLUSH_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from PASSWORD_PBKDF2_ITERATIONS."""
+
+    def __init__(self):
+        self.iterations = settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt with the work factor taken from PASSWORD_SCRYPT_WORK_FACTOR."""
+
+    def __init__(self):
+        self.work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR
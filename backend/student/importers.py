@@ -0,0 +1,315 @@
+import csv
+import io
+import itertools
+from datetime import date, datetime
+
+import orjson
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.db import connection
+
+from .models import Resource, Student, StudentInfo, StudentSubject, Subject
+
+LEARNING_STYLES = {choice for choice, _ in StudentInfo.LEARNING_STYLE_CHOICES}
+SUBJECT_STYLES = {choice for choice, _ in StudentSubject.STYLE_CHOICES}
+RESOURCE_TYPES = {choice for choice, _ in Resource.RESOURCE_TYPE_CHOICES}
+MAX_AGE = 150
+
+
+class RowError(Exception):
+    pass
+
+
+def field_value(row, name, model, field_name=None, required=False) -> str:
+    """
+    `row[name]` stripped, checked against the model field's validators
+    (max_length, URL, email), so bad values become a RowError for the row
+    instead of a database error for the whole chunk.
+    """
+    value = row.get(name)
+    if value is None:
+        value = ""
+    if not isinstance(value, str):
+        raise RowError(f"{name} must be a string")
+    value = value.strip()
+    if not value:
+        if required:
+            raise RowError(f"{name} is required")
+        return value
+    try:
+        model._meta.get_field(field_name or name).run_validators(value)
+    except ValidationError as e:
+        raise RowError(f"{name}: {' '.join(e.messages)}")
+    return value
+
+
+# -----------------------------
+# Input
+# -----------------------------
+
+def iter_rows(path, fmt):
+    """Yield (line_number, row_dict_or_RowError) from a CSV or JSONL file, one row at a time."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = orjson.loads(line)
+                    if not isinstance(row, dict):
+                        raise RowError("Expected a JSON object")
+                    yield line_number, row
+                except (orjson.JSONDecodeError, RowError) as e:
+                    yield line_number, RowError(f"Invalid JSON: {e}")
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+# -----------------------------
+# Subject resolution
+# -----------------------------
+
+class SubjectResolver:
+    """Maps subject names to ids in bulk, creating missing subjects, with a run-wide cache."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def resolve(self, names):
+        missing = {n for n in names if n and n not in self.ids}
+        if missing:
+            self.ids.update(Subject.objects.filter(name__in=missing).values_list("name", "id"))
+            to_create = missing - self.ids.keys()
+            if to_create:
+                Subject.objects.bulk_create([Subject(name=n) for n in to_create], ignore_conflicts=True)
+                self.ids.update(Subject.objects.filter(name__in=to_create).values_list("name", "id"))
+        return self.ids
+
+
+def split_names(value):
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if value is not None and not isinstance(value, str):
+        raise RowError("subjects must be a list or a |-separated string")
+    return [v.strip() for v in (value or "").split("|") if v.strip()]
+
+
+def subject_names(value):
+    names = split_names(value)
+    for name in names:
+        field_value({"subjects": name}, "subjects", Subject, "name")
+    return names
+
+
+# -----------------------------
+# Writing: bulk_create or Postgres COPY
+# -----------------------------
+
+def _copy_value(field, value):
+    if value is None:
+        return r"\N"
+    if field.get_internal_type() == "JSONField":
+        value = orjson.dumps(value).decode()
+    elif isinstance(value, bool):
+        value = "t" if value else "f"
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(model, columns, rows, batch_size=100_000):
+    """
+    Insert plain value tuples into `columns` (field names or attnames) with
+    COPY ... FROM STDIN, `batch_size` rows per COPY (PostgreSQL only).
+    Returns the number of rows written.
+    """
+    fields = [model._meta.get_field(column) for column in columns]
+    quote = connection.ops.quote_name
+    statement = f"COPY {quote(model._meta.db_table)} ({', '.join(quote(f.column) for f in fields)}) FROM STDIN"
+
+    rows = iter(rows)
+    written = 0
+    with connection.cursor() as cursor:
+        while True:
+            buffer = io.StringIO()
+            count = 0
+            for row in itertools.islice(rows, batch_size):
+                buffer.write("\t".join(_copy_value(f, v) for f, v in zip(fields, row)))
+                buffer.write("\n")
+                count += 1
+            if not count:
+                return written
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            written += count
+
+
+def copy_objects(model, objects):
+    """Insert unsaved instances with COPY ... FROM STDIN (PostgreSQL only)."""
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    copy_rows(model, [f.attname for f in fields], ([f.pre_save(obj, add=True) for f in fields] for obj in objects))
+
+
+def write_objects(model, objects, use_copy):
+    if not objects:
+        return
+    if use_copy:
+        copy_objects(model, objects)
+    else:
+        model.objects.bulk_create(objects, batch_size=1000)
+
+
+# -----------------------------
+# Loaders: each takes a chunk of (line_number, row) and returns
+# (rows_loaded, [(line_number, error), ...]). Called inside a transaction.
+# -----------------------------
+
+def load_subjects(chunk, resolver, use_copy=False, hash_pool=None):
+    errors = []
+    rows = {}
+    for line_number, row in chunk:
+        try:
+            name = field_value(row, "name", Subject, required=True)
+            if name in rows:
+                raise RowError(f"duplicate subject {name!r}")
+            rows[name] = field_value(row, "description", Subject)
+        except RowError as e:
+            errors.append((line_number, str(e)))
+
+    existing = set(Subject.objects.filter(name__in=rows).values_list("name", flat=True))
+    Subject.objects.bulk_create(
+        [Subject(name=name, description=description) for name, description in rows.items() if name not in existing]
+    )
+    resolver.resolve(rows)
+    return len(rows), errors
+
+
+def load_resources(chunk, resolver, use_copy=False, hash_pool=None):
+    errors = []
+    valid = []
+    for line_number, row in chunk:
+        try:
+            resource = {
+                "topic_name": field_value(row, "topic_name", Resource, required=True),
+                "subject": field_value(row, "subject", Subject, "name", required=True),
+                "url": field_value(row, "url", Resource, required=True),
+                "type": field_value(row, "type", Resource),
+                "description": field_value(row, "description", Resource),
+            }
+            if resource["type"] not in RESOURCE_TYPES:
+                raise RowError(f"type must be one of {sorted(RESOURCE_TYPES)}")
+        except RowError as e:
+            errors.append((line_number, str(e)))
+            continue
+        valid.append(resource)
+
+    subject_ids = resolver.resolve({row["subject"] for row in valid})
+    write_objects(Resource, [
+        Resource(
+            topic_name=row["topic_name"],
+            subject_id=subject_ids[row["subject"]],
+            url=row["url"],
+            type=row["type"],
+            description=row["description"],
+        )
+        for row in valid
+    ], use_copy)
+    return len(valid), errors
+
+
+def _password_for(row):
+    encoded = row.get("password_hash")
+    if not isinstance(encoded or "", str) or not isinstance(row.get("password") or "", str):
+        raise RowError("password and password_hash must be strings")
+    if encoded:
+        try:
+            identify_hasher(encoded)
+        except ValueError:
+            raise RowError("password_hash is not a recognised Django hash")
+        return encoded
+    if row.get("password"):
+        return None  # hashed later for the whole chunk at once
+    return make_password(None)
+
+
+def load_students(chunk, resolver, use_copy=False, hash_pool=None):
+    """
+    Rows: email, password or password_hash (optional), full_name, age,
+    gender, preferred_learning_style (optional StudentInfo), and subjects
+    ("Math|Physics", optional StudentSubject links).
+    """
+    errors = []
+    valid = []
+    seen = set()
+    for line_number, row in chunk:
+        try:
+            email = Student.objects.normalize_email(field_value(row, "email", Student, required=True))
+            if email in seen:
+                raise RowError(f"duplicate email {email!r} in input")
+            info = None
+            if row.get("full_name"):
+                age = str(row.get("age") or "").strip()
+                if not age.isdigit() or int(age) > MAX_AGE:
+                    raise RowError(f"age must be an integer from 0 to {MAX_AGE}")
+                style = field_value(row, "preferred_learning_style", StudentInfo)
+                if style not in LEARNING_STYLES:
+                    raise RowError(f"preferred_learning_style must be one of {sorted(LEARNING_STYLES)}")
+                info = {
+                    "full_name": field_value(row, "full_name", StudentInfo),
+                    "age": int(age),
+                    "gender": field_value(row, "gender", StudentInfo),
+                    "preferred_learning_style": style,
+                }
+            subjects = subject_names(row.get("subjects"))
+            link_style = row.get("preferred_style") or row.get("preferred_learning_style") or "reading_writing"
+            if subjects and (not isinstance(link_style, str) or link_style not in SUBJECT_STYLES):
+                raise RowError(f"preferred_style must be one of {sorted(SUBJECT_STYLES)}")
+            password = _password_for(row)
+        except RowError as e:
+            errors.append((line_number, str(e)))
+            continue
+        seen.add(email)
+        valid.append((line_number, email, password, row, info, subjects, link_style))
+
+    existing = set(Student.objects.filter(email__in=seen).values_list("email", flat=True))
+    for line_number, email, *_ in valid:
+        if email in existing:
+            errors.append((line_number, f"student {email!r} already exists"))
+    valid = [item for item in valid if item[1] not in existing]
+
+    # Hash plain-text passwords for the whole chunk at once, in parallel if a pool is given.
+    raw_passwords = [row["password"] for _, _, password, row, *_ in valid if password is None]
+    hashed = iter(hash_pool.map(make_password, raw_passwords, chunksize=64) if hash_pool
+                  else map(make_password, raw_passwords))
+    students = [
+        Student(email=email, password=password if password is not None else next(hashed))
+        for _, email, password, *_ in valid
+    ]
+    write_objects(Student, students, use_copy)
+
+    ids = dict(Student.objects.filter(email__in=[s.email for s in students]).values_list("email", "id"))
+    subject_ids = resolver.resolve({name for *_, subjects, _ in valid for name in subjects})
+
+    infos = []
+    links = []
+    for _, email, _, _, info, subjects, link_style in valid:
+        if info:
+            infos.append(StudentInfo(student_id=ids[email], **info))
+        links.extend(
+            StudentSubject(student_id=ids[email], subject_id=subject_ids[name], preferred_style=link_style)
+            for name in dict.fromkeys(subjects)
+        )
+    write_objects(StudentInfo, infos, use_copy)
+    write_objects(StudentSubject, links, use_copy)
+    return len(students), errors
+
+
+LOADERS = {
+    "subjects": load_subjects,
+    "resources": load_resources,
+    "students": load_students,
+}
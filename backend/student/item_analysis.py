@@ -0,0 +1,200 @@
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Question, QuestionStats, Quiz
+
+STAT_FIELDS = ("attempts", "correct", "scored_attempts", "scored_correct", "rest_sum", "rest_sq_sum", "rest_correct_sum")
+
+
+# -----------------------------
+# Vectorized engine
+# -----------------------------
+
+def _load_columns(questions, chunk_size=20000):
+    """Answer rows as parallel NumPy columns, streamed from the database."""
+    quiz_ids, bank_ids, correct, answers = [], [], [], []
+    rows = questions.values_list("quiz_id", "bank_question_id", "is_correct", "student_answer")
+    for quiz_id, bank_id, is_correct, answer in rows.iterator(chunk_size=chunk_size):
+        quiz_ids.append(quiz_id)
+        bank_ids.append(bank_id or 0)
+        correct.append(bool(is_correct))
+        answers.append(answer or "")
+    return (
+        np.asarray(quiz_ids, dtype=np.int64),
+        np.asarray(bank_ids, dtype=np.int64),
+        np.asarray(correct, dtype=bool),
+        np.asarray(answers, dtype=object),
+    )
+
+
+def compute_item_stats(quiz_ids, bank_ids, correct, answers) -> dict:
+    """
+    Sufficient statistics per bank question from answer columns covering
+    whole quizzes. Returns {bank_id: {field: value, ..., "answer_counts": {...}}}.
+    """
+    if not len(quiz_ids):
+        return {}
+
+    # Per-quiz totals, broadcast back to each answer
+    _, quiz_index = np.unique(quiz_ids, return_inverse=True)
+    quiz_total = np.bincount(quiz_index)
+    quiz_correct = np.bincount(quiz_index, weights=correct)
+    others = quiz_total[quiz_index] - 1
+    has_rest = others > 0
+    rest = np.divide(quiz_correct[quiz_index] - correct, others, out=np.zeros(len(correct)), where=has_rest)
+
+    banked = bank_ids > 0
+    items, item_index = np.unique(bank_ids[banked], return_inverse=True)
+    correct_b, rest_b, has_rest_b = correct[banked], rest[banked], has_rest[banked]
+    size = len(items)
+
+    def total(weights):
+        return np.bincount(item_index, weights=weights, minlength=size)
+
+    columns = {
+        "attempts": np.bincount(item_index, minlength=size),
+        "correct": total(correct_b),
+        "scored_attempts": total(has_rest_b),
+        "scored_correct": total(has_rest_b & correct_b),
+        "rest_sum": total(np.where(has_rest_b, rest_b, 0)),
+        "rest_sq_sum": total(np.where(has_rest_b, rest_b ** 2, 0)),
+        "rest_correct_sum": total(np.where(has_rest_b & correct_b, rest_b, 0)),
+    }
+
+    # Distractor counts: one bincount over (item, chosen option) pairs
+    options, option_index = np.unique(answers[banked].astype(str), return_inverse=True)
+    pairs = np.bincount(item_index * len(options) + option_index, minlength=size * len(options))
+    pairs = pairs.reshape(size, len(options))
+
+    stats = {}
+    for row, bank_id in enumerate(items.tolist()):
+        stats[bank_id] = {field: columns[field][row].item() for field in STAT_FIELDS}
+        stats[bank_id]["answer_counts"] = {
+            options[col]: int(pairs[row, col]) for col in np.flatnonzero(pairs[row])
+        }
+    return stats
+
+
+def derive(n, n1, sn, sn1, sx, sx2, sx1):
+    """
+    Difficulty and point-biserial discrimination from sufficient statistics
+    (arrays or scalars): n attempts, n1 correct; over the sn attempts with a
+    rest score (sn1 correct), sums of rest score, its square, and of rest
+    score on correct attempts.
+    """
+    n, n1, sn, sn1 = (np.asarray(v, dtype=float) for v in (n, n1, sn, sn1))
+    sx, sx2, sx1 = (np.asarray(v, dtype=float) for v in (sx, sx2, sx1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        difficulty = np.where(n > 0, n1 / n, np.nan)
+        mean = sx / sn
+        std = np.sqrt(np.maximum(sx2 / sn - mean ** 2, 0))
+        p = sn1 / sn
+        m1 = sx1 / sn1
+        m0 = (sx - sx1) / (sn - sn1)
+        discrimination = (m1 - m0) / std * np.sqrt(p * (1 - p))
+    valid = (sn1 > 0) & (sn1 < sn) & (std > 0)
+    return difficulty, np.where(valid, discrimination, np.nan)
+
+
+def _save(stats, existing=None):
+    """Write merged statistics, recomputing the derived columns in one vectorized pass."""
+    existing = existing or {}
+    objects = []
+    for bank_id, new in stats.items():
+        obj = existing.get(bank_id) or QuestionStats(bank_question_id=bank_id, answer_counts={})
+        for field in STAT_FIELDS:
+            setattr(obj, field, getattr(obj, field) + new[field])
+        counts = dict(obj.answer_counts)
+        for option, count in new["answer_counts"].items():
+            counts[option] = counts.get(option, 0) + count
+        obj.answer_counts = counts
+        objects.append(obj)
+    if not objects:
+        return
+
+    difficulty, discrimination = derive(*(
+        [getattr(obj, field) for obj in objects] for field in STAT_FIELDS
+    ))
+    for obj, p, r in zip(objects, difficulty.tolist(), discrimination.tolist()):
+        obj.difficulty = None if np.isnan(p) else round(p, 4)
+        obj.discrimination = None if np.isnan(r) else round(r, 4)
+
+    updated = [obj for obj in objects if obj.bank_question_id in existing]
+    QuestionStats.objects.bulk_update(updated, [*STAT_FIELDS, "answer_counts", "difficulty", "discrimination"],
+                                      batch_size=1000)
+    QuestionStats.objects.bulk_create([obj for obj in objects if obj.bank_question_id not in existing],
+                                      batch_size=1000)
+
+
+# -----------------------------
+# Entry points
+# -----------------------------
+
+def record_item_results(quiz_ids):
+    """Fold freshly evaluated quizzes into QuestionStats. Call once per quiz."""
+    stats = compute_item_stats(*_load_columns(
+        Question.objects.filter(quiz_id__in=quiz_ids, quiz__status="completed")
+    ))
+    if not stats:
+        return
+    with transaction.atomic():
+        existing = QuestionStats.objects.select_for_update().in_bulk(list(stats))
+        _save(stats, existing)
+
+
+def rebuild_item_stats(batch_size=5000):
+    """
+    Recompute every QuestionStats row from answer history. Completed quizzes
+    are processed in id-ordered batches so memory stays bounded; the
+    per-batch statistics are additive and summed before writing.
+    """
+    totals = {}
+    last_id = 0
+    while True:
+        quiz_ids = list(
+            Quiz.objects.filter(status="completed", id__gt=last_id, questions__bank_question__isnull=False)
+            .order_by("id").values_list("id", flat=True).distinct()[:batch_size]
+        )
+        if not quiz_ids:
+            break
+        last_id = quiz_ids[-1]
+        for bank_id, new in compute_item_stats(*_load_columns(Question.objects.filter(quiz_id__in=quiz_ids))).items():
+            current = totals.setdefault(bank_id, {**{f: 0 for f in STAT_FIELDS}, "answer_counts": {}})
+            for field in STAT_FIELDS:
+                current[field] += new[field]
+            for option, count in new["answer_counts"].items():
+                current["answer_counts"][option] = current["answer_counts"].get(option, 0) + count
+
+    with transaction.atomic():
+        QuestionStats.objects.all().delete()
+        _save(totals)
+    return len(totals)
+
+
+# -----------------------------
+# Read side
+# -----------------------------
+
+def poor_items():
+    """Bank questions with enough attempts whose discrimination is below QUESTION_MIN_DISCRIMINATION."""
+    return QuestionStats.objects.filter(
+        attempts__gte=settings.QUESTION_STATS_MIN_ATTEMPTS,
+        discrimination__lt=settings.QUESTION_MIN_DISCRIMINATION,
+    ).values("bank_question_id")
+
+
+def student_gaps(student, limit=10) -> list:
+    """Topics where the student missed questions that most students answer correctly."""
+    return list(
+        Question.objects.filter(
+            quiz__student=student,
+            is_correct=False,
+            bank_question__stats__attempts__gte=settings.QUESTION_STATS_MIN_ATTEMPTS,
+            bank_question__stats__difficulty__gte=settings.QUESTION_EASY_DIFFICULTY,
+        )
+        .values("bank_question__subject__name", "bank_question__topic")
+        .annotate(missed=Count("id"))
+        .order_by("-missed")[:limit]
+    )
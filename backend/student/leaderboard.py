@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .models import Quiz, SubjectProgress, SubjectScoreBin
+
+
+# -----------------------------
+# Histogram maintenance
+# -----------------------------
+
+def score_bin(score) -> int:
+    width = settings.LEADERBOARD_MAX_SCORE / settings.LEADERBOARD_BINS
+    return min(max(int(score // width), 0), settings.LEADERBOARD_BINS - 1)
+
+
+def _bin_range(index):
+    width = settings.LEADERBOARD_MAX_SCORE / settings.LEADERBOARD_BINS
+    return index * width, (index + 1) * width
+
+
+def _add(subject_id, index, delta):
+    if delta > 0:
+        SubjectScoreBin.objects.get_or_create(subject_id=subject_id, bin=index)
+    SubjectScoreBin.objects.filter(subject_id=subject_id, bin=index).update(count=F("count") + delta)
+
+
+def move_score(subject_id, old_mean, new_mean):
+    """
+    Move one student between bins after their mean changed. `old_mean` is
+    None for a student's first attempt, `new_mean` None when removed.
+    """
+    old = None if old_mean is None else score_bin(old_mean)
+    new = None if new_mean is None else score_bin(new_mean)
+    if old == new:
+        return
+    if old is not None:
+        _add(subject_id, old, -1)
+    if new is not None:
+        _add(subject_id, new, 1)
+
+
+def rebuild_leaderboards(batch_size=1000):
+    """Recount every subject histogram from completed Quiz history."""
+    counts = {}
+    rows = (
+        Quiz.objects.filter(status="completed")
+        .values("subject_id", "student_id")
+        .annotate(attempts=Count("id"), score_sum=Sum("score"))
+    )
+    # Same mean as SubjectProgress: ungraded scores count as 0
+    for row in rows.iterator(chunk_size=batch_size):
+        key = (row["subject_id"], score_bin((row["score_sum"] or 0.0) / row["attempts"]))
+        counts[key] = counts.get(key, 0) + 1
+
+    with transaction.atomic():
+        SubjectScoreBin.objects.all().delete()
+        SubjectScoreBin.objects.bulk_create(
+            [SubjectScoreBin(subject_id=subject_id, bin=index, count=count)
+             for (subject_id, index), count in counts.items()],
+            batch_size=batch_size,
+        )
+    return len(counts)
+
+
+# -----------------------------
+# Read side
+# -----------------------------
+
+def percentile_rank(student, subject_id):
+    """
+    The student's standing in a subject, or None before their first attempt.
+    Bins below the student's are summed from the histogram (at most
+    LEADERBOARD_BINS rows); only their own bin is counted exactly, through
+    the (subject, -mean_score) index.
+    """
+    mean = (
+        SubjectProgress.objects.filter(student=student, subject_id=subject_id, attempts__gt=0)
+        .values_list("mean_score", flat=True).first()
+    )
+    if mean is None:
+        return None
+
+    index = score_bin(mean)
+    histogram = SubjectScoreBin.objects.filter(subject_id=subject_id).aggregate(
+        total=Sum("count"), below=Sum("count", filter=Q(bin__lt=index)),
+    )
+    low, _ = _bin_range(index)
+    in_bin = SubjectProgress.objects.filter(
+        subject_id=subject_id, attempts__gt=0, mean_score__gte=low, mean_score__lte=mean,
+    ).aggregate(below=Count("id", filter=Q(mean_score__lt=mean)), tied=Count("id", filter=Q(mean_score=mean)))
+
+    total = histogram["total"] or 1
+    below = (histogram["below"] or 0) + in_bin["below"]
+    return {
+        "subject_id": subject_id,
+        "mean_score": round(mean, 1),
+        "rank": total - below - in_bin["tied"] + 1,
+        "students": total,
+        "percentile": round(100 * (below + 0.5 * in_bin["tied"]) / total, 1),
+    }
+
+
+def top_students(subject_id, limit=10, viewer=None) -> list:
+    """
+    The top of a subject's leaderboard. Other students stay anonymous: each
+    entry only says whether it is `viewer`.
+    """
+    rows = (
+        SubjectProgress.objects.filter(subject_id=subject_id, attempts__gt=0)
+        .order_by("-mean_score", "id")
+        .values("student_id", "mean_score", "attempts")[:limit]
+    )
+    return [
+        {
+            "rank": position,
+            "mean_score": round(row["mean_score"], 1),
+            "attempts": row["attempts"],
+            "is_you": viewer is not None and row["student_id"] == viewer.id,
+        }
+        for position, row in enumerate(rows, 1)
+    ]
@@ -0,0 +1,197 @@
+"""
+Catalog link health. URLs are checked concurrently with httpx on asyncio,
+at most LINK_CHECK_PER_HOST requests in flight per host and at least
+LINK_CHECK_HOST_INTERVAL seconds between request starts to one host.
+Results are cached on Resource for LINK_CHECK_TTL (LINK_CHECK_RETRY_AFTER
+for failing links). Pass an httpx `transport` to check against a local
+stand-in instead of the network.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Resource
+
+# Missing for good; anything else failing only turns dead after repeated checks
+GONE_STATUSES = {404, 410}
+# The server answered but refuses automated clients; the page exists
+RESTRICTED_STATUSES = {401, 403, 429}
+# HEAD not supported, retry with GET
+HEAD_UNSUPPORTED = {405, 501}
+
+
+@dataclass
+class LinkResult:
+    url: str
+    status_code: Optional[int] = None
+    final_url: str = ""
+    error: str = ""
+
+
+class HostThrottle:
+    """
+    Per-host concurrency cap plus a minimum spacing between request starts.
+    One throttle can be reused across event loops (one per batch); the
+    spacing carries over since loop.time() is the monotonic clock.
+    """
+
+    def __init__(self, per_host, interval):
+        self.per_host = per_host
+        self.interval = interval
+        self._loop = None
+        self._slots = {}
+        self._locks = {}
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, host):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # asyncio primitives are bound to the loop they were first used on
+            self._loop, self._slots, self._locks = loop, {}, {}
+        async with self._slots.setdefault(host, asyncio.Semaphore(self.per_host)):
+            async with self._locks.setdefault(host, asyncio.Lock()):
+                wait = self._next_start.get(host, 0.0) - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[host] = loop.time() + self.interval
+            yield
+
+
+# -----------------------------
+# Checking
+# -----------------------------
+
+async def check_url(client, throttle, url) -> LinkResult:
+    # Any failure is this URL's result; one malformed catalog entry must not sink its batch
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError as e:
+        return LinkResult(url, error=type(e).__name__)
+    async with throttle.slot(host):
+        try:
+            response = await client.head(url)
+            if response.status_code in HEAD_UNSUPPORTED:
+                # Stream so only the headers are read
+                async with client.stream("GET", url) as response:
+                    pass
+        except Exception as e:
+            return LinkResult(url, error=type(e).__name__)
+    final_url = str(response.url)
+    return LinkResult(url, response.status_code, final_url if final_url != url else "")
+
+
+def default_throttle():
+    return HostThrottle(settings.LINK_CHECK_PER_HOST, settings.LINK_CHECK_HOST_INTERVAL)
+
+
+async def check_urls(urls, transport=None, throttle=None) -> dict:
+    """{url: LinkResult} for every URL, checked concurrently under the global and per-host limits."""
+    throttle = throttle or default_throttle()
+    limit = asyncio.Semaphore(settings.LINK_CHECK_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        follow_redirects=True,
+        timeout=settings.LINK_CHECK_TIMEOUT,
+        headers={"User-Agent": settings.LINK_CHECK_USER_AGENT},
+    ) as client:
+        async def bounded(url):
+            async with limit:
+                return await check_url(client, throttle, url)
+
+        results = await asyncio.gather(*(bounded(url) for url in urls), return_exceptions=True)
+    return {
+        url: result if isinstance(result, LinkResult) else LinkResult(url, error=type(result).__name__)
+        for url, result in zip(urls, results)
+    }
+
+
+def classify(result, failures):
+    """(link_status, link_failures) for a result, given the failures before it."""
+    code = result.status_code
+    if code is not None and (code < 400 or code in RESTRICTED_STATUSES):
+        return ("redirected" if result.final_url else "ok"), 0
+    if code in GONE_STATUSES:
+        return "dead", failures + 1
+    failures += 1
+    return ("dead" if failures >= settings.LINK_CHECK_MAX_FAILURES else "broken"), failures
+
+
+# -----------------------------
+# Catalog runs
+# -----------------------------
+
+def due_resources(now=None):
+    """Resources never checked, or whose cached result is older than its TTL."""
+    now = now or timezone.now()
+    return Resource.objects.filter(
+        Q(link_checked_at__isnull=True)
+        | Q(link_status__in=("ok", "redirected"), link_checked_at__lt=now - timedelta(seconds=settings.LINK_CHECK_TTL))
+        | Q(link_status__in=("unchecked", "broken", "dead"),
+            link_checked_at__lt=now - timedelta(seconds=settings.LINK_CHECK_RETRY_AFTER))
+    )
+
+
+def check_batch(rows, transport=None, throttle=None) -> dict:
+    """
+    Check one batch of {"id", "url", "link_failures"} rows and store the
+    results. Duplicate URLs are requested once. Returns counts per status.
+    """
+    results = asyncio.run(check_urls(list({row["url"] for row in rows}), transport=transport, throttle=throttle))
+    now = timezone.now()
+
+    updated = []
+    counts = {}
+    for row in rows:
+        result = results[row["url"]]
+        status, failures = classify(result, row["link_failures"])
+        counts[status] = counts.get(status, 0) + 1
+        updated.append(Resource(
+            id=row["id"],
+            link_status=status,
+            link_status_code=result.status_code,
+            final_url=result.final_url[:2000],
+            link_failures=failures,
+            link_checked_at=now,
+        ))
+    Resource.objects.bulk_update(
+        updated, ["link_status", "link_status_code", "final_url", "link_failures", "link_checked_at"], batch_size=1000
+    )
+    return counts
+
+
+def run_link_check(limit=None, batch_size=500, force=False, transport=None, on_batch=None) -> dict:
+    """
+    Check due resources (all of them with `force`), oldest results first, in
+    batches so progress is saved as it goes. Returns counts per status.
+    """
+    throttle = default_throttle()
+    totals = {}
+    checked = 0
+    last_id = 0
+    while limit is None or checked < limit:
+        size = batch_size if limit is None else min(batch_size, limit - checked)
+        if force:
+            page = Resource.objects.filter(id__gt=last_id).order_by("id")
+        else:
+            # Checked rows stop being due, so each pass picks up the next ones
+            page = due_resources().order_by(F("link_checked_at").asc(nulls_first=True), "id")
+        rows = list(page.values("id", "url", "link_failures")[:size])
+        if not rows:
+            break
+        for status, count in check_batch(rows, transport, throttle).items():
+            totals[status] = totals.get(status, 0) + count
+        checked += len(rows)
+        last_id = rows[-1]["id"]
+        if on_batch:
+            on_batch(checked, totals)
+    return totals
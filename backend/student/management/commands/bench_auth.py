@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from student.authentication import CachedJWTAuthentication, invalidate_cached_user
+from student.models import Student
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request JWT authentication: queries and time per request, stock vs cached."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        n = options["requests"]
+        # Everything runs in a transaction that is rolled back at the end.
+        with transaction.atomic():
+            student = Student.objects.create_user(email="bench-auth@example.com", password=None)
+            header = f"Bearer {AccessToken.for_user(student)}"
+            request = APIRequestFactory().get("/student/profile/", HTTP_AUTHORIZATION=header)
+
+            invalidate_cached_user(student.pk)
+            for auth_class in (JWTAuthentication, CachedJWTAuthentication):
+                self._run(auth_class(), request, n)
+
+            invalidate_cached_user(student.pk)
+            transaction.set_rollback(True)
+
+    def _run(self, authenticator, request, n):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(n):
+                authenticator.authenticate(request)
+            elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{type(authenticator).__name__:<26} {n} requests: "
+            f"{len(queries)} queries ({len(queries) / n:.3f}/request), "
+            f"{elapsed / n * 1e6:.0f} us/request"
+        )
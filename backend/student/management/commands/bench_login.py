@@ -0,0 +1,67 @@
+import asyncio
+import os
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from student.models import Student
+from student.passwords import aauthenticate_student
+
+PASSWORD = "bench-login-password"
+
+
+class Command(BaseCommand):
+    help = "Benchmark sustained login throughput: blocking authenticate() vs the async hashing pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--logins", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=settings.PASSWORD_HASH_MAX_PENDING,
+                            help="Concurrent async logins (default: PASSWORD_HASH_MAX_PENDING).")
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back at the end.
+        with transaction.atomic():
+            encoded = make_password(PASSWORD)
+            users = Student.objects.bulk_create(
+                Student(email=f"bench-login-{i}@example.com", password=encoded)
+                for i in range(options["users"])
+            )
+            emails = [user.email for user in users]
+
+            sequential = min(options["logins"], 50)
+            started = time.perf_counter()
+            for i in range(sequential):
+                authenticate(email=emails[i % len(emails)], password=PASSWORD)
+            self._report("authenticate() (blocking)", sequential, time.perf_counter() - started, 1)
+
+            started = time.perf_counter()
+            async_to_sync(self._storm)(emails, options["logins"], options["concurrency"])
+            workers = min(settings.PASSWORD_HASH_WORKERS, os.cpu_count() or 1)
+            self._report("aauthenticate_student (pool)", options["logins"], time.perf_counter() - started, workers)
+
+            transaction.set_rollback(True)
+
+    async def _storm(self, emails, logins, concurrency):
+        gate = asyncio.Semaphore(concurrency)
+
+        async def login(i):
+            async with gate:
+                return await aauthenticate_student(emails[i % len(emails)], PASSWORD)
+
+        results = await asyncio.gather(*(login(i) for i in range(logins)))
+        failed = sum(1 for user in results if user is None)
+        if failed:
+            self.stderr.write(f"{failed} logins failed")
+
+    def _report(self, label, logins, elapsed, cores):
+        rate = logins / elapsed
+        self.stdout.write(
+            f"{label:<30} {logins} logins in {elapsed:.2f}s: "
+            f"{rate:.1f} logins/s, {rate / cores:.1f} logins/s per core ({cores} cores)"
+        )
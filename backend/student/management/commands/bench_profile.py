@@ -0,0 +1,88 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from student.models import (
+    LearningGoal, Question, Quiz, Resource, Student, StudentInfo,
+    StudentResourceLog, StudentSubject, Subject,
+)
+from student.projections import build_student_profile
+from student.serializers import FullStudentDataSerializer
+
+
+def serializer_profile(student):
+    # What StudentProfileView did before the projection fast path.
+    info = StudentInfo.objects.filter(student=student).first()
+    subjects = StudentSubject.objects.filter(student=student)
+    goals = LearningGoal.objects.filter(student=student)
+    resource_logs = StudentResourceLog.objects.filter(student=student)
+    if not info and not subjects.exists() and not goals.exists() and not resource_logs.exists():
+        return None
+    return FullStudentDataSerializer(student, context={
+        "info": info, "subjects": subjects, "goals": goals, "resource_logs": resource_logs,
+    }).data
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark the full student profile: nested serializers vs values() projection."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subjects", type=int, default=10)
+        parser.add_argument("--quizzes", type=int, default=300)
+        parser.add_argument("--logs", type=int, default=500)
+        parser.add_argument("--goals", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        # Everything runs in a transaction that is rolled back at the end.
+        with transaction.atomic():
+            student = self._seed(options)
+            for label, build in (("FullStudentDataSerializer", serializer_profile),
+                                 ("build_student_profile", build_student_profile)):
+                build(student)  # warm up
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(options["repeat"]):
+                        build(student)
+                    elapsed = (time.perf_counter() - started) / options["repeat"]
+                self.stdout.write(
+                    f"{label:<26} {elapsed * 1000:8.2f} ms/profile, "
+                    f"{len(queries) // options['repeat']} queries/profile"
+                )
+            transaction.set_rollback(True)
+
+    def _seed(self, options):
+        student = Student.objects.create_user(email="bench-profile@example.com", password=None)
+        StudentInfo.objects.create(student=student, full_name="Bench Student", age=20, gender="x",
+                                   preferred_learning_style="visual")
+        subjects = [Subject.objects.create(name=f"bench-subject-{i}") for i in range(options["subjects"])]
+        StudentSubject.objects.bulk_create(
+            StudentSubject(student=student, subject=s, preferred_style="visual",
+                           favorite_topics={"loops": "fun"}, weak_topics={"recursion": "hard"})
+            for s in subjects
+        )
+        quizzes = Quiz.objects.bulk_create(
+            Quiz(student=student, subject=subjects[i % len(subjects)], total_marks=10, score=70.0,
+                 status="completed", ai_feedback="Good work")
+            for i in range(options["quizzes"])
+        )
+        Question.objects.bulk_create(
+            Question(quiz=q, question_text="?", options={"A": "a", "B": "b"}, correct_option="A")
+            for q in quizzes for _ in range(5)
+        )
+        LearningGoal.objects.bulk_create(
+            LearningGoal(student=student, goal_text=f"goal {i}", subject=subjects[i % len(subjects)])
+            for i in range(options["goals"])
+        )
+        resources = Resource.objects.bulk_create(
+            Resource(topic_name=f"topic {i}", subject=subjects[i % len(subjects)],
+                     url="https://example.com", type="article")
+            for i in range(50)
+        )
+        StudentResourceLog.objects.bulk_create(
+            StudentResourceLog(student=student, resource=resources[i % len(resources)], feedback="useful")
+            for i in range(options["logs"])
+        )
+        return student
@@ -0,0 +1,105 @@
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from student.importers import LOADERS, RowError, SubjectResolver, iter_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream students, subjects or resources from a CSV/JSONL file into the database "
+        "in chunked transactions, with resumable progress and a per-row error report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(LOADERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"],
+                            help="Input format (default: from the file extension).")
+        parser.add_argument("--chunk-size", type=int, default=5000,
+                            help="Rows per transaction (default: 5000).")
+        parser.add_argument("--copy", action="store_true",
+                            help="Insert with PostgreSQL COPY instead of bulk INSERTs.")
+        parser.add_argument("--resume", action="store_true",
+                            help="Skip the rows committed by a previous run (from <path>.progress).")
+        parser.add_argument("--errors", help="Error report CSV (default: <path>.errors.csv).")
+        parser.add_argument("--hash-workers", type=int, default=0,
+                            help="Processes used to hash plain-text passwords (default: hash inline).")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist")
+        fmt = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        use_copy = options["copy"]
+        if use_copy and connection.vendor != "postgresql":
+            raise CommandError("--copy requires PostgreSQL")
+
+        progress_path = f"{path}.progress"
+        errors_path = options["errors"] or f"{path}.errors.csv"
+        done = self._read_progress(progress_path) if options["resume"] else 0
+
+        loader = LOADERS[options["kind"]]
+        resolver = SubjectResolver()
+        hash_pool = None
+        if options["hash_workers"]:
+            hash_pool = ProcessPoolExecutor(options["hash_workers"], mp_context=multiprocessing.get_context("fork"))
+
+        rows = itertools.islice(iter_rows(path, fmt), done, None)
+        loaded = failed = 0
+        started = time.perf_counter()
+
+        with open(errors_path, "a" if options["resume"] else "w", newline="") as errors_file:
+            report = csv.writer(errors_file)
+            if errors_file.tell() == 0:
+                report.writerow(["line", "error"])
+
+            try:
+                while True:
+                    chunk = list(itertools.islice(rows, options["chunk_size"]))
+                    if not chunk:
+                        break
+
+                    errors = [(line, str(row)) for line, row in chunk if isinstance(row, RowError)]
+                    good = [(line, row) for line, row in chunk if not isinstance(row, RowError)]
+                    with transaction.atomic():
+                        count, row_errors = loader(good, resolver, use_copy=use_copy, hash_pool=hash_pool)
+
+                    errors.extend(row_errors)
+                    report.writerows(sorted(errors))
+                    errors_file.flush()
+
+                    loaded += count
+                    failed += len(errors)
+                    done += len(chunk)
+                    self._write_progress(progress_path, done)
+
+                    rate = loaded / (time.perf_counter() - started)
+                    self.stdout.write(f"{done} rows read, {loaded} loaded, {failed} errors ({rate:.0f} rows/s)")
+            finally:
+                if hash_pool:
+                    hash_pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {loaded} {options['kind']} in {time.perf_counter() - started:.1f}s; "
+            f"{failed} rows rejected (see {errors_path})"
+        ))
+
+    def _read_progress(self, progress_path):
+        if not os.path.exists(progress_path):
+            return 0
+        with open(progress_path) as f:
+            return json.load(f)["rows_done"]
+
+    def _write_progress(self, progress_path, done):
+        tmp_path = f"{progress_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"rows_done": done}, f)
+        os.replace(tmp_path, progress_path)
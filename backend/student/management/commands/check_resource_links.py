@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from student.link_checker import run_link_check
+
+
+class Command(BaseCommand):
+    help = (
+        "Check catalog resource URLs whose cached link status is missing or expired, "
+        "and mark dead links so they are hidden from listings and recommendations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Check at most this many resources")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--force", action="store_true", help="Recheck every resource, ignoring cached results")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        def progress(checked, totals):
+            self.stdout.write(f"{checked} checked ({time.perf_counter() - started:.1f}s)")
+
+        totals = run_link_check(
+            limit=options["limit"],
+            batch_size=options["batch_size"],
+            force=options["force"],
+            on_batch=progress,
+        )
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(totals.items())) or "nothing due"
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked links in {time.perf_counter() - started:.1f}s: {summary}"
+        ))
@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from student.export import iter_ndjson, iter_student_history
+from student.models import Student
+
+
+class Command(BaseCommand):
+    help = "Stream a student's complete history as NDJSON to a file or stdout."
+
+    def add_arguments(self, parser):
+        parser.add_argument("email")
+        parser.add_argument("--output", help="File to write (default: stdout).")
+
+    def handle(self, *args, **options):
+        try:
+            student = Student.objects.get(email=options["email"])
+        except Student.DoesNotExist:
+            raise CommandError(f"No student with email {options['email']!r}")
+
+        out = open(options["output"], "wb") if options["output"] else sys.stdout.buffer
+        try:
+            for chunk in iter_ndjson(iter_student_history(student)):
+                out.write(chunk)
+        finally:
+            if options["output"]:
+                out.close()
@@ -0,0 +1,30 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config.docs import build_schema
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema artifact served by /openapi.json when OPENAPI_USE_ARTIFACT is set (run at build time)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.OPENAPI_SCHEMA_PATH,
+                            help="Destination file (default: OPENAPI_SCHEMA_PATH).")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        body = build_schema()
+
+        path = options["output"]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(body)} bytes to {path} in {time.perf_counter() - started:.1f}s"
+        ))
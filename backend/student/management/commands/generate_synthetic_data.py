@@ -0,0 +1,89 @@
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from student.synthetic import DEFAULT_PROFILE, build_catalog, generate_shard
+
+
+def _run_shard(seed, shard, first_index, count, profile, catalog, now):
+    # Each forked worker opens its own connection and commits its shard atomically
+    connections.close_all()
+    try:
+        with transaction.atomic():
+            return shard, generate_shard(seed, shard, first_index, count, profile, catalog, now)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a reproducible synthetic population (students, quizzes, questions, resource logs, "
+        "learning plans, agent logs) with PostgreSQL COPY in parallel worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0,
+                            help="Same seed, --shard-size and --as-of reproduce the same data (default: 0).")
+        parser.add_argument("--as-of", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                            help="Last day of the generated history, YYYY-MM-DD (default: today).")
+        parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+        parser.add_argument("--shard-size", type=int, default=5_000,
+                            help="Students per worker transaction (default: 5000).")
+        parser.add_argument("--profile", help="JSON file overriding keys of the default distribution profile.")
+        parser.add_argument("--skip-rollups", action="store_true",
+                            help="Do not rebuild progress rollups, leaderboards and item statistics afterwards.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("generate_synthetic_data requires PostgreSQL")
+
+        profile = dict(DEFAULT_PROFILE)
+        if options["profile"]:
+            with open(options["profile"]) as f:
+                profile.update(json.load(f))
+
+        seed, total, shard_size = options["seed"], options["students"], options["shard_size"]
+        as_of = options["as_of"] or datetime.now(dt_timezone.utc).date()
+        now = datetime.combine(as_of, dt_time.min, tzinfo=dt_timezone.utc)
+        started = time.perf_counter()
+        catalog = build_catalog(seed, profile)
+        self.stdout.write(f"Catalog ready: {len(catalog['subject_ids'])} subjects, "
+                          f"{sum(len(v) for v in catalog['questions'].values())} bank questions")
+
+        shards = [(shard, first, min(shard_size, total - first))
+                  for shard, first in enumerate(range(0, total, shard_size))]
+        totals = {}
+        connections.close_all()
+        with ProcessPoolExecutor(options["workers"], mp_context=multiprocessing.get_context("fork")) as pool:
+            futures = [pool.submit(_run_shard, seed, shard, first, count, profile, catalog, now)
+                       for shard, first, count in shards]
+            for done, future in enumerate(as_completed(futures), 1):
+                shard, written = future.result()
+                for name, count in written.items():
+                    totals[name] = totals.get(name, 0) + count
+                rows = sum(totals.values())
+                self.stdout.write(f"shard {shard} done ({done}/{len(shards)}), "
+                                  f"{rows} rows ({rows / (time.perf_counter() - started):.0f} rows/s)")
+
+        if not options["skip_rollups"]:
+            from student.item_analysis import rebuild_item_stats
+            from student.progress import rebuild_progress
+
+            self.stdout.write("Rebuilding progress rollups, leaderboards and item statistics...")
+            rebuild_progress()
+            rebuild_item_stats()
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        for name, count in sorted(totals.items()):
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {total} students in {time.perf_counter() - started:.1f}s"
+        ))
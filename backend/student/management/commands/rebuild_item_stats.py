@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from student.item_analysis import rebuild_item_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute per-question difficulty, discrimination and distractor statistics from answer history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Quizzes loaded per batch (default: 5000).")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_item_stats(batch_size=options["batch_size"])
+        self.stdout.write(f"Rebuilt statistics for {count} questions in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from student.leaderboard import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = "Recount the per-subject score histograms behind leaderboards and percentile ranks from quiz history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        bins = rebuild_leaderboards(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {bins} score bins in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from student.models import Student
+from student.progress import rebuild_progress
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-student, per-subject progress rollups from quiz history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--student", action="append",
+                            help="Only rebuild this student's rollups (email, repeatable).")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        student_ids = None
+        if options["student"]:
+            student_ids = list(
+                Student.objects.filter(email__in=options["student"]).values_list("id", flat=True)
+            )
+
+        started = time.perf_counter()
+        rebuild_progress(student_ids, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Progress rollups rebuilt in {time.perf_counter() - started:.1f}s"
+        ))
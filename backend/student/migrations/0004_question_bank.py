@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-19 10:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0003_quiz_topic_progress_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=100)),
+                ('level', models.CharField(choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], max_length=20)),
+                ('question_text', models.TextField()),
+                ('options', models.JSONField()),
+                ('correct_option', models.CharField(max_length=255)),
+                ('content_hash', models.CharField(max_length=40)),
+                ('usage_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bank_questions', to='student.subject')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='bank_question',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uses', to='student.bankquestion'),
+        ),
+        migrations.AddIndex(
+            model_name='bankquestion',
+            index=models.Index(fields=['subject', 'topic', 'level', 'usage_count'], name='student_ban_subject_31b174_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='bankquestion',
+            constraint=models.UniqueConstraint(fields=('subject', 'topic', 'level', 'content_hash'), name='unique_bank_question'),
+        ),
+    ]
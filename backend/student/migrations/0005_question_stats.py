@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 10:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0004_question_bank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('bank_question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='student.bankquestion')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('scored_attempts', models.PositiveIntegerField(default=0)),
+                ('scored_correct', models.PositiveIntegerField(default=0)),
+                ('rest_sum', models.FloatField(default=0)),
+                ('rest_sq_sum', models.FloatField(default=0)),
+                ('rest_correct_sum', models.FloatField(default=0)),
+                ('answer_counts', models.JSONField(default=dict)),
+                ('difficulty', models.FloatField(blank=True, null=True)),
+                ('discrimination', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 10:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0005_question_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubjectScoreBin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bin', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='subjectprogress',
+            index=models.Index(fields=['subject', '-mean_score'], name='progress_subject_score_idx'),
+        ),
+        migrations.AddField(
+            model_name='subjectscorebin',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_bins', to='student.subject'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subjectscorebin',
+            unique_together={('subject', 'bin')},
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-19 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0006_subject_leaderboards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='final_url',
+            field=models.URLField(blank=True, max_length=2000),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_checked_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_failures',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_status',
+            field=models.CharField(choices=[('unchecked', 'Unchecked'), ('ok', 'OK'), ('redirected', 'Redirected'), ('broken', 'Broken'), ('dead', 'Dead')], db_index=True, default='unchecked', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='link_status_code',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -104,6 +104,7 @@ class StudentSubject(models.Model):
 class Quiz(models.Model):
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="quizzes")
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    topic = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     total_marks = models.PositiveIntegerField()
     score = models.FloatField(null=True, blank=True)
@@ -116,12 +117,53 @@ class Quiz(models.Model):
         return f"Quiz {self.id} - {self.student.email} - {self.subject.name}"
 
 
+# -----------------------------
+# Question Bank
+# -----------------------------
+
+class BankQuestion(models.Model):
+    """
+    Shared, reusable question keyed by subject, topic and level. Quizzes are
+    assembled from the bank; `content_hash` (normalized question text) keeps
+    the same question from being stored twice under one key.
+    """
+    LEVEL_CHOICES = [
+        ("beginner", "Beginner"),
+        ("intermediate", "Intermediate"),
+        ("advanced", "Advanced"),
+    ]
+
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="bank_questions")
+    topic = models.CharField(max_length=100)  # normalized, see ai.utils.question_bank.normalize_topic
+    level = models.CharField(max_length=20, choices=LEVEL_CHOICES)
+    question_text = models.TextField()
+    options = models.JSONField()  # {"A": "...", "B": "...", ...}
+    correct_option = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=40)
+    usage_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subject", "topic", "level", "content_hash"], name="unique_bank_question"
+            ),
+        ]
+        indexes = [models.Index(fields=["subject", "topic", "level", "usage_count"])]
+
+    def __str__(self):
+        return f"{self.subject.name} / {self.topic} / {self.level}: {self.question_text[:50]}"
+
+
 # -----------------------------
 # Question
 # -----------------------------
 
 class Question(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="questions")
+    bank_question = models.ForeignKey(
+        BankQuestion, on_delete=models.SET_NULL, null=True, blank=True, related_name="uses"
+    )
     question_text = models.TextField()
     options = models.JSONField()  # {"A": "...", "B": "...", ...}
     correct_option = models.CharField(max_length=255)
@@ -159,11 +201,31 @@ class Resource(models.Model):
         ("notes", "Notes"),
     ]
 
+    # Maintained by student.link_checker; "dead" resources are hidden from
+    # listings and recommendations.
+    LINK_STATUS_CHOICES = [
+        ("unchecked", "Unchecked"),
+        ("ok", "OK"),
+        ("redirected", "Redirected"),
+        ("broken", "Broken"),
+        ("dead", "Dead"),
+    ]
+
     topic_name = models.CharField(max_length=100)
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
     url = models.URLField()
     type = models.CharField(max_length=50, choices=RESOURCE_TYPE_CHOICES)
     description = models.TextField(blank=True)
+    link_status = models.CharField(max_length=10, choices=LINK_STATUS_CHOICES, default="unchecked", db_index=True)
+    link_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    final_url = models.URLField(max_length=2000, blank=True)  # redirect target, when redirected
+    link_failures = models.PositiveSmallIntegerField(default=0)
+    link_checked_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def live_url(self):
+        return self.final_url or self.url
 
     def __str__(self):
         return f"{self.topic_name} [{self.type}]"
@@ -180,4 +242,106 @@ class StudentResourceLog(models.Model):
     feedback = models.TextField(blank=True)
 
     def __str__(self):
-        return f"{self.student.email} -> {self.resource.topic_name}"
\ No newline at end of file
+        return f"{self.student.email} -> {self.resource.topic_name}"
+
+
+# -----------------------------
+# Progress rollups (maintained by student.progress)
+# -----------------------------
+
+class SubjectProgress(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="progress")
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    attempts = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    mean_score = models.FloatField(default=0)
+    last_score = models.FloatField(null=True, blank=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    questions_answered = models.PositiveIntegerField(default=0)
+    questions_correct = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("student", "subject")
+        indexes = [
+            models.Index(fields=["subject", "-mean_score"], name="progress_subject_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student.email} - {self.subject.name} ({self.attempts} attempts)"
+
+
+class SubjectScoreBin(models.Model):
+    """
+    Histogram of SubjectProgress.mean_score per subject: how many students'
+    mean score falls in each of LEADERBOARD_BINS equal-width bins. Kept in
+    step by record_quiz_results; rebuild with `rebuild_leaderboards`.
+    """
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="score_bins")
+    bin = models.PositiveSmallIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("subject", "bin")
+
+    def __str__(self):
+        return f"{self.subject.name} bin {self.bin}: {self.count}"
+
+
+class TopicProgress(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="topic_progress")
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    topic = models.CharField(max_length=100)
+    attempts = models.PositiveIntegerField(default=0)
+    questions_answered = models.PositiveIntegerField(default=0)
+    questions_correct = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("student", "subject", "topic")
+
+    def __str__(self):
+        return f"{self.student.email} - {self.subject.name} / {self.topic}"
+
+
+class WeeklyProgress(models.Model):
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="weekly_progress")
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    week_start = models.DateField()
+    attempts = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ("student", "subject", "week_start")
+
+    def __str__(self):
+        return f"{self.student.email} - {self.subject.name} week of {self.week_start}"
+
+# -----------------------------
+# Item analysis (maintained by student.item_analysis)
+# -----------------------------
+
+class QuestionStats(models.Model):
+    """
+    Per bank question answer statistics. The raw columns are additive
+    sufficient statistics, so new evaluations are folded in without
+    rereading history; `difficulty` and `discrimination` are derived from them.
+    """
+    bank_question = models.OneToOneField(
+        BankQuestion, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    # Rest score = the student's accuracy on the other questions of the same
+    # quiz; only attempts in quizzes with 2+ questions have one.
+    scored_attempts = models.PositiveIntegerField(default=0)
+    scored_correct = models.PositiveIntegerField(default=0)
+    rest_sum = models.FloatField(default=0)
+    rest_sq_sum = models.FloatField(default=0)
+    rest_correct_sum = models.FloatField(default=0)
+    answer_counts = models.JSONField(default=dict)  # {"A": 12, "B": 3, "": 1}
+
+    difficulty = models.FloatField(null=True, blank=True)  # share answered correctly (p-value)
+    discrimination = models.FloatField(null=True, blank=True)  # point-biserial vs rest score
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for bank question {self.bank_question_id} (p={self.difficulty}, r={self.discrimination})"
@@ -0,0 +1,99 @@
+import asyncio
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import load_backend
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+from django.contrib.auth.signals import user_login_failed
+from django.core.exceptions import PermissionDenied
+
+from .models import Student
+
+# Password hashing runs on its own bounded pool so a slow KDF never holds the
+# event loop or Django's shared sync thread. hashlib's KDFs release the GIL,
+# so the pool scales with cores.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class HashingOverloaded(Exception):
+    pass
+
+
+async def run_hasher(func, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HashingOverloaded("Too many logins in progress, please retry shortly.")
+        _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+async def hash_password(raw_password: str) -> str:
+    return await run_hasher(make_password, raw_password)
+
+
+async def _check_model_password(email: str, password: str):
+    user = await Student.objects.filter(email=email).afirst()
+    if user is None:
+        # Keep the response time of unknown emails close to that of wrong passwords.
+        await hash_password(password)
+        return None
+
+    is_correct, must_update = await run_hasher(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+
+    if must_update:
+        user.password = await hash_password(password)
+        await user.asave(update_fields=["password"])
+    return user
+
+
+async def aauthenticate_student(email: str, password: str, request=None):
+    """
+    Async equivalent of django.contrib.auth.authenticate for email/password
+    logins. AUTHENTICATION_BACKENDS are tried in order. ModelBackend and its
+    subclasses (allauth's included) all check Student.password, so that check
+    runs once, with the hashing on the bounded pool; any other backend is
+    asked through its aauthenticate. Like authenticate, a failed login sends
+    user_login_failed. Hashes made with outdated hasher parameters are
+    transparently re-hashed with the current ones after a successful login.
+    """
+    credentials = {"email": email, "password": password}
+    checked_password = False
+    user = None
+    try:
+        for backend_path in settings.AUTHENTICATION_BACKENDS:
+            backend = load_backend(backend_path)
+            if isinstance(backend, ModelBackend):
+                if checked_password:
+                    continue
+                checked_password = True
+                user = await _check_model_password(email, password)
+            else:
+                try:
+                    inspect.signature(backend.authenticate).bind(request, **credentials)
+                except TypeError:
+                    continue  # This backend doesn't accept these credentials
+                user = await backend.aauthenticate(request, **credentials)
+            if user is not None:
+                user.backend = backend_path
+                return user
+    except PermissionDenied:
+        pass  # A backend vetoed the login; stop trying the rest
+
+    await user_login_failed.asend(
+        sender=__name__, credentials={"email": email, "password": "********************"}, request=request
+    )
+    return None
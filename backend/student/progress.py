@@ -0,0 +1,244 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .item_analysis import record_item_results
+from .leaderboard import move_score, rebuild_leaderboards
+from .models import Question, Quiz, SubjectProgress, TopicProgress, WeeklyProgress
+
+TREND_WEEKS = 8
+
+
+def _week_start(moment):
+    day = moment.date()
+    return day - timedelta(days=day.weekday())
+
+
+def _question_counts(quiz_ids):
+    return {
+        row["quiz_id"]: row
+        for row in Question.objects.filter(quiz_id__in=quiz_ids, is_correct__isnull=False)
+        .values("quiz_id")
+        .annotate(answered=Count("id"), correct=Count("id", filter=Q(is_correct=True)))
+    }
+
+
+# -----------------------------
+# Incremental updates
+# -----------------------------
+
+def record_quiz_results(quiz_ids):
+    """
+    Fold freshly evaluated quizzes into the rollup tables, the subject score
+    histograms and the per-question item statistics. Call exactly once per
+    quiz, when it moves from pending to completed.
+    """
+    quizzes = list(
+        Quiz.objects.filter(id__in=quiz_ids, status="completed")
+        .values("id", "student_id", "subject_id", "topic", "score", "created_at")
+        .order_by("created_at")
+    )
+    counts = _question_counts([q["id"] for q in quizzes])
+
+    with transaction.atomic():
+        for quiz in quizzes:
+            key = {"student_id": quiz["student_id"], "subject_id": quiz["subject_id"]}
+            score = quiz["score"] or 0.0
+            answered = counts.get(quiz["id"], {}).get("answered", 0)
+            correct = counts.get(quiz["id"], {}).get("correct", 0)
+
+            progress, _ = SubjectProgress.objects.select_for_update().get_or_create(**key)
+            is_latest = Q(last_attempt_at__isnull=True) | Q(last_attempt_at__lte=quiz["created_at"])
+            SubjectProgress.objects.filter(**key).update(
+                attempts=F("attempts") + 1,
+                score_sum=F("score_sum") + score,
+                mean_score=(F("score_sum") + score) / (F("attempts") + 1),
+                # Quizzes can be evaluated out of order; only a newer one moves "last"
+                last_score=Case(When(is_latest, then=Value(score)), default=F("last_score")),
+                last_attempt_at=Case(When(is_latest, then=Value(quiz["created_at"])), default=F("last_attempt_at")),
+                questions_answered=F("questions_answered") + answered,
+                questions_correct=F("questions_correct") + correct,
+            )
+            move_score(
+                quiz["subject_id"],
+                progress.mean_score if progress.attempts else None,
+                (progress.score_sum + score) / (progress.attempts + 1),
+            )
+
+            if quiz["topic"]:
+                topic_key = {**key, "topic": quiz["topic"]}
+                TopicProgress.objects.get_or_create(**topic_key)
+                TopicProgress.objects.filter(**topic_key).update(
+                    attempts=F("attempts") + 1,
+                    questions_answered=F("questions_answered") + answered,
+                    questions_correct=F("questions_correct") + correct,
+                )
+
+            week_key = {**key, "week_start": _week_start(quiz["created_at"])}
+            WeeklyProgress.objects.get_or_create(**week_key)
+            WeeklyProgress.objects.filter(**week_key).update(
+                attempts=F("attempts") + 1,
+                score_sum=F("score_sum") + score,
+            )
+
+    record_item_results([q["id"] for q in quizzes])
+
+
+# -----------------------------
+# Backfill
+# -----------------------------
+
+def rebuild_progress(student_ids=None, batch_size=1000):
+    """
+    Recompute the rollups from Quiz/Question history with grouped queries.
+    The subject score histograms span all students and are always recounted.
+    """
+    quizzes = Quiz.objects.filter(status="completed")
+    questions = Question.objects.filter(quiz__status="completed", is_correct__isnull=False)
+    if student_ids is not None:
+        quizzes = quizzes.filter(student_id__in=student_ids)
+        questions = questions.filter(quiz__student_id__in=student_ids)
+
+    with transaction.atomic():
+        for model in (SubjectProgress, TopicProgress, WeeklyProgress):
+            stale = model.objects.all()
+            if student_ids is not None:
+                stale = stale.filter(student_id__in=student_ids)
+            stale.delete()
+
+        answered = {
+            (row["quiz__student_id"], row["quiz__subject_id"]): row
+            for row in questions.values("quiz__student_id", "quiz__subject_id").annotate(
+                answered=Count("id"), correct=Count("id", filter=Q(is_correct=True))
+            )
+        }
+        latest_score = Quiz.objects.filter(
+            status="completed", student_id=OuterRef("student_id"), subject_id=OuterRef("subject_id")
+        ).order_by("-created_at").values("score")[:1]
+
+        subject_rows = (
+            quizzes.values("student_id", "subject_id")
+            .annotate(
+                attempts=Count("id"),
+                score_sum=Sum("score"),
+                last_attempt_at=Max("created_at"),
+                last_score=Subquery(latest_score),
+            )
+        )
+        _bulk_create(SubjectProgress, (
+            SubjectProgress(
+                student_id=row["student_id"],
+                subject_id=row["subject_id"],
+                attempts=row["attempts"],
+                score_sum=row["score_sum"] or 0.0,
+                mean_score=(row["score_sum"] or 0.0) / row["attempts"],
+                last_score=row["last_score"],
+                last_attempt_at=row["last_attempt_at"],
+                questions_answered=answered.get((row["student_id"], row["subject_id"]), {}).get("answered", 0),
+                questions_correct=answered.get((row["student_id"], row["subject_id"]), {}).get("correct", 0),
+            )
+            for row in subject_rows.iterator()
+        ), batch_size)
+
+        topic_rows = (
+            questions.exclude(quiz__topic="")
+            .values("quiz__student_id", "quiz__subject_id", "quiz__topic")
+            .annotate(
+                attempts=Count("quiz_id", distinct=True),
+                answered=Count("id"),
+                correct=Count("id", filter=Q(is_correct=True)),
+            )
+        )
+        _bulk_create(TopicProgress, (
+            TopicProgress(
+                student_id=row["quiz__student_id"],
+                subject_id=row["quiz__subject_id"],
+                topic=row["quiz__topic"],
+                attempts=row["attempts"],
+                questions_answered=row["answered"],
+                questions_correct=row["correct"],
+            )
+            for row in topic_rows.iterator()
+        ), batch_size)
+
+        weekly_rows = (
+            quizzes.annotate(week=TruncWeek("created_at"))
+            .values("student_id", "subject_id", "week")
+            .annotate(attempts=Count("id"), score_sum=Sum("score"))
+        )
+        _bulk_create(WeeklyProgress, (
+            WeeklyProgress(
+                student_id=row["student_id"],
+                subject_id=row["subject_id"],
+                week_start=row["week"].date(),
+                attempts=row["attempts"],
+                score_sum=row["score_sum"] or 0.0,
+            )
+            for row in weekly_rows.iterator()
+        ), batch_size)
+
+        rebuild_leaderboards(batch_size)
+
+
+def _bulk_create(model, objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+# -----------------------------
+# Read side
+# -----------------------------
+
+def _accuracy(correct, answered):
+    return round(100 * correct / answered, 1) if answered else None
+
+
+def progress_summary(student) -> list:
+    """Compact per-subject stats, read only from the rollup tables."""
+    summary = {}
+    for row in SubjectProgress.objects.filter(student=student).values(
+        "subject_id", "subject__name", "attempts", "mean_score", "last_score",
+        "last_attempt_at", "questions_answered", "questions_correct",
+    ).order_by("subject__name"):
+        summary[row["subject_id"]] = {
+            "subject_id": row["subject_id"],
+            "subject": row["subject__name"],
+            "attempts": row["attempts"],
+            "mean_score": round(row["mean_score"], 1),
+            "last_score": row["last_score"],
+            "last_attempt_at": row["last_attempt_at"],
+            "accuracy": _accuracy(row["questions_correct"], row["questions_answered"]),
+            "topics": {},
+            "weekly_trend": [],
+        }
+
+    for row in TopicProgress.objects.filter(student=student).values(
+        "subject_id", "topic", "attempts", "questions_answered", "questions_correct"
+    ):
+        if row["subject_id"] in summary:
+            summary[row["subject_id"]]["topics"][row["topic"]] = {
+                "attempts": row["attempts"],
+                "accuracy": _accuracy(row["questions_correct"], row["questions_answered"]),
+            }
+
+    first_week = _week_start(timezone.now()) - timedelta(weeks=TREND_WEEKS - 1)
+    for row in WeeklyProgress.objects.filter(student=student, week_start__gte=first_week).values(
+        "subject_id", "week_start", "attempts", "score_sum"
+    ).order_by("week_start"):
+        if row["subject_id"] in summary:
+            summary[row["subject_id"]]["weekly_trend"].append({
+                "week_start": row["week_start"],
+                "attempts": row["attempts"],
+                "mean_score": round(row["score_sum"] / row["attempts"], 1),
+            })
+
+    return list(summary.values())
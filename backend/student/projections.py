@@ -0,0 +1,110 @@
+from rest_framework.fields import DateTimeField
+
+from .models import LearningGoal, Quiz, StudentInfo, StudentResourceLog, StudentSubject
+
+_datetime = DateTimeField()
+
+# What StudentInfoSerializer(None).data renders for a student without info
+EMPTY_INFO = {"full_name": "", "age": None, "gender": "", "preferred_learning_style": None}
+
+
+# ---------------------------
+# Profile sections (values() projections)
+# ---------------------------
+def _info_section(student):
+    return (
+        StudentInfo.objects.filter(student=student)
+        .values("full_name", "age", "gender", "preferred_learning_style", "student")
+        .first()
+    )
+
+
+def _subjects_section(student):
+    return [
+        {
+            "subject": {
+                "id": row["subject"],
+                "name": row["subject__name"],
+                "description": row["subject__description"],
+            },
+            "preferred_style": row["preferred_style"],
+            "favorite_topics": row["favorite_topics"],
+            "weak_topics": row["weak_topics"],
+            "goal": row["goal"],
+            "student": row["student"],
+        }
+        for row in StudentSubject.objects.filter(student=student).values(
+            "student", "subject", "subject__name", "subject__description",
+            "preferred_style", "favorite_topics", "weak_topics", "goal",
+        )
+    ]
+
+
+QUIZ_FIELDS = ("id", "subject__id", "subject__name", "total_marks", "score", "ai_feedback", "status", "created_at")
+
+
+def _quizzes_section(student):
+    return list(Quiz.objects.filter(student=student).values(*QUIZ_FIELDS))
+
+
+def _goals_section(student):
+    return list(LearningGoal.objects.filter(student=student).values("goal_text", "achieved", "student", "subject"))
+
+
+def _resource_logs_section(student):
+    return [
+        {**row, "accessed_at": _datetime.to_representation(row["accessed_at"])}
+        for row in StudentResourceLog.objects.filter(student=student).values(
+            "accessed_at", "feedback", "student", "resource"
+        )
+    ]
+
+
+PROFILE_SECTIONS = {
+    "info": _info_section,
+    "subjects": _subjects_section,
+    "quizzes": _quizzes_section,
+    "goals": _goals_section,
+    "resource_logs": _resource_logs_section,
+}
+
+
+def load_profile_section(student, section):
+    """Reload one section of a built profile, e.g. after that data changed."""
+    value = PROFILE_SECTIONS[section](student)
+    if section == "info" and value is None:
+        return dict(EMPTY_INFO)
+    return value
+
+
+# ---------------------------
+# Full Student Profile
+# ---------------------------
+def build_student_profile(student, require_info=False) -> dict:
+    """
+    Same output as FullStudentDataSerializer, built from five values()
+    queries into plain dicts, with no per-field serializer work. Query count
+    does not depend on how many subjects, quizzes, goals or logs the student
+    has. With `require_info`, a student without onboarding info raises
+    StudentInfo.DoesNotExist, as the agent views expect.
+    """
+    info = _info_section(student)
+    if info is None:
+        if require_info:
+            raise StudentInfo.DoesNotExist("StudentInfo matching query does not exist.")
+        info = dict(EMPTY_INFO)
+
+    return {
+        "email": student.email,
+        "info": info,
+        "subjects": _subjects_section(student),
+        "quizzes": _quizzes_section(student),
+        "goals": _goals_section(student),
+        "resource_logs": _resource_logs_section(student),
+    }
+
+
+def profile_is_empty(profile: dict) -> bool:
+    return profile["info"] == EMPTY_INFO and not (
+        profile["subjects"] or profile["goals"] or profile["resource_logs"]
+    )
@@ -1,5 +1,4 @@
 from rest_framework import serializers
-from django.contrib.auth import authenticate
 from student.models import (
     Student, StudentInfo, Subject, StudentSubject,
     Quiz, Question, LearningGoal, Resource, StudentResourceLog
@@ -9,23 +8,10 @@ from student.models import (
 # Authentication Serializers
 # ---------------------------
 class StudentLoginSerializer(serializers.Serializer):
+    # Credentials are checked asynchronously by StudentLoginView.
     email = serializers.EmailField()
     password = serializers.CharField(style={"input_type": "password"}, trim_whitespace=False)
 
-    def validate(self, data):
-        email = data.get("email")
-        password = data.get("password")
-
-        if email and password:
-            user = authenticate(request=self.context.get("request"), email=email, password=password)
-            if not user:
-                raise serializers.ValidationError("Invalid email or password", code="authorization")
-        else:
-            raise serializers.ValidationError("Both email and password are required")
-
-        data["user"] = user
-        return data
-
 class StudentRegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, style={"input_type": "password"})
 
@@ -87,7 +73,7 @@ class QuizSerializer(serializers.ModelSerializer):
     class Meta:
         model = Quiz
         fields = [
-            "id", "student", "subject", "subject_name", "total_marks",
+            "id", "student", "subject", "subject_name", "topic", "total_marks",
             "score", "ai_feedback", "status", "created_at", "questions"
         ]
         read_only_fields = ["id", "student", "created_at", "subject", "questions"]
@@ -171,4 +157,28 @@ class FullStudentDataSerializer(serializers.Serializer):
             "quizzes": self.get_quizzes(instance),
             "goals": self.get_goals(instance),
             "resource_logs": self.get_resource_logs(instance),
-        }
\ No newline at end of file
+        }
+
+
+# ---------------------------
+# Student Profile (projection schema)
+# ---------------------------
+class ProfileQuizSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    subject__id = serializers.IntegerField()
+    subject__name = serializers.CharField()
+    total_marks = serializers.IntegerField()
+    score = serializers.FloatField(allow_null=True)
+    ai_feedback = serializers.CharField(allow_blank=True)
+    status = serializers.ChoiceField(choices=Quiz.STATUS_CHOICES)
+    created_at = serializers.DateTimeField()
+
+
+class StudentProfileSerializer(serializers.Serializer):
+    """Shape of build_student_profile's output; documents StudentProfileView in the API schema."""
+    email = serializers.EmailField()
+    info = StudentInfoSerializer()
+    subjects = StudentSubjectSerializer(many=True)
+    quizzes = ProfileQuizSerializer(many=True)
+    goals = LearningGoalSerializer(many=True)
+    resource_logs = StudentResourceLogSerializer(many=True)
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .leaderboard import move_score
+from .models import Student, SubjectProgress
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def evict_cached_student(sender, instance, **kwargs):
+    # Covers deactivation, password changes and deletes. Bulk queryset
+    # updates bypass signals and are only picked up once the TTL expires.
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_delete, sender=SubjectProgress)
+def drop_from_histogram(sender, instance, **kwargs):
+    # Keeps SubjectScoreBin counts right when a student (or their progress) is deleted
+    if instance.attempts:
+        move_score(instance.subject_id, instance.mean_score, None)
@@ -0,0 +1,335 @@
+"""
+Synthetic population for scale testing. Everything is drawn from seeded
+NumPy generators: the shared catalog (subjects, resources, question bank)
+from `seed`, and each shard of students from (seed, shard), so the same
+seed, shard size and end date always produce the same data (up to primary
+keys) whatever the worker count.
+Shards are written with COPY (PostgreSQL only) in worker processes.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from ai.models import AgentCall, AgentInteractionLog
+from ai.utils.dedup import content_hash
+from ai.utils.question_bank import normalize_topic
+from learningplan.models import LearningPlan, LearningPlanResource, LearningPlanWeek
+
+from .importers import copy_rows
+from .models import (
+    BankQuestion, LearningGoal, Question, Quiz, Resource, Student, StudentInfo,
+    StudentResourceLog, StudentSubject, Subject,
+)
+
+# Distribution parameters; the command can override any key from a JSON file.
+# The defaults give ~50 questions and ~100 resource logs per student.
+DEFAULT_PROFILE = {
+    "subjects": 40,
+    "topics_per_subject": 25,
+    "resources_per_subject": 200,
+    "bank_questions_per_topic": 30,
+    "history_days": 365,
+    "info_rate": 0.9,                           # students who finished onboarding
+    "subjects_per_student": 2.0,                # 1 + Poisson(mean)
+    "subject_popularity": 1.2,                  # Zipf exponent over subjects
+    "resource_popularity": 1.1,                 # Zipf exponent within a subject
+    "ability": [5.0, 3.0],                      # Beta(a, b) latent ability
+    "quizzes_per_student": [5.0, 1.0],          # negative binomial (mean, shape)
+    "questions_per_quiz": {"5": 0.2, "10": 0.6, "20": 0.2},
+    "pending_quiz_rate": 0.05,
+    "goals_per_student": 1.5,                   # Poisson
+    "goal_achieved_rate": 0.3,
+    "resource_logs_per_student": [50.0, 1.2],   # lognormal (median, sigma)
+    "interactions_per_student": [6.0, 1.3],     # lognormal (median, sigma)
+    "plans_per_student": 0.8,                   # Poisson
+    "plan_weeks": {"2": 0.2, "4": 0.5, "8": 0.3},
+    "resources_per_week": 3,
+    "agent_latency_ms": {"chat": [1800, 0.5], "generate_quiz": [6000, 0.4], "evaluate_quiz": [2500, 0.4],
+                         "learning_plan": [15000, 0.35]},
+}
+
+LEVELS = [choice for choice, _ in BankQuestion.LEVEL_CHOICES]
+STYLES = [choice for choice, _ in StudentInfo.LEARNING_STYLE_CHOICES]
+RESOURCE_TYPES = [choice for choice, _ in Resource.RESOURCE_TYPE_CHOICES]
+OPTIONS = ["A", "B", "C", "D"]
+GENDERS = ["female", "male", "other"]
+FIRST_NAMES = ["Alex", "Sam", "Priya", "Chen", "Maria", "Omar", "Lena", "Kofi", "Yuki", "Diego", "Aisha", "Noah"]
+LAST_NAMES = ["Smith", "Patel", "Kim", "Garcia", "Okafor", "Müller", "Rossi", "Nguyen", "Silva", "Cohen"]
+
+
+def _zipf_weights(n, exponent):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _lognormal(rng, size, median, sigma):
+    return np.rint(rng.lognormal(np.log(median), sigma, size)).astype(int)
+
+
+def _choice_table(table):
+    values = np.array([int(v) for v in table])
+    weights = np.array(list(table.values()), dtype=float)
+    return values, weights / weights.sum()
+
+
+def _reserve_ids(model, count):
+    """Take `count` primary keys from the table's sequence so child rows can reference them before COPY."""
+    if not count:
+        return np.empty(0, dtype=np.int64)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [model._meta.db_table, count],
+        )
+        return np.fromiter((row[0] for row in cursor.fetchall()), dtype=np.int64, count=count)
+
+
+# -----------------------------
+# Shared catalog
+# -----------------------------
+
+def build_catalog(seed, profile) -> dict:
+    """
+    Create (or reuse) the synthetic subjects, resources and question bank and
+    return the arrays the shard workers sample from.
+    """
+    rng = np.random.default_rng([seed, 0])
+    names = [f"Synthetic Subject {i + 1:03d}" for i in range(profile["subjects"])]
+    topics = [f"Topic {t + 1:02d}" for t in range(profile["topics_per_subject"])]
+
+    with transaction.atomic():
+        Subject.objects.bulk_create(
+            [Subject(name=name, description=f"Generated subject {name[-3:]}") for name in names],
+            ignore_conflicts=True,
+        )
+        subject_ids = dict(Subject.objects.filter(name__in=names).values_list("name", "id"))
+        subject_ids = np.array([subject_ids[name] for name in names], dtype=np.int64)
+
+        fresh = set(subject_ids.tolist()) - set(
+            Resource.objects.filter(subject_id__in=subject_ids.tolist()).values_list("subject_id", flat=True)
+        )
+        Resource.objects.bulk_create([
+            Resource(
+                subject_id=subject_id,
+                topic_name=topics[r % len(topics)],
+                url=f"https://synthetic.example/{subject_id}/{r}",
+                type=RESOURCE_TYPES[r % len(RESOURCE_TYPES)],
+                description=f"Resource {r} for {topics[r % len(topics)]}",
+            )
+            for subject_id in sorted(fresh) for r in range(profile["resources_per_subject"])
+        ], batch_size=5000)
+
+        bank = []
+        for subject_id in subject_ids.tolist():
+            for topic in topics:
+                for q in range(profile["bank_questions_per_topic"]):
+                    text = f"{topic} question {q + 1} for subject {subject_id}"
+                    bank.append(BankQuestion(
+                        subject_id=subject_id,
+                        topic=normalize_topic(topic),
+                        level=LEVELS[q % len(LEVELS)],
+                        question_text=text,
+                        options={option: f"Choice {option}" for option in OPTIONS},
+                        correct_option=OPTIONS[int(rng.integers(len(OPTIONS)))],
+                        content_hash=content_hash(text),
+                    ))
+        BankQuestion.objects.bulk_create(bank, batch_size=5000, ignore_conflicts=True)
+
+    resources = {}
+    for resource_id, subject_id in (
+        Resource.objects.filter(subject_id__in=subject_ids.tolist()).order_by("id").values_list("id", "subject_id")
+    ):
+        resources.setdefault(subject_id, []).append(resource_id)
+
+    questions = {}
+    for row in (
+        BankQuestion.objects.filter(subject_id__in=subject_ids.tolist())
+        .order_by("id").values("id", "subject_id", "topic", "question_text", "options", "correct_option")
+    ):
+        questions.setdefault((row["subject_id"], row["topic"]), []).append(row)
+
+    return {
+        "subject_ids": subject_ids,
+        "topics": topics,
+        "resources": {k: np.array(v, dtype=np.int64) for k, v in resources.items()},
+        "questions": questions,
+        # Per-question easiness on the logit scale, fixed by the seed
+        "easiness": {k: rng.normal(0.0, 1.0, len(v)) for k, v in questions.items()},
+        "password": make_password(f"synthetic-{seed}"),
+    }
+
+
+# -----------------------------
+# Shards
+# -----------------------------
+
+def generate_shard(seed, shard, first_index, count, profile, catalog, now) -> dict:
+    """
+    Generate and COPY `count` students (global indexes from `first_index`)
+    with all their data. Timestamps fall in the `history_days` before `now`.
+    """
+    rng = np.random.default_rng([seed, shard + 1])
+    history = profile["history_days"]
+    subject_ids = catalog["subject_ids"]
+    topics = catalog["topics"]
+    written = {}
+
+    def write(model, columns, rows):
+        written[model.__name__] = written.get(model.__name__, 0) + copy_rows(model, columns, rows)
+
+    def moment(start, size=None):
+        # Uniform between `start` (days ago) and now
+        return rng.uniform(0, 1, size) * start
+
+    def at(days_ago):
+        return now - timedelta(days=float(days_ago))
+
+    # Students: sign-ups skew recent, as a growing product does
+    student_ids = _reserve_ids(Student, count)
+    joined = history * (1 - np.sqrt(rng.uniform(0, 1, count)))
+    ability = rng.beta(*profile["ability"], count)
+    write(Student, ["id", "password", "email", "is_active", "is_staff", "is_superuser", "date_joined"], (
+        (student_ids[i], catalog["password"], f"student{first_index + i:08d}.s{seed}@synthetic.example",
+         True, False, False, at(joined[i]))
+        for i in range(count)
+    ))
+
+    has_info = rng.uniform(0, 1, count) < profile["info_rate"]
+    ages = np.clip(np.rint(rng.normal(21, 5, count)), 13, 70).astype(int)
+    write(StudentInfo, ["student_id", "full_name", "age", "gender", "preferred_learning_style", "joined_on"], (
+        (student_ids[i], f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(first_index + i) % len(LAST_NAMES)]}",
+         ages[i], GENDERS[rng.integers(len(GENDERS))], STYLES[rng.integers(len(STYLES))], at(joined[i]))
+        for i in range(count) if has_info[i]
+    ))
+
+    # Subject choice follows a Zipf popularity curve
+    popularity = _zipf_weights(len(subject_ids), profile["subject_popularity"])
+    subject_counts = np.minimum(1 + rng.poisson(profile["subjects_per_student"], count), len(subject_ids))
+    student_subjects = [rng.choice(subject_ids, n, replace=False, p=popularity) for n in subject_counts]
+    write(StudentSubject, ["student_id", "subject_id", "preferred_style", "favorite_topics", "weak_topics", "goal"], (
+        (student_ids[i], subject_id, STYLES[rng.integers(len(STYLES))],
+         {topics[rng.integers(len(topics))]: "Enjoys it"}, {topics[rng.integers(len(topics))]: "Finds it hard"},
+         "Pass the final exam")
+        for i in range(count) for subject_id in student_subjects[i]
+    ))
+
+    goals = rng.poisson(profile["goals_per_student"], count)
+    write(LearningGoal, ["student_id", "goal_text", "subject_id", "achieved", "created_at"], (
+        (student_ids[i], f"Master {topics[rng.integers(len(topics))]}", rng.choice(student_subjects[i]),
+         bool(rng.uniform() < profile["goal_achieved_rate"]), at(moment(joined[i])))
+        for i in range(count) for _ in range(goals[i])
+    ))
+
+    # Quizzes: negative binomial counts; correctness from ability and item easiness
+    mean, shape = profile["quizzes_per_student"]
+    quiz_counts = rng.negative_binomial(shape, shape / (shape + mean), count)
+    quiz_ids = _reserve_ids(Quiz, int(quiz_counts.sum()))
+    lengths, length_weights = _choice_table(profile["questions_per_quiz"])
+    quizzes, questions = [], []
+    ability_logit = np.log(ability / (1 - ability))
+    next_quiz = 0
+    for i in range(count):
+        for _ in range(quiz_counts[i]):
+            quiz_id = quiz_ids[next_quiz]
+            next_quiz += 1
+            subject_id = int(rng.choice(student_subjects[i]))
+            topic = topics[rng.integers(len(topics))]
+            key = (subject_id, normalize_topic(topic))
+            pool = catalog["questions"][key]
+            picked = rng.choice(len(pool), min(int(rng.choice(lengths, p=length_weights)), len(pool)), replace=False)
+            pending = rng.uniform() < profile["pending_quiz_rate"]
+            p_correct = 1 / (1 + np.exp(-(ability_logit[i] + catalog["easiness"][key][picked])))
+            correct = rng.uniform(0, 1, len(picked)) < p_correct
+            score = None if pending else round(100 * correct.mean(), 1)
+            quizzes.append((
+                quiz_id, student_ids[i], subject_id, topic, at(moment(joined[i])), len(picked), score,
+                "" if pending else "Keep practising the questions you missed.", "pending" if pending else "completed",
+            ))
+            for q, ok in zip(picked, correct):
+                bank = pool[q]
+                answer = bank["correct_option"] if ok else OPTIONS[rng.integers(len(OPTIONS))]
+                questions.append((
+                    quiz_id, bank["id"], bank["question_text"], bank["options"], bank["correct_option"],
+                    "" if pending else answer, None if pending else answer == bank["correct_option"],
+                ))
+    write(Quiz, ["id", "student_id", "subject_id", "topic", "created_at", "total_marks", "score", "ai_feedback",
+                 "status"], quizzes)
+    write(Question, ["quiz_id", "bank_question_id", "question_text", "options", "correct_option", "student_answer",
+                     "is_correct"], questions)
+    del questions
+
+    # Resource logs: lognormal per student, Zipf within each subject's catalog
+    log_counts = _lognormal(rng, count, *profile["resource_logs_per_student"])
+    resource_weights = {
+        subject_id: _zipf_weights(len(ids), profile["resource_popularity"])
+        for subject_id, ids in catalog["resources"].items()
+    }
+
+    def resource_logs():
+        for i in range(count):
+            subjects = rng.choice(student_subjects[i], log_counts[i])
+            days = moment(joined[i], log_counts[i])
+            for subject_id, days_ago in zip(subjects.tolist(), days):
+                ids = catalog["resources"][subject_id]
+                yield (student_ids[i], ids[rng.choice(len(ids), p=resource_weights[subject_id])],
+                       at(days_ago), "Helpful" if rng.uniform() < 0.1 else "")
+
+    write(StudentResourceLog, ["student_id", "resource_id", "accessed_at", "feedback"], resource_logs())
+
+    # Learning plans with their weeks and linked resources
+    plan_counts = rng.poisson(profile["plans_per_student"], count)
+    plan_ids = _reserve_ids(LearningPlan, int(plan_counts.sum()))
+    week_values, week_weights = _choice_table(profile["plan_weeks"])
+    durations = rng.choice(week_values, len(plan_ids), p=week_weights)
+    week_ids = _reserve_ids(LearningPlanWeek, int(durations.sum()))
+    plans, weeks, plan_resources, plan_times = [], [], [], []
+    next_plan = next_week = 0
+    for i in range(count):
+        for _ in range(plan_counts[i]):
+            plan_id, duration = plan_ids[next_plan], int(durations[next_plan])
+            next_plan += 1
+            plan_times.append(moment(joined[i]))
+            plans.append((plan_id, student_ids[i], duration, at(plan_times[-1])))
+            subject_id = int(rng.choice(student_subjects[i]))
+            for week in range(1, duration + 1):
+                week_id = week_ids[next_week]
+                next_week += 1
+                focus = [topics[t] for t in rng.choice(len(topics), 2, replace=False)]
+                weeks.append((week_id, plan_id, week, focus, [f"Practice {t}" for t in focus],
+                              f"Week {week}: focus on {focus[0]}."))
+                ids = catalog["resources"][subject_id]
+                for resource_id in rng.choice(ids, min(profile["resources_per_week"], len(ids)), replace=False):
+                    plan_resources.append((week_id, resource_id, f"Resource {resource_id}",
+                                           f"https://synthetic.example/r/{resource_id}"))
+    write(LearningPlan, ["id", "student_id", "plan_duration_weeks", "created_at"], plans)
+    write(LearningPlanWeek, ["id", "plan_id", "week", "focus_topics", "practice_tasks", "ai_message"], weeks)
+    write(LearningPlanResource, ["week_id", "resource_id", "fallback_name", "fallback_url"], plan_resources)
+
+    # Chat turns, and one routed LLM call per turn, quiz, evaluation and plan
+    turn_counts = _lognormal(rng, count, *profile["interactions_per_student"])
+    turn_times = [moment(joined[i], turn_counts[i]) for i in range(count)]
+    write(AgentInteractionLog, ["student_id", "user_message", "agent_response", "created_at"], (
+        (student_ids[i], f"Can you explain {topics[rng.integers(len(topics))]}?",
+         "Here is a short explanation with an example.", at(days_ago))
+        for i in range(count) for days_ago in turn_times[i]
+    ))
+
+    latency = profile["agent_latency_ms"]
+    events = [("chat", days_ago) for times in turn_times for days_ago in times]
+    events += [("generate_quiz", (now - quiz[4]).total_seconds() / 86400) for quiz in quizzes]
+    events += [("evaluate_quiz", (now - quiz[4]).total_seconds() / 86400) for quiz in quizzes if quiz[6] is not None]
+    events += [("learning_plan", days_ago) for days_ago in plan_times]
+
+    def agent_calls():
+        for task, days_ago in events:
+            median, sigma = latency[task]
+            prompt = int(rng.lognormal(np.log(1500), 0.6))
+            yield (task, "gpt-4o-mini" if task in ("chat", "evaluate_quiz") else "gpt-4o", "default",
+                   int(rng.lognormal(np.log(median), sigma)), prompt, int(rng.lognormal(np.log(400), 0.5)),
+                   int(prompt * rng.uniform(0, 0.8)), "error" if rng.uniform() < 0.01 else "ok", at(days_ago))
+
+    write(AgentCall, ["task", "model", "reason", "latency_ms", "prompt_tokens", "completion_tokens",
+                      "cached_tokens", "outcome", "created_at"], agent_calls())
+    return written
@@ -1,3 +1,104 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import orjson
+from django.test import TestCase, override_settings
+
+from .link_checker import run_link_check
+from .models import Resource, Subject
+from .views import ResourceListView
+
+
+def catalog_stand_in(request):
+    """A local stand-in for the sites in the catalog."""
+    path = request.url.path
+    if path == "/down":
+        raise httpx.ConnectError("connection refused", request=request)
+    if path == "/explodes":
+        raise ValueError("unexpected failure")
+    if path == "/old":
+        return httpx.Response(301, headers={"Location": "https://example.com/ok"})
+    if path == "/nohead" and request.method == "HEAD":
+        return httpx.Response(405)
+    statuses = {"/gone": 404, "/error": 500, "/private": 403}
+    return httpx.Response(statuses.get(path, 200))
+
+
+@override_settings(LINK_CHECK_HOST_INTERVAL=0, LINK_CHECK_MAX_FAILURES=2)
+class LinkCheckerTests(TestCase):
+    def setUp(self):
+        subject = Subject.objects.create(name="Algorithms")
+        self.resources = {
+            name: Resource.objects.create(subject=subject, topic_name=name, type="article", url=url)
+            for name, url in {
+                "ok": "https://example.com/ok",
+                "old": "https://example.com/old",
+                "nohead": "https://example.com/nohead",
+                "private": "https://example.com/private",
+                "gone": "https://example.com/gone",
+                "error": "https://example.com/error",
+                "down": "https://example.com/down",
+                "explodes": "https://example.com/explodes",
+                "malformed": "https://[not-a-host/x",
+            }.items()
+        }
+        self.transport = httpx.MockTransport(catalog_stand_in)
+
+    def status(self, name):
+        resource = Resource.objects.get(pk=self.resources[name].pk)
+        return resource.link_status, resource.link_failures
+
+    def test_classifies_every_link_in_one_batch(self):
+        totals = run_link_check(batch_size=100, transport=self.transport)
+
+        self.assertEqual(totals, {"ok": 3, "redirected": 1, "dead": 1, "broken": 4})
+        self.assertEqual(self.status("ok"), ("ok", 0))
+        self.assertEqual(self.status("nohead"), ("ok", 0))
+        self.assertEqual(self.status("private"), ("ok", 0))
+        self.assertEqual(self.status("gone"), ("dead", 1))
+        for name in ("error", "down", "explodes", "malformed"):
+            self.assertEqual(self.status(name), ("broken", 1))
+
+        old = Resource.objects.get(pk=self.resources["old"].pk)
+        self.assertEqual(old.link_status, "redirected")
+        self.assertEqual(old.live_url, "https://example.com/ok")
+
+    def test_cached_results_are_not_rechecked_until_due(self):
+        run_link_check(transport=self.transport)
+        self.assertEqual(run_link_check(transport=self.transport), {})
+
+        Resource.objects.filter(link_status="broken").update(link_checked_at=None)
+        run_link_check(transport=self.transport)
+        self.assertEqual(self.status("error"), ("dead", 2))
+        self.assertEqual(self.status("ok"), ("ok", 0))
+
+
+class AsgiStreamingTests(TestCase):
+    def setUp(self):
+        subject = Subject.objects.create(name="Algorithms")
+        Resource.objects.bulk_create(
+            Resource(subject=subject, topic_name=f"topic {i}", type="article", url=f"https://example.com/{i}")
+            for i in range(5)
+        )
+
+    async def test_stream_is_sent_chunk_by_chunk(self):
+        produced = []
+        stream_rows = ResourceListView.stream_rows
+
+        def counting_rows(view, queryset):
+            for chunk in stream_rows(view, queryset):
+                produced.append(chunk)
+                yield chunk
+
+        with mock.patch.object(ResourceListView, "stream_chunk_size", 2), \
+                mock.patch.object(ResourceListView, "stream_rows", counting_rows):
+            response = await self.async_client.get("/student/resources/", {"stream": "1"})
+            self.assertTrue(response.is_async)
+
+            received = []
+            async for chunk in response.streaming_content:
+                received.append(chunk)
+                self.assertEqual(len(produced), len(received))
+
+        self.assertEqual(len(received), 3)
+        self.assertEqual(len(orjson.loads(b"".join(received))), 5)
@@ -5,7 +5,8 @@ from .views import (
     SubjectListView, QuizListCreateView,
     LearningGoalListCreateView, LearningGoalDetailView,
     ResourceListView, StudentResourceLogListCreateView,
-    StudentProfileView, AnswerQuizView
+    StudentProfileView, AnswerQuizView, StudentProgressView,
+    StudentExportView, SubjectLeaderboardView, SubjectRankView
 )
 
 urlpatterns = [
@@ -37,4 +38,10 @@ urlpatterns = [
     
     # Student profile
     path("profile/", StudentProfileView.as_view(), name="student-profile"),
+    path("progress/", StudentProgressView.as_view(), name="student-progress"),
+    path("export/", StudentExportView.as_view(), name="student-export"),
+
+    # Subject leaderboards
+    path("leaderboard/<int:subject_id>/", SubjectLeaderboardView.as_view(), name="subject-leaderboard"),
+    path("leaderboard/<int:subject_id>/rank/", SubjectRankView.as_view(), name="subject-rank"),
 ]
\ No newline at end of file
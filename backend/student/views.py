@@ -1,3 +1,6 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from adrf.views import APIView as AsyncAPIView
 from rest_framework import serializers, generics, status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -5,8 +8,9 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from config.streaming import StreamingListMixin, streaming_response
 from .models import (
-    StudentInfo, StudentSubject, Subject, LearningGoal,
+    Student, StudentInfo, StudentSubject, Subject, LearningGoal,
     Quiz, Question, Resource, StudentResourceLog
 )
 from .serializers import (
@@ -14,8 +18,13 @@ from .serializers import (
     StudentInfoSerializer, StudentSubjectSerializer,
     SubjectSerializer, QuizSerializer, QuestionSerializer,
     LearningGoalSerializer, ResourceSerializer,
-    StudentResourceLogSerializer, FullStudentDataSerializer
+    StudentResourceLogSerializer, StudentProfileSerializer
 )
+from .progress import progress_summary
+from .leaderboard import percentile_rank, top_students
+from .projections import build_student_profile, profile_is_empty
+from .export import iter_student_history, iter_ndjson
+from .passwords import aauthenticate_student, hash_password, HashingOverloaded
 
 # Schema for token responses
 token_response_schema = openapi.Schema(
@@ -30,36 +39,46 @@ token_response_schema = openapi.Schema(
 # ---------------------------
 # Authentication Views
 # ---------------------------
-class StudentLoginView(APIView):
+class StudentLoginView(AsyncAPIView):
+    authentication_classes = []
+
     @swagger_auto_schema(
         request_body=StudentLoginSerializer,
         responses={
             200: openapi.Response("JWT Token", token_response_schema),
             400: openapi.Response("Bad Request", examples={
-                "application/json": {"message": "Login failed", "error": "Invalid credentials"}
+                "application/json": {"message": "Login failed", "error": "Invalid email or password"}
             }),
+            503: "Too many logins in progress",
         },
         operation_summary="Student login",
         operation_description="Login a student with email and password to receive JWT access and refresh tokens.",
         tags=["Authentication"]
     )
-    def post(self, request):
+    async def post(self, request):
         try:
-            serializer = StudentLoginSerializer(data=request.data, context={"request": request})
+            serializer = StudentLoginSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
-            user = serializer.validated_data["user"]
+            user = await aauthenticate_student(
+                serializer.validated_data["email"], serializer.validated_data["password"], request=request
+            )
+            if not user:
+                return Response({"message": "Login failed", "error": "Invalid email or password"}, status=400)
+
             refresh = RefreshToken.for_user(user)
             return Response({
                 "message": "Login successful",
                 "refresh": str(refresh),
                 "access": str(refresh.access_token),
             })
+        except HashingOverloaded as e:
+            return Response({"message": "Login failed", "error": str(e)}, status=503)
         except Exception as e:
             return Response({"message": "Login failed", "error": str(e)}, status=400)
 
 
-class StudentRegisterView(generics.CreateAPIView):
-    serializer_class = StudentRegisterSerializer
+class StudentRegisterView(AsyncAPIView):
+    authentication_classes = []
 
     @swagger_auto_schema(
         request_body=StudentRegisterSerializer,
@@ -68,22 +87,32 @@ class StudentRegisterView(generics.CreateAPIView):
             400: openapi.Response("Bad Request", examples={
                 "application/json": {"message": "Registration failed", "error": "Email already exists"}
             }),
+            503: "Too many registrations in progress",
         },
         operation_summary="Register a student",
         operation_description="Register a new student using email and password and receive JWT tokens.",
         tags=["Authentication"]
     )
-    def create(self, request, *args, **kwargs):
+    async def post(self, request):
         try:
-            serializer = self.get_serializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            user = serializer.save()
+            serializer = StudentRegisterSerializer(data=request.data)
+            # The unique-email check queries the database.
+            await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+            user = Student(
+                email=Student.objects.normalize_email(serializer.validated_data["email"]),
+                password=await hash_password(serializer.validated_data["password"]),
+            )
+            await user.asave()
+
             refresh = RefreshToken.for_user(user)
             return Response({
                 "message": "Registration successful",
                 "refresh": str(refresh),
                 "access": str(refresh.access_token),
             }, status=201)
+        except HashingOverloaded as e:
+            return Response({"message": "Registration failed", "error": str(e)}, status=503)
         except Exception as e:
             return Response({"message": "Registration failed", "error": str(e)}, status=400)
 
@@ -264,19 +293,24 @@ class SubjectListView(generics.ListAPIView):
 # ---------------------------
 # Quiz List + Create
 # ---------------------------
-class QuizListCreateView(generics.ListCreateAPIView):
+class QuizListCreateView(StreamingListMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = QuizSerializer
 
     @swagger_auto_schema(
         operation_summary="List quizzes taken by student",
-        operation_description="Returns all quizzes attempted or assigned to the authenticated student.",
+        operation_description="Returns all quizzes attempted or assigned to the authenticated student. "
+                              "Pass ?stream=1 to stream large lists.",
         responses={200: QuizSerializer(many=True)},
         tags=["Quizzes"]
     )
     def get_queryset(self):
         try:
-            return Quiz.objects.filter(student=self.request.user)
+            return (
+                Quiz.objects.filter(student=self.request.user)
+                .select_related("subject")
+                .prefetch_related("questions")
+            )
         except Exception as e:
             raise serializers.ValidationError({"error": f"Query failed: {str(e)}"})
 
@@ -406,13 +440,16 @@ class LearningGoalDetailView(generics.RetrieveUpdateDestroyAPIView):
 # ---------------------------
 # Learning Resources (List Only)
 # ---------------------------
-class ResourceListView(generics.ListAPIView):
+class ResourceListView(StreamingListMixin, generics.ListAPIView):
     serializer_class = ResourceSerializer
-    queryset = Resource.objects.all()
+    # Links found dead by `check_resource_links` are hidden
+    queryset = Resource.objects.exclude(link_status="dead")
 
     @swagger_auto_schema(
         operation_summary="List recommended resources",
-        operation_description="Returns all recommended learning resources (e.g. videos, articles, LeetCode links).",
+        operation_description="Returns all recommended learning resources (e.g. videos, articles, LeetCode links) "
+                              "except those whose link is dead. "
+                              "Pass ?stream=1 to stream the full catalog.",
         responses={200: ResourceSerializer(many=True)},
         tags=["Resources"]
     )
@@ -461,32 +498,119 @@ class StudentProfileView(APIView):
     @swagger_auto_schema(
         operation_summary="Get full student profile",
         operation_description="Returns all information about the authenticated student in a single JSON response.",
-        responses={200: FullStudentDataSerializer},
+        responses={200: StudentProfileSerializer},
         tags=["Student"]
     )
     def get(self, request):
-        user = request.user
         try:
-            info = StudentInfo.objects.filter(student=user).first()
-            subjects = StudentSubject.objects.filter(student=user)
-            goals = LearningGoal.objects.filter(student=user)
-            resource_logs = StudentResourceLog.objects.filter(student=user)
-
-            if not info and not subjects.exists() and not goals.exists() and not resource_logs.exists():
+            profile = build_student_profile(request.user)
+            if profile_is_empty(profile):
                 return Response({"message": "No data found for this student."}, status=200)
 
-            serializer = FullStudentDataSerializer(
-                user,
-                context={
-                    "request": request,
-                    "student": user,
-                    "info": info,
-                    "subjects": subjects,
-                    "goals": goals,
-                    "resource_logs": resource_logs,
-                }
-            )
+            return Response(profile)
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
 
-            return Response(serializer.data)
+
+# ---------------------------
+# Progress (served from rollups)
+# ---------------------------
+class StudentProgressView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Get learning progress",
+        operation_description="Returns per-subject attempt counts, mean/last score, per-topic accuracy "
+                              "and the weekly score trend for the authenticated student.",
+        responses={200: openapi.Response("Progress per subject")},
+        tags=["Student"]
+    )
+    def get(self, request):
+        try:
+            return Response({"progress": progress_summary(request.user)})
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
+
+
+# ---------------------------
+# Subject Leaderboards (served from score histograms)
+# ---------------------------
+class SubjectLeaderboardView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Get subject leaderboard",
+        operation_description="Returns the top mean quiz scores in a subject, without names or ids, "
+                              "and the authenticated student's own rank (null before their first attempt).",
+        manual_parameters=[
+            openapi.Parameter("limit", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description="Number of students (default 10)"),
+        ],
+        responses={200: openapi.Response("Top scores and the caller's rank")},
+        tags=["Student"]
+    )
+    def get(self, request, subject_id):
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), settings.LEADERBOARD_MAX_LIMIT)
+            return Response({
+                "subject_id": subject_id,
+                "leaders": top_students(subject_id, limit, viewer=request.user),
+                "you": percentile_rank(request.user, subject_id),
+            })
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
+
+
+class SubjectRankView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Get my rank in a subject",
+        operation_description="Returns the authenticated student's rank and percentile among all students "
+                              "who have attempted the subject.",
+        responses={200: openapi.Response("Rank and percentile"), 404: "No attempts in this subject yet"},
+        tags=["Student"]
+    )
+    def get(self, request, subject_id):
+        try:
+            rank = percentile_rank(request.user, subject_id)
+            if rank is None:
+                return Response({"error": "No completed quizzes in this subject yet."}, status=404)
+            return Response(rank)
+        except Exception as e:
+            return Response({"error": str(e)}, status=400)
+
+
+# ---------------------------
+# Full History Export (NDJSON)
+# ---------------------------
+class StudentExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Export full student history",
+        operation_description="Streams every record of the authenticated student (profile, quizzes with questions, "
+                              "plans with weeks, resource logs, assistant chats) as NDJSON, one object per line "
+                              "with a `type` field. Staff may pass ?student_id= to export another student.",
+        manual_parameters=[
+            openapi.Parameter("student_id", openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False)
+        ],
+        responses={200: openapi.Response("NDJSON stream")},
+        tags=["Student"]
+    )
+    def get(self, request):
+        try:
+            student = request.user
+            student_id = request.query_params.get("student_id")
+            if student_id and request.user.is_staff:
+                student = Student.objects.get(id=student_id)
+
+            response = streaming_response(
+                request, iter_ndjson(iter_student_history(student)), content_type="application/x-ndjson"
+            )
+            response["Content-Disposition"] = f'attachment; filename="student-{student.id}-history.ndjson"'
+            return response
+        except Student.DoesNotExist:
+            return Response({"error": "Student not found."}, status=404)
         except Exception as e:
             return Response({"error": str(e)}, status=400)
\ No newline at end of file